@@ -16,20 +16,65 @@
 #
 # Dipendenze:
 #   pip install beautifulsoup4 pandas numpy openpyxl
+#   (opzionale) pip install xlsxwriter  -> scrittura Excel più veloce
 # ------------------------------------------
 
 from pathlib import Path
 import argparse
-import re
+import fnmatch
+import functools
+import itertools
+import json
 from datetime import datetime, timezone, timedelta
 import logging
-import base64
-import urllib.request
+import os
+import signal
 import sys
+import multiprocessing
+import threading
+import time
+import traceback
+from contextlib import nullcontext
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 
 import numpy as np
 import pandas as pd
-from bs4 import BeautifulSoup, FeatureNotFound
+from bs4 import BeautifulSoup
+
+from report_discovery import DEFAULT_INCLUDE, DEFAULT_SCAN_THREADS, iter_reports, parse_time_bound
+from run_manifest import SERIES_SUFFIX, RunManifest, file_sha256, load_series, save_series, settings_key
+from dataset_writer import DATASET_FORMATS, LONG_COLUMNS, parse_formats, write_report_dataset
+from xlsx_writer import EXCEL_ENGINES, WorkbookWriter
+from plot_lod import DEFAULT_MAX_POINTS, bin_sky_points, simplify_tracks
+from sky_grid import SkyGrid, render_polar_heatmap
+from series_accumulator import SeriesAccumulator
+from tick_axis import TickAxis, parse_tick_number
+from svg_loader import DEFAULT_FETCH_THREADS, DEFAULT_TIMEOUT_S, get_loader
+from patterns import (
+    GNUPLOT_PLOT_1_RE,
+    GNUPLOT_PLOT_2_RE,
+    HEX_COLOR_RE,
+    ISO_Z_DATETIME_RE,
+    MISSION_PREFIX_RE,
+    NON_ALNUM_RE,
+    ORBIT_RE,
+    PATH_CMD_RE,
+    PATH_NUM_RE,
+    POLYLINE_PAIR_RE,
+    PREFIX_FALLBACK_RE,
+    PREFIX_JUNK_RE,
+    PREFIX_TOKEN_RE,
+    RGB_COLOR_RE,
+    SECTION_KEY_RE,
+    STYLE_COLOR_RE,
+    TRANSFORM_ARGS_SPLIT_RE,
+    TRANSFORM_RE,
+    WHITESPACE_RE,
+    tick_kind,
+)
+import profiling
+import watch_service
+from profiling import count, span
 
 
 DEFAULT_HTML = Path("report.html")  # used if directory lacks .html
@@ -66,7 +111,7 @@ def parse_iso_utc(s: str):
 
     # Match date and time components with a regular expression. ``m`` is a
     # ``re.Match`` object if the pattern is found; otherwise ``None``.
-    m = re.match(r"(\d{4}-\d{2}-\d{2})\s+(\d{2}):(\d{2}):(\d{2})Z", s)
+    m = ISO_Z_DATETIME_RE.match(s)
     if not m:
         return None  # The string is not in the expected ISO format
 
@@ -79,6 +124,7 @@ def parse_iso_utc(s: str):
     return datetime(y, mo, d, hh, mm, ss, tzinfo=timezone.utc)
 
 
+@functools.lru_cache(maxsize=4096)
 def parse_transforms(transform: str):
     """Collapse an SVG ``transform`` chain into scale and translation factors.
 
@@ -98,19 +144,20 @@ def parse_transforms(transform: str):
     in a single string.  This function walks through each transformation in
     order and accumulates the resulting scale and translation.  Only these two
     operations are handled because the charts produced by the MEOS report use
-    a simple transformation chain.
+    a simple transformation chain.  Results are memoized per transform
+    string (gnuplot repeats the same few strings thousands of times).
     """
     sx, sy, tx, ty = 1.0, 1.0, 0.0, 0.0  # Start with the identity transform
     if not transform:
         return sx, sy, tx, ty  # Nothing to parse → return defaults
 
-    # ``re.finditer`` yields each ``scale`` or ``translate`` call. Captured
+    # ``finditer`` yields each ``scale`` or ``translate`` call. Captured
     # arguments are later split into a Python list of numbers.
-    for m in re.finditer(r"(translate|scale)\(\s*([^)]+)\)", transform):
+    for m in TRANSFORM_RE.finditer(transform):
         kind = m.group(1)  # Either 'scale' or 'translate'
-        # ``re.split`` handles comma- or space-separated numbers. ``list``
+        # ``split`` handles comma- or space-separated numbers. ``list``
         # comprehension converts each token to ``float``.
-        args = [float(v) for v in re.split(r"[, \t]+", m.group(2).strip()) if v]
+        args = [float(v) for v in TRANSFORM_ARGS_SPLIT_RE.split(m.group(2).strip()) if v]
         if kind == "scale":
             # Apply scaling. If only one value is supplied, it scales both axes.
             if len(args) == 1:
@@ -126,13 +173,22 @@ def parse_transforms(transform: str):
     return sx, sy, tx, ty
 
 
-def cumulative_transform(tag):
+# Counters for the per-document transform cache (see ``transform_cache_stats``).
+_TRANSFORM_COUNTERS = {"calls": 0, "hits": 0, "computed": 0}
+
+
+def cumulative_transform(tag, cache=None):
     """Compute the combined transform of an SVG element and its ancestors.
 
     Parameters
     ----------
     tag : bs4.element.Tag
         Current SVG node whose effective transform is required.
+    cache : dict, optional
+        Per-document memo of composed transforms keyed by ``id(node)``.
+        Entries also hold the node itself, so ids cannot be recycled while
+        the cache is alive.  Siblings in the same gnuplot group share their
+        ancestor chain, which is then composed only once.
 
     Returns
     -------
@@ -141,38 +197,77 @@ def cumulative_transform(tag):
 
     Details
     -------
-    SVG applies parent transforms to child elements.  The function therefore
-    walks up the DOM tree collecting ``transform`` attributes, then applies
-    them from outermost to innermost.  A simple loop is used instead of
-    recursion to avoid building deep call stacks.
+    SVG applies parent transforms to child elements.  The function walks up
+    the DOM tree until it reaches the root or an ancestor already present in
+    ``cache``, then composes the collected ``transform`` attributes from
+    outermost to innermost, storing the result of every visited node.  A
+    simple loop is used instead of recursion to avoid building deep call
+    stacks.
     """
+    if cache is None:
+        cache = {}
+    _TRANSFORM_COUNTERS["calls"] += 1
+
     # Accumulators start as an identity transform: scale 1 and translation 0.
     Sx, Sy, Tx, Ty = 1.0, 1.0, 0.0, 0.0
-    chain = []  # Will store transform strings encountered on the path to root
+    pending = []  # nodes between ``tag`` and the first cached ancestor
     cur = tag
 
-    # Traverse ancestors and collect their ``transform`` attributes. The
-    # ``getattr`` guard ensures compatibility with objects that may not be
+    # The ``getattr`` guard ensures compatibility with objects that may not be
     # BeautifulSoup ``Tag`` instances.
     while cur is not None and getattr(cur, "name", None) is not None:
-        tr = cur.get("transform")
-        if tr:
-            chain.append(tr)
+        hit = cache.get(id(cur))
+        if hit is not None:
+            Sx, Sy, Tx, Ty = hit[1]
+            _TRANSFORM_COUNTERS["hits"] += 1
+            break
+        pending.append(cur)
         cur = cur.parent  # Move one level up the tree
 
-    # Apply transforms from root to current element. ``reversed`` produces a
-    # generator that yields items in reverse order without creating a copy.
-    for tr in reversed(chain):
-        sx, sy, tx, ty = parse_transforms(tr)
-        # First transform existing translation, then accumulate new offsets.
-        Tx = sx * Tx + tx
-        Ty = sy * Ty + ty
-        # Update the global scale factors.
-        Sx *= sx
-        Sy *= sy
+    # Apply transforms from the cached ancestor (or root) down to ``tag``.
+    for node in reversed(pending):
+        tr = node.get("transform")
+        if tr:
+            sx, sy, tx, ty = parse_transforms(tr)
+            # First transform existing translation, then accumulate new offsets.
+            Tx = sx * Tx + tx
+            Ty = sy * Ty + ty
+            # Update the global scale factors.
+            Sx *= sx
+            Sy *= sy
+        cache[id(node)] = (node, (Sx, Sy, Tx, Ty))
+    _TRANSFORM_COUNTERS["computed"] += len(pending)
     return Sx, Sy, Tx, Ty
 
 
+def transform_cache_stats():
+    """Snapshot of the transform cache counters and of the ``parse_transforms`` LRU.
+
+    ``calls``/``hits`` count :func:`cumulative_transform` lookups resolved
+    through the per-document cache, ``computed`` the nodes whose transform
+    had to be composed.
+    """
+    info = parse_transforms.cache_info()
+    stats = dict(_TRANSFORM_COUNTERS)
+    stats.update({"parse_hits": info.hits, "parse_misses": info.misses})
+    return stats
+
+
+def _log_transform_cache_stats(before: dict, label):
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    after = transform_cache_stats()
+    d = {k: after[k] - before[k] for k in after}
+    calls = d["calls"] or 1
+    parses = (d["parse_hits"] + d["parse_misses"]) or 1
+    logger.debug(
+        "%s: transform cache %d/%d lookups hit (%.0f%%), %d nodes composed; "
+        "parse_transforms LRU %d/%d hit (%.0f%%)",
+        label, d["hits"], d["calls"], 100.0 * d["hits"] / calls, d["computed"],
+        d["parse_hits"], d["parse_hits"] + d["parse_misses"], 100.0 * d["parse_hits"] / parses,
+    )
+
+
 def apply_tr(x, y, Sx, Sy, Tx, Ty):
     """Apply scale and translation factors to a point.
 
@@ -193,6 +288,22 @@ def apply_tr(x, y, Sx, Sy, Tx, Ty):
     return Sx * x + Tx, Sy * y + Ty
 
 
+def apply_tr_array(pts, Sx, Sy, Tx, Ty):
+    """Vectorized :func:`apply_tr` for an ``(N, 2)`` array of points."""
+    pts = np.asarray(pts, dtype=float).reshape(-1, 2)
+    return pts * np.array([Sx, Sy]) + np.array([Tx, Ty])
+
+
+_PATH_VECTOR_MIN = 16  # runs with fewer numbers are accumulated with plain floats
+
+
+def _accumulate(deltas, origin):
+    """Running sum of relative steps starting at ``origin`` (same rounding as ``x += dx``)."""
+    deltas = np.asarray(deltas, dtype=float)
+    seeded = np.concatenate([np.reshape(np.asarray(origin, dtype=float), (1,) + deltas.shape[1:]), deltas])
+    return np.cumsum(seeded, axis=0)[1:]
+
+
 def parse_path_subpaths(d_attr: str):
     """Split an SVG ``path`` definition into absolute subpaths.
 
@@ -203,403 +314,480 @@ def parse_path_subpaths(d_attr: str):
 
     Returns
     -------
-    list[list[tuple[float, float]]]
-        Each inner list contains ``(x, y)`` pairs describing one continuous
-        polyline. A new subpath starts whenever an ``M`` or ``m`` command is
-        encountered.
+    list[numpy.ndarray]
+        One ``(N, 2)`` float array of ``(x, y)`` points per continuous
+        polyline (``N >= 2``). A new subpath starts whenever an ``M`` or
+        ``m`` command is encountered.
 
     Description
     -----------
     Only the commands ``M/m`` (move), ``L/l`` (line), ``H/h`` (horizontal) and
     ``V/v`` (vertical) are supported because the gnuplot output embedded in the
-    report uses these primitives exclusively.  Numbers are converted to
-    ``float`` for easier numeric processing.
+    report uses these primitives exclusively.  The string is split into
+    command runs (a command letter followed by its numbers); long runs (the
+    gnuplot polylines) are converted with one NumPy call and relative
+    commands are accumulated with ``cumsum``, while short runs use plain
+    floats to avoid per-call NumPy overhead.
+
+    Semantics of the historical token loop are preserved: a trailing odd
+    number in a coordinate-pair run is ignored, repeated pairs after
+    ``M``/``m`` restart the subpath at the last pair, numbers that follow an
+    unsupported command keep applying to the last supported one, and only
+    subpaths with at least two points are returned.
     """
-    # Extract drawing commands and numbers. The regular expression yields a
-    # list of tuples where only one item of each tuple is non-empty.
-    tokens = re.findall(r"([MmLlHhVv])|([-+]?\d*\.?\d+(?:e[-+]?\d+)?)", d_attr or "")
-
-    flat = []
-    for a, b in tokens:
-        if a:
-            flat.append(a)  # SVG command as a string
-        else:
-            flat.append(float(b))  # Coordinate or length as Python float
-
-    # ``subpaths`` collects individual polylines; ``current`` tracks the one
-    # currently being built. ``x`` and ``y`` hold the cursor position.
+    parts = PATH_CMD_RE.split(d_attr or "")
+    # ``parts`` = [prefix, cmd, args, cmd, args, ...]; numbers in the prefix
+    # precede any command and are skipped.
     subpaths = []
+    chunks = []  # (N, 2) arrays of the subpath being built
+    pending = []  # points of short runs, converted to one array when needed
     x = y = 0.0
-    cmd = None
-    i = 0
-    current = []
+
+    def take_pending():
+        if pending:
+            chunks.append(np.array(pending, dtype=float))
+            pending.clear()
 
     def flush():
-        """Append ``current`` polyline to ``subpaths`` if it has at least two points."""
-        nonlocal current
-        if len(current) >= 2:
-            subpaths.append(current)
-        current = []  # Reset for the next subpath
-
-    # Iterate through the token list using an index ``i`` so we can look ahead
-    # when commands require multiple numeric parameters.
-    while i < len(flat):
-        t = flat[i]
-        if isinstance(t, str):
-            # ``t`` is a command letter. Store it and, for ``M/m``, close the
-            # previous subpath.
-            cmd = t
-            if cmd in ("M", "m"):
-                flush()
-            i += 1
+        take_pending()
+        if chunks:
+            pts = np.concatenate(chunks) if len(chunks) > 1 else chunks[0]
+            if len(pts) >= 2:
+                subpaths.append(pts)
+            chunks.clear()
+
+    for i in range(1, len(parts), 2):
+        cmd = parts[i]
+        if cmd in "Mm":
+            flush()
+        nums = PATH_NUM_RE.findall(parts[i + 1])
+        if not nums:
             continue
 
-        # At this point ``t`` is a numeric value associated with the last
-        # command seen.
-        if cmd == "M":  # Absolute move-to command
-            if i + 1 < len(flat) and not isinstance(flat[i + 1], str):
-                x, y = flat[i], flat[i + 1]  # Set new absolute position
-                current = [(x, y)]  # Start a new subpath list
-                i += 2
-            else:
-                i += 1  # Malformed data; skip value
-        elif cmd == "m":  # Relative move-to command
-            if i + 1 < len(flat) and not isinstance(flat[i + 1], str):
-                x += flat[i]; y += flat[i + 1]  # Update position relative to current point
-                current = [(x, y)]
-                i += 2
-            else:
-                i += 1
-        elif cmd == "L":  # Absolute line-to command
-            if i + 1 < len(flat) and not isinstance(flat[i + 1], str):
-                x, y = flat[i], flat[i + 1]
-                current.append((x, y))  # Append point to current polyline
-                i += 2
-            else:
-                i += 1
-        elif cmd == "l":  # Relative line-to command
-            if i + 1 < len(flat) and not isinstance(flat[i + 1], str):
-                x += flat[i]; y += flat[i + 1]
-                current.append((x, y))
-                i += 2
-            else:
-                i += 1
-        elif cmd == "H":  # Absolute horizontal line
-            x = flat[i]; current.append((x, y)); i += 1
-        elif cmd == "h":  # Relative horizontal line
-            x += flat[i]; current.append((x, y)); i += 1
-        elif cmd == "V":  # Absolute vertical line
-            y = flat[i]; current.append((x, y)); i += 1
-        elif cmd == "v":  # Relative vertical line
-            y += flat[i]; current.append((x, y)); i += 1
-        else:
-            i += 1  # Unsupported command; skip token
+        if len(nums) < _PATH_VECTOR_MIN:
+            # Short run (typical of hand-written or relative paths): plain floats
+            # avoid the fixed cost of several NumPy calls per command.
+            vals = [float(v) for v in nums]
+            if cmd in "MmLl":
+                for j in range(0, len(vals) - 1, 2):
+                    if cmd in "ml":
+                        x += vals[j]; y += vals[j + 1]
+                    else:
+                        x, y = vals[j], vals[j + 1]
+                    if cmd in "Mm":
+                        pending[:] = [(x, y)]
+                    else:
+                        pending.append((x, y))
+            elif cmd in "Hh":
+                for v in vals:
+                    x = x + v if cmd == "h" else v
+                    pending.append((x, y))
+            else:  # V / v
+                for v in vals:
+                    y = y + v if cmd == "v" else v
+                    pending.append((x, y))
+            continue
+
+        take_pending()
+        vals = np.asarray(nums, dtype=float)
+        if cmd in "MmLl":
+            k = len(vals) // 2
+            pairs = vals[: 2 * k].reshape(k, 2)
+            if cmd in "ml":
+                pairs = _accumulate(pairs, (x, y))
+            x, y = float(pairs[-1, 0]), float(pairs[-1, 1])
+            # Each pair of a move run restarts the subpath: only the last one survives.
+            chunks.append(pairs[-1:] if cmd in "Mm" else pairs)
+        elif cmd in "Hh":
+            xs = _accumulate(vals, x) if cmd == "h" else vals
+            pts = np.empty((len(xs), 2))
+            pts[:, 0] = xs
+            pts[:, 1] = y
+            x = float(xs[-1])
+            chunks.append(pts)
+        else:  # V / v
+            ys = _accumulate(vals, y) if cmd == "v" else vals
+            pts = np.empty((len(ys), 2))
+            pts[:, 0] = x
+            pts[:, 1] = ys
+            y = float(ys[-1])
+            chunks.append(pts)
 
     flush()
     return subpaths
 
 
-def svg_axes_from_ticks(svg):
+def svg_axes_from_ticks(svg, tr_cache=None):
     """
     Estrae tick (label testo) e posizioni pixel assolute.
     Definisce il riquadro assi:
       - X: min/max posizione pixel dei tick orari (HH:MM o HH:MM:SS)
       - Y: min/max posizione pixel dei tick numerici
+
+    Restituisce ``(ticks, box)``: ``ticks`` è un :class:`tick_axis.TickAxis`
+    (tabella dei tick, valori numerici, gruppi sinistra/destra e fit lineari
+    calcolati una volta per SVG), ``box`` è ``ticks.box``.
     """
     rows = []
+    values = []
     for t in svg.find_all("text"):
         content = (t.get_text() or "").strip()
         if not content:
             continue
-        is_num = re.fullmatch(r"[-+]?\d+(?:[.,]\d+)?(?:\s*(dB|°|deg))?", content) is not None
-        is_time = (
-            re.fullmatch(r"\d{2}:\d{2}", content) is not None or
-            re.fullmatch(r"\d{2}:\d{2}:\d{2}", content) is not None
-        )
-        is_lock_state = re.fullmatch(
-            r"(?i)(lock(?:ed)?|unlock(?:ed)?|no\s*lock|out\s*of\s*lock|loss\s*of\s*lock)",
-            content,
-        ) is not None
-        if not (is_num or is_time or is_lock_state):
+        kind = tick_kind(content)  # "num", "time", "state" or None
+        if kind is None:
             continue
-        Sx, Sy, Tx, Ty = cumulative_transform(t)
+        Sx, Sy, Tx, Ty = cumulative_transform(t, tr_cache)
         x_px, y_px = apply_tr(0.0, 0.0, Sx, Sy, Tx, Ty)
-        if is_num:
-            kind = "num"
-        elif is_time:
-            kind = "time"
-        else:
-            kind = "state"
         rows.append({"text": content, "x_px": x_px, "y_px": y_px, "kind": kind})
+        values.append(parse_tick_number(content) if kind == "num" else np.nan)
 
-    ticks = pd.DataFrame(rows)
+    ticks = TickAxis(pd.DataFrame(rows), values)
+    return ticks, ticks.box
 
-    if ticks.empty:
-        return ticks, (None, None, None, None)
 
-    x_ticks = ticks.loc[ticks["kind"] == "time", "x_px"]
-    y_ticks = ticks.loc[ticks["kind"] == "num", "y_px"]
+SECTION_HEADERS = ("h2", "h3")
 
-    x_tick_px_min = x_ticks.min() if not x_ticks.empty else None
-    x_tick_px_max = x_ticks.max() if not x_ticks.empty else None
-    y_tick_px_min = y_ticks.min() if not y_ticks.empty else None
-    y_tick_px_max = y_ticks.max() if not y_ticks.empty else None
 
-    return ticks, (x_tick_px_min, x_tick_px_max, y_tick_px_min, y_tick_px_max)
+def _section_key(title: str) -> str:
+    """Turn a header title into the sheet/column key used throughout the workbook."""
+    return SECTION_KEY_RE.sub("_", title.lower()).strip("_") or "section"
 
 
-def extract_curve_for_header(hdr):
-    """
-    Per una sezione (h2/h3) già individuata, raccoglie gli SVG sottostanti fino
-    al prossimo h2/h3 e sceglie il sottopercorso dati migliore (massimo numero
-    di punti dentro il riquadro assi).
+def _is_svg_object(el) -> bool:
+    return getattr(el, "name", None) == "object" and el.get("type") == "image/svg+xml"
+
+
+def build_section_index(soup: BeautifulSoup):
+    """Index every h2/h3 section of the report in a single document walk.
+
+    Parameters
+    ----------
+    soup : BeautifulSoup
+        Parsed HTML report.
+
+    Returns
+    -------
+    list[dict]
+        One entry per header in document order with keys ``header`` (the
+        tag), ``title``, ``key``, ``nodes`` and ``has_chart``.
+
+    Details
+    -------
+    ``nodes`` holds the ``<svg>`` and ``<object type="image/svg+xml">``
+    elements that follow the header in document order up to the next h2/h3,
+    i.e. what the curve extractors consume.  ``has_chart`` mirrors the
+    sibling-based detection used to pick the target sections: a chart counts
+    when it lives inside one of the header's following siblings, before the
+    next h2/h3 at that level (a chart that is itself such a sibling does
+    not).  Both are computed from one ``find_all`` pass instead of a
+    ``find_next_sibling`` walk plus a ``next_elements`` walk for every
+    header.
     """
-    if hdr is None:
-        return pd.DataFrame(), pd.DataFrame()
+    sections = []
+    current = None
+    open_by_parent = {}  # id(parent) -> last section entry opened among its children
+    for el in soup.find_all([*SECTION_HEADERS, "svg", "object"]):
+        if el.name in SECTION_HEADERS:
+            title = el.get_text(" ", strip=True)
+            current = {
+                "header": el,
+                "title": title,
+                "key": _section_key(title) if title else None,
+                "nodes": [],
+                "has_chart": False,
+            }
+            sections.append(current)
+            if el.parent is not None:
+                open_by_parent[id(el.parent)] = current
+            continue
 
-    svgs = []
+        if el.name == "object" and not _is_svg_object(el):
+            continue
+        if current is not None:
+            current["nodes"].append(el)
+
+        # Sibling-region detection: any ancestor of the chart that is a later
+        # sibling of an open header marks that header as having a chart.  The
+        # chart itself is not tested, as the legacy ``sibling.find(...)`` only
+        # looked at the descendants of each sibling.
+        node = el.parent
+        while node is not None and node.parent is not None:
+            entry = open_by_parent.get(id(node.parent))
+            if entry is not None and entry["header"] is not node:
+                entry["has_chart"] = True
+            node = node.parent
+    return sections
+
+
+def _section_nodes(hdr):
+    """Collect svg/object nodes after ``hdr`` up to the next h2/h3 (no index available)."""
+    nodes = []
     for el in hdr.next_elements:
         name = getattr(el, "name", None)
-        if name in ("h2", "h3"):
+        if name in SECTION_HEADERS:
             break
-        if name == "svg":
+        if name == "svg" or _is_svg_object(el):
+            nodes.append(el)
+    return nodes
+
+
+def collect_section_svgs(hdr, nodes=None, svg_cache=None, svg_loader=None):
+    """Return the ``<svg>`` trees of a section, decoding ``<object>`` references.
+
+    ``nodes`` is the list stored in the section index; when omitted the
+    document is walked from ``hdr`` to the next header.  ``<object>``
+    references are loaded by ``svg_loader`` (default: the shared
+    :func:`svg_loader.get_loader`); ``svg_cache`` is the per-document memo of
+    the loaded trees keyed by ``id(element)``, which also keeps them alive
+    while ``tr_cache`` refers to their nodes (see :func:`cumulative_transform`).
+    """
+    if nodes is None:
+        if hdr is None:
+            return []
+        nodes = _section_nodes(hdr)
+    svgs = []
+    for el in nodes:
+        if el.name == "svg":
             svgs.append(el)
-        elif name == "object" and el.get("type") == "image/svg+xml":
-            data = el.get("data", "")
-            m = re.match(r"^data:image/svg\+xml(;charset=[^;]+)?;base64,(.*)$", data, re.I)
-            try:
-                if m:  # Base64 inline data
-                    svg_bytes = base64.b64decode(m.group(2))
-                elif data.startswith(("http://", "https://")):  # Remote file
-                    with urllib.request.urlopen(data) as resp:
-                        svg_bytes = resp.read()
-                elif data:  # Local file path
-                    with open(data, "rb") as f:
-                        svg_bytes = f.read()
-                else:
-                    continue
-                try:
-                    svg_soup = BeautifulSoup(svg_bytes, "xml")
-                except FeatureNotFound:
-                    logger.warning(
-                        "lxml parser not found; falling back to html.parser. Install lxml for full XML support."
-                    )
-                    try:
-                        svg_soup = BeautifulSoup(svg_bytes, "html.parser")
-                    except FeatureNotFound:
-                        import xml.etree.ElementTree as ET
+            continue
+        if svg_cache is not None and id(el) in svg_cache:
+            svg = svg_cache[id(el)]
+        else:
+            svg = (svg_loader or get_loader()).load(el)
+            if svg_cache is not None:
+                svg_cache[id(el)] = svg
+        if svg is not None:
+            svgs.append(svg)
+    return svgs
+
+
+def _axes_missing(axes) -> bool:
+    return any(v is None or (isinstance(v, float) and np.isnan(v)) for v in axes)
 
-                        svg_soup = BeautifulSoup(
-                            ET.tostring(ET.fromstring(svg_bytes)), "html.parser"
-                        )
-                if svg_soup.svg:
-                    svgs.append(svg_soup.svg)
-            except Exception as exc:
-                logger.warning("Failed to load SVG from %s: %s", data, exc)
-    if not svgs:
-        return pd.DataFrame(), pd.DataFrame()
 
-    # Scegli lo svg con più gruppi "gnuplot_plot_*"
-    def count_groups(s):
-        return len([g for g in s.find_all("g") if (g.get("id") or "").startswith("gnuplot_plot_")])
+def score_points_in_axes(pts, axes, margin: float = 2.0) -> int:
+    """Count the points of an ``(N, 2)`` array inside the tick box (± ``margin`` px).
 
-    best_svg = max(svgs, key=count_groups)
-    ticks, axes = svg_axes_from_ticks(best_svg)
-    x_min_tick, x_max_tick, y_min_tick, y_max_tick = axes
+    When the box is incomplete (missing time or numeric ticks) every point
+    counts, so the longest candidate wins.
+    """
+    if _axes_missing(axes):
+        return len(pts)
+    x_min, x_max, y_min, y_max = axes
+    xs = pts[:, 0]
+    ys = pts[:, 1]
+    inside = (xs >= x_min - margin) & (xs <= x_max + margin) & (ys >= y_min - margin) & (ys <= y_max + margin)
+    return int(np.count_nonzero(inside))
 
-    best_pts = []
-    best_score = -1
 
+def _plot_groups(svg):
+    """``<g>`` elements holding the data curves (``gnuplot_plot_*`` first, else any with path/polyline)."""
     groups = [
         g
-        for g in best_svg.find_all("g")
+        for g in svg.find_all("g")
         if (g.get("id") or "").startswith("gnuplot_plot_") and (g.find("path") or g.find("polyline"))
     ]
     if not groups:
-        groups = [g for g in best_svg.find_all("g") if g.find("path") or g.find("polyline")]
-    def has_missing_axes(values):
-        return any(v is None or (isinstance(v, float) and np.isnan(v)) for v in values)
-
-    for g in groups:
-        # PATH: split in subpath e valuta punti dentro assi
-        for p in g.find_all("path"):
-            d = p.get("d")
-            if not d:
-                continue
-            Sx, Sy, Tx, Ty = cumulative_transform(p)
-            for sp in parse_path_subpaths(d):
-                pts = [apply_tr(x, y, Sx, Sy, Tx, Ty) for x, y in sp]
-                if has_missing_axes((x_min_tick, x_max_tick, y_min_tick, y_max_tick)):
-                    score = len(pts)
-                else:
-                    m = 2.0
-                    score = sum(
-                        (x_min_tick - m <= x <= x_max_tick + m) and
-                        (y_min_tick - m <= y <= y_max_tick + m)
-                        for x, y in pts
-                    )
-                if score > best_score:
-                    best_pts = pts
-                    best_score = score
-
-        # POLYLINE: fallback
-        for pl in g.find_all("polyline"):
-            raw = (pl.get("points") or "").strip()
-            if not raw:
-                continue
-            raw = re.sub(r"\s+", " ", raw)
-            pairs = re.findall(
-                r"([-+]?\d*\.?\d+(?:e[-+]?\d+)?)\s*,\s*([-+]?\d*\.?\d+(?:e[-+]?\d+)?)",
-                raw
-            )
-            pts_local = [(float(x), float(y)) for x, y in pairs]
-            Sx, Sy, Tx, Ty = cumulative_transform(pl)
-            pts = [apply_tr(x, y, Sx, Sy, Tx, Ty) for x, y in pts_local]
+        groups = [g for g in svg.find_all("g") if g.find("path") or g.find("polyline")]
+    return groups
 
-            if has_missing_axes((x_min_tick, x_max_tick, y_min_tick, y_max_tick)):
-                score = len(pts)
-            else:
-                m = 2.0
-                score = sum(
-                    (x_min_tick - m <= x <= x_max_tick + m) and
-                    (y_min_tick - m <= y <= y_max_tick + m)
-                    for x, y in pts
-                )
+
+class SectionExtraction:
+    """Geometria di una sezione (h2/h3), letta una sola volta.
+
+    Raccoglie gli SVG della sezione e, per ciascuno (al primo utilizzo),
+    tick/riquadro assi e tutti i candidati curva (sottopercorsi dei
+    ``<path>`` e ``<polyline>``) con punteggio, titolo e colore.  Da qui
+    derivano sia la curva singola migliore (:meth:`best_curve`) sia le curve
+    multiple (:meth:`top_curves`): per le sezioni antenna il ripiego sulla
+    curva singola non rilegge né riparsa gli SVG.
+
+    ``nodes``, ``tr_cache``, ``svg_cache`` e ``svg_loader`` come in
+    :func:`collect_section_svgs` e :func:`cumulative_transform`.
+    """
+
+    def __init__(self, hdr, nodes=None, tr_cache=None, svg_cache=None, svg_loader=None):
+        self.svgs = []
+        if hdr is not None or nodes is not None:
+            with span("svg_decode"):
+                self.svgs = collect_section_svgs(hdr, nodes, svg_cache, svg_loader)
+                count(svgs=len(self.svgs))
+        self.tr_cache = {} if tr_cache is None else tr_cache
+        self._parsed = {}  # indice svg -> (ticks, [(score, title, pts, color), ...])
+
+    def parsed(self, sidx):
+        """``(ticks, candidates)`` dell'SVG ``sidx``; candidati nell'ordine del documento."""
+        if sidx in self._parsed:
+            return self._parsed[sidx]
+        svg = self.svgs[sidx]
+        tr_cache = self.tr_cache
+        with span("ticks"):
+            ticks, axes = svg_axes_from_ticks(svg, tr_cache)
+
+        candidates = []
+        with span("subpaths"):
+            for idx, g in enumerate(_plot_groups(svg), start=1):
+                group_id = (g.get("id") or "").strip() or f"svg{sidx + 1}_series_{idx}"
+                explicit_label = _svg_series_label(g)
+                title_tag = g.find("title")
+                base_title = explicit_label or (title_tag.get_text(" ", strip=True) if title_tag else group_id)
+                series_tag = f"{group_id} {base_title}".strip()
+
+                # PATH: split in subpath e valuta punti dentro assi
+                for p in g.find_all("path"):
+                    d = p.get("d")
+                    if not d:
+                        continue
+                    Sx, Sy, Tx, Ty = cumulative_transform(p, tr_cache)
+                    color = _svg_series_color(p, g)
+                    for sp_i, sp in enumerate(parse_path_subpaths(d), start=1):
+                        pts = apply_tr_array(sp, Sx, Sy, Tx, Ty)
+                        candidates.append((score_points_in_axes(pts, axes), f"{series_tag}_p{sp_i}", pts, color))
+
+                # POLYLINE: fallback
+                for pl_i, pl in enumerate(g.find_all("polyline"), start=1):
+                    raw = (pl.get("points") or "").strip()
+                    if not raw:
+                        continue
+                    raw = WHITESPACE_RE.sub(" ", raw)
+                    pairs = POLYLINE_PAIR_RE.findall(raw)
+                    Sx, Sy, Tx, Ty = cumulative_transform(pl, tr_cache)
+                    pts = apply_tr_array(np.asarray(pairs, dtype=float), Sx, Sy, Tx, Ty)
+                    color = _svg_series_color(pl, g)
+                    candidates.append((score_points_in_axes(pts, axes), f"{series_tag}_pl{pl_i}", pts, color))
+            count(subpaths=len(candidates), points=sum(len(c[2]) for c in candidates))
+
+        self._parsed[sidx] = (ticks, candidates)
+        return self._parsed[sidx]
+
+    def best_curve(self):
+        """``(curve_px, ticks)``: il candidato con più punti nel riquadro assi.
+
+        Si considera solo lo SVG con più gruppi ``gnuplot_plot_*``; a parità
+        di punteggio vince il primo candidato.
+        """
+        if not self.svgs:
+            return pd.DataFrame(), TickAxis()
+
+        # Scegli lo svg con più gruppi "gnuplot_plot_*"
+        def count_groups(i):
+            return len([g for g in self.svgs[i].find_all("g") if (g.get("id") or "").startswith("gnuplot_plot_")])
+
+        ticks, candidates = self.parsed(max(range(len(self.svgs)), key=count_groups))
+        best_pts = []
+        best_score = -1
+        for score, _title, pts, _color in candidates:
             if score > best_score:
                 best_pts = pts
                 best_score = score
+        return pd.DataFrame(best_pts, columns=["x_px", "y_px"]), ticks
 
-    curve_px = pd.DataFrame(best_pts, columns=["x_px", "y_px"])
-    return curve_px, ticks
+    def top_curves(self, limit=10):
+        """Fino a ``limit`` curve distinte ``(title, curve_px, ticks, color)`` per punteggio decrescente.
 
+        Vengono considerati tutti gli SVG della sezione e i candidati con
+        almeno 3 punti; i duplicati (stesso riquadro e numero di punti) sono
+        scartati.
+        """
+        candidates = []
+        for sidx in range(len(self.svgs)):
+            ticks, parsed = self.parsed(sidx)
+            candidates.extend((score, title, pts, ticks, color) for score, title, pts, color in parsed if len(pts) >= 3)
+        count(candidates=len(candidates), points=sum(len(c[2]) for c in candidates))
+        if not candidates:
+            return []
+
+        # Stable sort by score; DataFrames are built only for the curves kept.
+        candidates.sort(key=lambda x: x[0], reverse=True)
+        picked = []
+        seen = set()
+        for score, title, pts, ticks, color in candidates:
+            lo = pts.min(axis=0)
+            hi = pts.max(axis=0)
+            key = (round(float(lo[0]), 1), round(float(hi[0]), 1), round(float(lo[1]), 1), round(float(hi[1]), 1), len(pts))
+            if key in seen:
+                continue
+            seen.add(key)
+            picked.append((title, pd.DataFrame(pts, columns=["x_px", "y_px"]), ticks, color))
+            if len(picked) >= limit:
+                break
+        return picked
 
-def extract_curves_for_header(hdr):
-    """Extract multiple candidate curves for a header (multi-series friendly)."""
-    if hdr is None:
-        return []
 
-    svgs = []
-    for el in hdr.next_elements:
-        name = getattr(el, "name", None)
-        if name in ("h2", "h3"):
-            break
-        if name == "svg":
-            svgs.append(el)
-        elif name == "object" and el.get("type") == "image/svg+xml":
-            data = el.get("data", "")
-            m = re.match(r"^data:image/svg\+xml(;charset=[^;]+)?;base64,(.*)$", data, re.I)
-            try:
-                if m:
-                    svg_bytes = base64.b64decode(m.group(2))
-                elif data.startswith(("http://", "https://")):
-                    with urllib.request.urlopen(data) as resp:
-                        svg_bytes = resp.read()
-                elif data:
-                    with open(data, "rb") as f:
-                        svg_bytes = f.read()
-                else:
-                    continue
-                try:
-                    svg_soup = BeautifulSoup(svg_bytes, "xml")
-                except FeatureNotFound:
-                    svg_soup = BeautifulSoup(svg_bytes, "html.parser")
-                if svg_soup.svg:
-                    svgs.append(svg_soup.svg)
-            except Exception:
-                continue
+def extract_curve_for_header(hdr, nodes=None, tr_cache=None, svg_cache=None, svg_loader=None):
+    """
+    Per una sezione (h2/h3) già individuata, raccoglie gli SVG sottostanti fino
+    al prossimo h2/h3 e sceglie il sottopercorso dati migliore (massimo numero
+    di punti dentro il riquadro assi). ``nodes`` (dall'indice di sezione)
+    evita di ripercorrere il documento; ``tr_cache`` è la cache delle
+    trasformazioni condivisa per documento (vedi :func:`cumulative_transform`),
+    ``svg_cache``/``svg_loader`` quelle degli SVG ``<object>`` (vedi
+    :func:`collect_section_svgs`).  Vedi :meth:`SectionExtraction.best_curve`.
+    """
+    return SectionExtraction(hdr, nodes, tr_cache, svg_cache, svg_loader).best_curve()
 
-    if not svgs:
-        return []
 
-    candidates = []
+def extract_curves_for_header(hdr, nodes=None, tr_cache=None, svg_cache=None, svg_loader=None):
+    """Extract multiple candidate curves for a header (see :meth:`SectionExtraction.top_curves`)."""
+    return SectionExtraction(hdr, nodes, tr_cache, svg_cache, svg_loader).top_curves()
 
-    def has_missing_axes(values):
-        return any(v is None or (isinstance(v, float) and np.isnan(v)) for v in values)
-
-    for sidx, svg in enumerate(svgs, start=1):
-        ticks, axes = svg_axes_from_ticks(svg)
-        x_min_tick, x_max_tick, y_min_tick, y_max_tick = axes
-
-        def score_pts(pts):
-            if has_missing_axes((x_min_tick, x_max_tick, y_min_tick, y_max_tick)):
-                return len(pts)
-            m = 2.0
-            return sum(
-                (x_min_tick - m <= x <= x_max_tick + m) and
-                (y_min_tick - m <= y <= y_max_tick + m)
-                for x, y in pts
-            )
 
-        groups = [
-            g
-            for g in svg.find_all("g")
-            if (g.get("id") or "").startswith("gnuplot_plot_") and (g.find("path") or g.find("polyline"))
-        ]
-        if not groups:
-            groups = [g for g in svg.find_all("g") if g.find("path") or g.find("polyline")]
-
-        for idx, g in enumerate(groups, start=1):
-            group_id = (g.get("id") or "").strip() or f"svg{sidx}_series_{idx}"
-            explicit_label = _svg_series_label(g)
-            title_tag = g.find("title")
-            base_title = explicit_label or (title_tag.get_text(" ", strip=True) if title_tag else group_id)
-            series_tag = f"{group_id} {base_title}".strip()
-
-            for p in g.find_all("path"):
-                d = p.get("d")
-                if not d:
-                    continue
-                Sx, Sy, Tx, Ty = cumulative_transform(p)
-                for sp_i, sp in enumerate(parse_path_subpaths(d), start=1):
-                    pts = [apply_tr(x, y, Sx, Sy, Tx, Ty) for x, y in sp]
-                    if len(pts) < 3:
-                        continue
-                    color = _svg_series_color(p, g)
-                    candidates.append((score_pts(pts), f"{series_tag}_p{sp_i}", pd.DataFrame(pts, columns=["x_px", "y_px"]), ticks, color))
+TIME_COLUMN_MODES = ("strings", "datetime", "none")
 
-            for pl_i, pl in enumerate(g.find_all("polyline"), start=1):
-                raw = (pl.get("points") or "").strip()
-                if not raw:
-                    continue
-                raw = re.sub(r"\s+", " ", raw)
-                pairs = re.findall(
-                    r"([-+]?\d*\.?\d+(?:e[-+]?\d+)?)\s*,\s*([-+]?\d*\.?\d+(?:e[-+]?\d+)?)",
-                    raw,
-                )
-                pts_local = [(float(x), float(y)) for x, y in pairs]
-                if len(pts_local) < 3:
-                    continue
-                Sx, Sy, Tx, Ty = cumulative_transform(pl)
-                pts = [apply_tr(x, y, Sx, Sy, Tx, Ty) for x, y in pts_local]
-                color = _svg_series_color(pl, g)
-                candidates.append((score_pts(pts), f"{series_tag}_pl{pl_i}", pd.DataFrame(pts, columns=["x_px", "y_px"]), ticks, color))
 
-    if not candidates:
+def time_column_names(time_columns: str = "strings"):
+    """Names of the time columns added by :func:`map_x_to_time` for a given mode."""
+    if time_columns == "strings":
+        return ["time_HH:MM:SS", "time_iso_utc"]
+    if time_columns == "datetime":
+        return ["time_utc"]
+    if time_columns == "none":
         return []
+    raise ValueError(f"Unknown time_columns mode: {time_columns!r} (expected one of {TIME_COLUMN_MODES})")
 
-    candidates.sort(key=lambda x: x[0], reverse=True)
-    picked = []
-    seen = set()
-    for score, title, df, ticks, color in candidates:
-        xs = df["x_px"].to_numpy()
-        ys = df["y_px"].to_numpy()
-        key = (round(float(xs.min()), 1), round(float(xs.max()), 1), round(float(ys.min()), 1), round(float(ys.max()), 1), len(df))
-        if key in seen:
-            continue
-        seen.add(key)
-        picked.append((title, df, ticks, color))
-        if len(picked) >= 10:
-            break
 
-    return picked
+def _utc_timestamps(start_dt: datetime, t_sec):
+    """Naive UTC ``datetime64[us]`` values for ``start_dt + t_sec`` (NaN → NaT).
+
+    Offsets are rounded to the microsecond like ``timedelta(seconds=...)``.
+    """
+    us = np.round(np.asarray(t_sec, dtype=float) * 1e6)
+    start = pd.Timestamp(start_dt.astimezone(timezone.utc).replace(tzinfo=None) if start_dt.tzinfo else start_dt)
+    return (start + pd.to_timedelta(us, unit="us")).to_numpy(dtype="datetime64[us]")
 
 
-def map_x_to_time(df: pd.DataFrame, start_dt: datetime, stop_dt: datetime):
-    """Mappa x_px in tempo assoluto usando Start/Stop (in secondi)."""
+def _format_utc_seconds(stamps):
+    """Format ``datetime64`` values as ('%Y-%m-%d %H:%M:%S', '%H:%M:%S') object arrays.
+
+    Uses one ``np.datetime_as_string`` call and fixed-width character views
+    instead of a ``strftime`` per sample; NaT becomes ``None``.
+    """
+    text = np.datetime_as_string(stamps.astype("datetime64[s]"), unit="s").astype("U19")
+    chars = text.view("U1").reshape(-1, 19).copy()
+    chars[:, 10] = " "  # 'YYYY-MM-DDTHH:MM:SS' -> 'YYYY-MM-DD HH:MM:SS'
+    iso = chars.view("U19").ravel().astype(object)
+    hms = np.ascontiguousarray(chars[:, 11:19]).view("U8").ravel().astype(object)
+    nat = np.isnat(stamps)
+    if nat.any():
+        iso[nat] = None
+        hms[nat] = None
+    return iso, hms
+
+
+def map_x_to_time(df: pd.DataFrame, start_dt: datetime, stop_dt: datetime, time_columns: str = "strings"):
+    """Mappa x_px in tempo assoluto usando Start/Stop (in secondi).
+
+    ``time_columns`` sceglie le colonne temporali aggiunte oltre a ``t_sec_rel``:
+    ``"strings"`` (``time_HH:MM:SS`` e ``time_iso_utc``, default),
+    ``"datetime"`` (una colonna ``time_utc`` datetime64, UTC naive) oppure
+    ``"none"`` (nessuna).
+    """
+    names = time_column_names(time_columns)
     if df.empty or not start_dt or not stop_dt:
         df["t_sec_rel"] = np.nan
-        df["time_HH:MM:SS"] = None
-        df["time_iso_utc"] = None
+        for col in names:
+            df[col] = pd.NaT if time_columns == "datetime" else None
         return df
 
     dur = (stop_dt - start_dt).total_seconds()
@@ -607,46 +795,68 @@ def map_x_to_time(df: pd.DataFrame, start_dt: datetime, stop_dt: datetime):
     x_max = df["x_px"].max()
     if x_max == x_min:
         df["t_sec_rel"] = 0.0
-        df["time_HH:MM:SS"] = start_dt.strftime("%H:%M:%S")
-        df["time_iso_utc"] = start_dt.strftime("%Y-%m-%d %H:%M:%S")
-        return df
+    else:
+        df["t_sec_rel"] = (df["x_px"] - x_min) / (x_max - x_min) * dur
 
-    df["t_sec_rel"] = (df["x_px"] - x_min) / (x_max - x_min) * dur
-    df["time_iso_utc"] = df["t_sec_rel"].apply(
-        lambda s: (start_dt + timedelta(seconds=float(s))).strftime("%Y-%m-%d %H:%M:%S")
-    )
-    df["time_HH:MM:SS"] = df["t_sec_rel"].apply(
-        lambda s: (start_dt + timedelta(seconds=float(s))).strftime("%H:%M:%S")
-    )
+    if time_columns == "none":
+        return df
+    stamps = _utc_timestamps(start_dt, df["t_sec_rel"].to_numpy(dtype=float))
+    if time_columns == "datetime":
+        df["time_utc"] = stamps
+        return df
+    iso, hms = _format_utc_seconds(stamps)
+    df["time_iso_utc"] = iso
+    df["time_HH:MM:SS"] = hms
     return df
 
 
-def map_y_from_ticks(df: pd.DataFrame, ticks: pd.DataFrame, colname: str):
-    """Fit lineare: y_px → valore asse (da tick numerici)."""
-    if df.empty or ticks is None or ticks.empty:
+def long_format_frame(parts, start_dt: datetime):
+    """Concatenate extracted sections into one long-format DataFrame.
+
+    ``parts`` holds ``(section, t_sec_rel, value, x_px, y_px)`` tuples; the
+    result has the :data:`dataset_writer.LONG_COLUMNS` columns with ``time``
+    as UTC datetime64 (NaT when the session start is unknown).
+    """
+    if not parts:
+        frame = pd.DataFrame({col: pd.Series(dtype=float) for col in LONG_COLUMNS})
+        frame["section"] = frame["section"].astype(object)
+        frame["time"] = pd.Series(dtype="datetime64[us, UTC]")
+        return frame
+    sizes = [len(p[1]) for p in parts]
+    t_sec = np.concatenate([np.asarray(p[1], dtype=float) for p in parts])
+    frame = pd.DataFrame({
+        "section": np.repeat(np.array([p[0] for p in parts], dtype=object), sizes),
+        "t_sec_rel": t_sec,
+        "value": np.concatenate([np.asarray(p[2], dtype=float) for p in parts]),
+        "x_px": np.concatenate([np.asarray(p[3], dtype=float) for p in parts]),
+        "y_px": np.concatenate([np.asarray(p[4], dtype=float) for p in parts]),
+    })
+    if start_dt:
+        frame["time"] = pd.DatetimeIndex(_utc_timestamps(start_dt, t_sec)).tz_localize("UTC")
+    else:
+        frame["time"] = pd.Series(pd.NaT, index=frame.index, dtype="datetime64[us, UTC]")
+    return frame[LONG_COLUMNS]
+
+
+def map_y_from_ticks(df: pd.DataFrame, ticks, colname: str):
+    """Fit lineare: y_px → valore asse (da tick numerici).
+
+    ``ticks`` è il :class:`tick_axis.TickAxis` dell'SVG (o la sua tabella):
+    i fit sono già calcolati, qui vengono solo applicati.
+    """
+    axis = TickAxis.coerce(ticks)
+    if df.empty or axis.empty:
         df[colname] = np.nan
         return df
-    y_ticks = ticks[ticks["kind"] == "num"].copy()
-    if not y_ticks.empty:
-        y_ticks["value"] = y_ticks["text"].apply(
-            lambda s: float(re.sub(r"[^0-9+\-.,]", "", s).replace(",", "."))
-        )
-        Y = np.vstack([y_ticks["y_px"].values, np.ones(len(y_ticks))]).T
-        a, b = np.linalg.lstsq(Y, y_ticks["value"].values, rcond=None)[0]
-        df[colname] = a * df["y_px"] + b
+    if axis.is_num.any():
+        df[colname] = axis.map_values(df["y_px"])
         return df
 
-    state_ticks = ticks[ticks["kind"] == "state"].copy()
-    if not state_ticks.empty:
-        state_ticks["value"] = state_ticks["text"].apply(
-            lambda s: 0.0 if re.search(r"(?i)unlock|no\s*lock|out\s*of\s*lock|loss", s) else 1.0
-        )
-        if len(state_ticks) >= 2:
-            Y = np.vstack([state_ticks["y_px"].values, np.ones(len(state_ticks))]).T
-            a, b = np.linalg.lstsq(Y, state_ticks["value"].values, rcond=None)[0]
-            df[colname] = np.round(a * df["y_px"] + b).clip(0, 1)
+    if axis.is_state.any():
+        if axis.state_fit is not None:
+            df[colname] = np.round(axis.map_values(df["y_px"], axis.state_fit)).clip(0, 1)
         else:
-            df[colname] = state_ticks["value"].iloc[0]
+            df[colname] = axis.state_values[0]
         return df
 
     if "lock" in colname.lower() and not df.empty:
@@ -676,8 +886,8 @@ def _svg_series_color(*nodes):
             if val and val.lower() != "none":
                 return val
         style = node.get("style") or ""
-        for key in ("stroke", "fill"):
-            m = re.search(rf"{key}\s*:\s*([^;]+)", style, flags=re.I)
+        for key, pattern in STYLE_COLOR_RE.items():
+            m = pattern.search(style)
             if m:
                 val = m.group(1).strip()
                 if val and val.lower() != "none":
@@ -691,6 +901,7 @@ def _svg_series_color(*nodes):
     return None
 
 
+@functools.lru_cache(maxsize=256)
 def _color_family(color: str):
     """Classify a color as green/purple when possible."""
     if not color:
@@ -700,7 +911,7 @@ def _color_family(color: str):
         return "green"
     if any(k in c for k in ("purple", "violet", "magenta", "fuchsia")):
         return "purple"
-    m = re.fullmatch(r"#?([0-9a-f]{6})", c)
+    m = HEX_COLOR_RE.fullmatch(c)
     if m:
         hx = m.group(1)
         r = int(hx[0:2], 16)
@@ -710,7 +921,7 @@ def _color_family(color: str):
             return "green"
         if (r + b) / 2 >= g + 20:
             return "purple"
-    m = re.fullmatch(r"rgb\(\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*\)", c)
+    m = RGB_COLOR_RE.fullmatch(c)
     if m:
         r, g, b = map(int, m.groups())
         if g >= max(r, b) + 20:
@@ -740,6 +951,37 @@ def _svg_series_label(group):
     return titles[0] if titles else None
 
 
+def session_rows(soup: BeautifulSoup):
+    """Return the cell texts of each row of the "Session" table (first table after ``#_session``)."""
+    rows = []
+    h2 = soup.find(id="_session")
+    if h2:
+        tbl = h2.find_next("table")
+        if tbl:
+            for row in tbl.find_all("tr"):
+                cells = row.find_all(["td", "th"])
+                if cells:
+                    rows.append([c.get_text(" ", strip=True) for c in cells])
+    return rows
+
+
+def session_times(rows):
+    """Read (start, stop, report creation) datetimes from the Session table rows."""
+    start_dt = stop_dt = rep_dt = None
+    for cells in rows:
+        if len(cells) < 2:
+            continue
+        label = cells[0].lower()
+        value = cells[1]
+        if "start time" in label:
+            start_dt = parse_iso_utc(value)
+        elif "stop time" in label:
+            stop_dt = parse_iso_utc(value)
+        elif "report creation time" in label:
+            rep_dt = parse_iso_utc(value)
+    return start_dt, stop_dt, rep_dt
+
+
 def derive_orbit_filename(soup: BeautifulSoup):
     """
     Ricava (prefix, orbit_no) dall'HTML, senza fallback fissi.
@@ -748,51 +990,50 @@ def derive_orbit_filename(soup: BeautifulSoup):
               quindi <title> e header h1/h2/h3, infine pattern tipo 'AWS-PFM' nel testo.
       Se non si trova nulla, prefix=None.
     """
-    txt = soup.get_text(" ", strip=True)
+    title = soup.title.get_text(" ", strip=True) if soup.title else None
+    headers = [hdr.get_text(" ", strip=True) for hdr in soup.find_all(["h1", "h2", "h3"])]
+    return derive_orbit_from_parts(soup.get_text(" ", strip=True), session_rows(soup), title, headers)
 
+
+def derive_orbit_from_parts(txt: str, rows, title, header_texts):
+    """(prefix, orbit_no) da testo del documento, righe Session, <title> e testi h1/h2/h3."""
     # Orbit number
-    m = re.search(r"\borbit\s*[:#]?\s*(\d{1,7})\b", txt, flags=re.I)
+    m = ORBIT_RE.search(txt)
     orbit_no = m.group(1) if m else None
 
     candidates = []
 
     # 1) Dalla tabella Session
-    h2 = soup.find(id="_session")
-    if h2:
-        tbl = h2.find_next("table")
-        if tbl:
-            for row in tbl.find_all("tr"):
-                cells = row.find_all(["td", "th"])
-                if len(cells) < 2:
-                    continue
-                key = cells[0].get_text(" ", strip=True).lower()
-                val = cells[1].get_text(" ", strip=True)
-                if not val:
-                    continue
-                if any(k in key for k in (
-                    "spacecraft", "satellite", "mission", "name", "platform", "asset", "receiver", "modem"
-                )):
-                    candidates.append(val)
+    for cells in rows:
+        if len(cells) < 2:
+            continue
+        key = cells[0].lower()
+        val = cells[1]
+        if not val:
+            continue
+        if any(k in key for k in (
+            "spacecraft", "satellite", "mission", "name", "platform", "asset", "receiver", "modem"
+        )):
+            candidates.append(val)
 
     # 2) <title> + headers
-    if soup.title and soup.title.get_text(strip=True):
-        candidates.append(soup.title.get_text(" ", strip=True))
-    for hdr in soup.find_all(["h1", "h2", "h3"]):
-        t = hdr.get_text(" ", strip=True)
+    if title:
+        candidates.append(title)
+    for t in header_texts:
         if t:
             candidates.append(t)
 
     # 3) pattern tipo AWS-PFM da testo generale
-    m2 = re.search(r"\b([A-Z]{2,}(?:-[A-Z0-9]{2,})+)\b", txt)
+    m2 = MISSION_PREFIX_RE.search(txt)
     if m2:
         candidates.append(m2.group(1))
 
     prefix = None
     for raw in candidates:
-        cleaned = re.sub(r"[^A-Za-z0-9_-]+", " ", raw).strip()
-        m = re.search(r"\b([A-Za-z0-9]+(?:[-_][A-Za-z0-9]+)+)\b", cleaned)
+        cleaned = PREFIX_JUNK_RE.sub(" ", raw).strip()
+        m = PREFIX_TOKEN_RE.search(cleaned)
         if not m:
-            m = re.search(r"\b([A-Z0-9]{3,})\b", cleaned)
+            m = PREFIX_FALLBACK_RE.search(cleaned)
         if m:
             prefix = m.group(1)
             break
@@ -800,6 +1041,59 @@ def derive_orbit_filename(soup: BeautifulSoup):
     return prefix, orbit_no
 
 
+def read_report(html: Path, parser: str = "bs4"):
+    """Read session times, (prefix, orbit) and the section index from a report.
+
+    Parameters
+    ----------
+    html : Path
+        Report to read.
+    parser : str
+        ``"bs4"`` builds the full BeautifulSoup tree with ``html.parser``;
+        ``"stream"`` uses :mod:`report_stream` (lxml push parser) and keeps
+        only the session table, headers and SVG subtrees.  Falls back to
+        ``"bs4"`` when lxml is not installed.
+
+    Returns
+    -------
+    dict
+        ``start_dt``, ``stop_dt``, ``rep_dt``, ``prefix``, ``orbit_no`` and
+        ``sections`` (see :func:`build_section_index`).
+    """
+    if parser == "stream":
+        try:
+            import report_stream
+        except ImportError:
+            logger.warning("lxml not available: falling back to the bs4 parser")
+            parser = "bs4"
+    if parser == "stream":
+        parts = report_stream.read_report(html)
+        rows = parts["session_rows"]
+        prefix, orbit_no = derive_orbit_from_parts(parts["text"], rows, parts["title"], parts["header_texts"])
+        sections = parts["sections"]
+        for section in sections:
+            section["key"] = _section_key(section["title"]) if section["title"] else None
+    elif parser == "bs4":
+        with html.open("r", encoding="utf-8") as f:
+            soup = BeautifulSoup(f, "html.parser")
+        rows = session_rows(soup)
+        title = soup.title.get_text(" ", strip=True) if soup.title else None
+        headers = [hdr.get_text(" ", strip=True) for hdr in soup.find_all(["h1", "h2", "h3"])]
+        prefix, orbit_no = derive_orbit_from_parts(soup.get_text(" ", strip=True), rows, title, headers)
+        sections = build_section_index(soup)
+    else:
+        raise ValueError(f"Unknown parser backend: {parser!r} (expected 'bs4' or 'stream')")
+
+    start_dt, stop_dt, rep_dt = session_times(rows)
+    return {
+        "start_dt": start_dt,
+        "stop_dt": stop_dt,
+        "rep_dt": rep_dt,
+        "prefix": prefix,
+        "orbit_no": orbit_no,
+        "sections": sections,
+    }
+
 
 def count_unlock_events(values):
     """Count unlock events as stable 1→0→1 patterns."""
@@ -832,8 +1126,11 @@ def summarize_selected_stats(orbit_no: str, section_frames: dict, selectors):
     return rows
 
 
+# Labels (section keys, series names, SVG titles) repeat across sections and
+# reports, so the normalization and the predicates below are memoized.
+@functools.lru_cache(maxsize=4096)
 def _normalized_label(s: str) -> str:
-    return re.sub(r"[^a-z0-9]+", "", (s or "").lower())
+    return NON_ALNUM_RE.sub("", (s or "").lower())
 
 
 def _find_section_by_predicate(section_frames: dict, predicate):
@@ -867,38 +1164,38 @@ def _infer_az_el_from_antenna(section_frames: dict):
     return az_item[0], az_item[1], el_item[0], el_item[1]
 
 
+@functools.lru_cache(maxsize=4096)
 def _is_azimuth_label(label: str) -> bool:
     n = _normalized_label(label)
     return "azimuth" in n or n.startswith("az") or "antennaaz" in n
 
 
+@functools.lru_cache(maxsize=4096)
 def _is_elevation_label(label: str) -> bool:
     n = _normalized_label(label)
     return "elevation" in n or n.startswith("el") or "antennael" in n
 
 
+@functools.lru_cache(maxsize=4096)
 def _is_input_level_label(label: str) -> bool:
     n = _normalized_label(label)
     return "inputlevel" in n or "iflevel" in n or ("input" in n and "level" in n)
 
 
+@functools.lru_cache(maxsize=4096)
 def _is_ebno_label(label: str) -> bool:
     n = _normalized_label(label)
     return "ebn0" in n or "ebno" in n or "esn0" in n or "esno" in n or ("eb" in n and ("n0" in n or "no" in n))
 
 
+@functools.lru_cache(maxsize=4096)
 def _is_snr_label(label: str) -> bool:
     n = _normalized_label(label)
     return "snr" in n or "signaltonoiseratio" in n or "signalnoiseratio" in n or "cn0" in n or "cno" in n
 
 
 def _find_metric_section(section_frames: dict, selector: str):
-    metric_map = {
-        "input_level": _is_input_level_label,
-        "eb_no": _is_ebno_label,
-        "snr": _is_snr_label,
-    }
-    matcher = metric_map.get(selector)
+    matcher = _METRIC_LABELS.get(selector)
     if matcher is None:
         return None, None
 
@@ -906,12 +1203,7 @@ def _find_metric_section(section_frames: dict, selector: str):
     if df is not None and col is not None:
         return col, df
 
-    token_map = {
-        "input_level": ["input", "level", "iflevel"],
-        "eb_no": ["eb", "n0", "no", "esn0", "esno"],
-        "snr": ["snr", "cn0", "cno", "signal", "noise", "ratio"],
-    }
-    tokens = token_map.get(selector, [])
+    tokens = _METRIC_TOKENS.get(selector, [])
     scored = []
     for ycol, cdf in section_frames.items():
         n = _normalized_label(ycol)
@@ -940,6 +1232,106 @@ def _find_lock_state_section(section_frames: dict):
     return None, None
 
 
+# -------------------- Section selection --------------------
+_METRIC_LABELS = {
+    "input_level": _is_input_level_label,
+    "eb_no": _is_ebno_label,
+    "snr": _is_snr_label,
+}
+_METRIC_TOKENS = {
+    "input_level": ["input", "level", "iflevel"],
+    "eb_no": ["eb", "n0", "no", "esn0", "esno"],
+    "snr": ["snr", "cn0", "cno", "signal", "noise", "ratio"],
+}
+# Names accepted by ``sections=`` besides section keys and glob patterns.
+SECTION_ALIASES = ("antenna", "lock_state") + tuple(_METRIC_LABELS)
+
+
+def _is_antenna_section(key: str) -> bool:
+    return any(k in key.lower() for k in ("antenna", "azimuth", "elevation"))
+
+
+def _frame_keys(key: str):
+    """Keys under which a section ends up in ``section_frames``."""
+    if _is_antenna_section(key):
+        return [key, f"{key}_azimuth", f"{key}_elevation"]
+    return [key]
+
+
+def _metric_sections(keys, selector):
+    """Sections :func:`_find_metric_section` may pick for ``selector``.
+
+    The label predicate wins when any section matches it; otherwise every
+    section the token fallback could score is kept.
+    """
+    matcher = _METRIC_LABELS[selector]
+    direct = [k for k in keys if any(matcher(fk) for fk in _frame_keys(k))]
+    if direct:
+        return direct
+    out = []
+    for key in keys:
+        n = _normalized_label(key)
+        if "antenna" in n or "azimuth" in n or "elevation" in n or "lock" in n:
+            continue
+        if any(t in n for t in _METRIC_TOKENS[selector]):
+            out.append(key)
+    return out
+
+
+def _lock_state_sections(keys):
+    token = _normalized_label("demodulator_lock_state")
+    return [k for k in keys if token in _normalized_label(k)]
+
+
+def _match_section_spec(keys, spec):
+    """Section keys selected by one ``sections=`` entry (alias, key, substring or glob)."""
+    spec = spec.strip()
+    low = spec.lower()
+    if low == "antenna":
+        return [k for k in keys if _is_antenna_section(k)]
+    if low in ("lock_state", "demodulator_lock_state"):
+        return _lock_state_sections(keys)
+    if low in _METRIC_LABELS:
+        return _metric_sections(keys, low)
+    if any(ch in spec for ch in "*?["):
+        return [k for k in keys if fnmatch.fnmatchcase(k.lower(), low)]
+    wanted = _normalized_label(spec)
+    return [k for k in keys if wanted and wanted in _normalized_label(k)]
+
+
+def resolve_sections(keys, sections=None, stats_selectors=None, plot_selectors=None):
+    """Return the subset of section ``keys`` to extract, in document order.
+
+    ``sections`` lists what the caller wants in the outputs: aliases from
+    :data:`SECTION_ALIASES` (``"snr"``, ``"antenna"``, ...), section keys
+    (``"5_8_input_level"``), substrings of them (``"cpu"``) or glob patterns
+    (``"5_1*"``).  ``None`` means every section.  Whatever is given, the
+    sections needed by the selected statistics (demodulator lock state) and
+    polar plots (azimuth/elevation, the metric and the lock state) are added.
+    """
+    keys = list(keys)
+    if sections is None:
+        return keys
+    if isinstance(sections, str):
+        sections = sections.split(",")
+    chosen = set()
+    for spec in sections:
+        matched = _match_section_spec(keys, spec)
+        if not matched and spec.strip():
+            logger.warning("Section selector '%s' matches no section", spec)
+        chosen.update(matched)
+
+    if any(s.lower() == "demodulator_lock_state" for s in (stats_selectors or [])):
+        chosen.update(_lock_state_sections(keys))
+    plots = {s.lower() for s in (plot_selectors or [])} & set(_METRIC_LABELS)
+    if plots:
+        chosen.update(k for k in keys if _is_antenna_section(k))
+        chosen.update(_lock_state_sections(keys))
+        for selector in plots:
+            chosen.update(_metric_sections(keys, selector))
+    return [k for k in keys if k in chosen]
+
+
 def _align_metric_with_az_el(metric: pd.DataFrame, az: pd.DataFrame, el: pd.DataFrame):
     """Align metric samples with azimuth/elevation on common time interval."""
     # common overlap window
@@ -1172,8 +1564,130 @@ def collect_polar_plot_series(section_frames: dict, selectors, source_label=None
     return collected
 
 
-def _build_interactive_plot_artifacts(out_dir: Path, stem: str, series_map: dict, include_source=False):
-    """Render interactive Plotly HTML artifacts with hover metadata when available."""
+PLOTLY_BUNDLE = "plotly.min.js"
+
+
+def _plotly_bundle(out_dir: Path):
+    """Write the shared ``plotly.min.js`` next to the interactive plots (once) and return its ``src``."""
+    from plotly.offline import get_plotlyjs
+
+    bundle = Path(out_dir) / PLOTLY_BUNDLE
+    if not bundle.exists():
+        # Several plot workers may get here together: write aside, then rename.
+        tmp = bundle.with_name(f"{bundle.name}.{os.getpid()}.tmp")
+        tmp.write_text(get_plotlyjs(), encoding="utf-8")
+        os.replace(tmp, bundle)
+    return PLOTLY_BUNDLE
+
+
+def _build_lod_interactive_figures(go, series, selector, max_points, include_source):
+    """Polar and 3D Plotly figures of ``series`` bounded to ``max_points`` points per layer.
+
+    Each layer (tracks, samples, unlocks) is a single WebGL trace: tracks are
+    simplified and joined with gaps, samples are merged on a sky grid when
+    they exceed the budget (see :mod:`plot_lod`).
+    """
+    metric_col = series["metric_col"]
+    az_vals = np.asarray(series["azimuth"], dtype=float)
+    el_vals = np.asarray(series["elevation"], dtype=float)
+    metric_vals = np.asarray(series["metric"], dtype=float)
+    lock_vals = np.asarray(series.get("lock_state", []), dtype=float)
+    unlock_mask = np.asarray(series.get("unlock_mask", []), dtype=bool)
+    source_label = series.get("source_label", "combined")
+    point_source = np.asarray(series.get("point_source", np.array([source_label] * len(az_vals), dtype=object)), dtype=object)
+    title_suffix = f" ({source_label})" if include_source else ""
+    color_title = "SNR (dB)" if "snr" in metric_col.lower() or "noise" in metric_col.lower() else metric_col
+
+    segments = series.get("track_segments") or []
+    if not segments and len(series.get("track_az", [])):
+        segments = [{"azimuth": series["track_az"], "elevation": series["track_el"], "source": source_label}]
+    chunks, labels = [], []
+    for seg in segments:
+        for chunk in _split_azimuth_wrapped_segments(seg.get("azimuth", []), seg.get("elevation", [])):
+            chunks.append(chunk)
+            labels.append(str(seg.get("source", source_label)))
+    track_az, track_el, track_text = simplify_tracks(chunks, max_points, labels)
+
+    binned = bin_sky_points(az_vals, el_vals, metric_vals, max_points, sources=point_source)
+    if binned is None:
+        pts_az, pts_el, pts_val = az_vals, el_vals, metric_vals
+        pts_label = point_source
+        label_hover = "Orbit: %{customdata[0]}"
+    else:
+        pts_az, pts_el, pts_val = binned["azimuth"], binned["elevation"], binned["value"]
+        pts_label = np.array(
+            [f"{c} samples, {p} pass{'es' if p != 1 else ''}" for c, p in zip(binned["count"], binned["passes"])],
+            dtype=object,
+        )
+        label_hover = "%{customdata[0]} (mean)"
+        logger.info("%s: %d samples merged into %d sky cells", metric_col, len(az_vals), len(pts_az))
+    customdata = np.column_stack([pts_label, pts_az, pts_el, pts_val]) if len(pts_az) else np.empty((0, 4), dtype=object)
+    point_hover = label_hover + "<br>Azimuth: %{customdata[1]:.2f}°<br>Elevation: %{customdata[2]:.2f}°<br>Value: %{customdata[3]:.2f}<extra></extra>"
+
+    unlock_idx = np.array([], dtype=int)
+    if selector == "snr" and len(unlock_mask) == len(az_vals) and np.any(unlock_mask):
+        unlock_idx = np.flatnonzero(unlock_mask)
+        if max_points and len(unlock_idx) > max_points:
+            unlock_idx = unlock_idx[np.linspace(0, len(unlock_idx) - 1, max_points).astype(int)]
+    unlock_custom = np.column_stack([
+        point_source[unlock_idx], az_vals[unlock_idx], el_vals[unlock_idx], metric_vals[unlock_idx], lock_vals[unlock_idx],
+    ]) if len(unlock_idx) else None
+    unlock_hover = "Orbit: %{customdata[0]}<br>Azimuth: %{customdata[1]:.2f}°<br>Elevation: %{customdata[2]:.2f}°<br>SNR: %{customdata[3]:.2f}<br>Lock state: %{customdata[4]:.0f}<extra></extra>"
+
+    fig_p = go.Figure()
+    if len(track_az):
+        fig_p.add_trace(go.Scatterpolargl(
+            theta=track_az, r=1.0 - (track_el / 90.0), mode="lines", line=dict(color="black", width=2),
+            text=track_text, hovertemplate="Orbit: %{text}<extra>track</extra>", showlegend=False,
+        ))
+    fig_p.add_trace(go.Scatterpolargl(
+        theta=pts_az, r=1.0 - (pts_el / 90.0), mode="markers",
+        marker=dict(color=pts_val, colorscale="Jet", size=7, colorbar=dict(title=color_title)),
+        customdata=customdata, hovertemplate=point_hover, showlegend=False,
+    ))
+    if unlock_custom is not None:
+        fig_p.add_trace(go.Scatterpolargl(
+            theta=az_vals[unlock_idx], r=1.0 - (el_vals[unlock_idx] / 90.0), mode="markers",
+            marker=dict(color="#8A2BE2", size=8, line=dict(color="#5A189A", width=0.8)),
+            name="Unlocks (lock=0)", customdata=unlock_custom, hovertemplate=unlock_hover,
+        ))
+    fig_p.update_layout(
+        title=f"{metric_col} on antenna track{title_suffix}",
+        polar=dict(angularaxis=dict(direction="clockwise", rotation=90), radialaxis=dict(range=[0, 1.02], tickvals=[0, 0.5, 1.0], ticktext=["0", "0.5", "1"])),
+    )
+
+    fig3 = go.Figure()
+    if len(track_az):
+        tx, ty, tz = _spherical_to_cartesian(track_az, track_el)
+        fig3.add_trace(go.Scatter3d(
+            x=tx, y=ty, z=tz, mode="lines", line=dict(color="black", width=4),
+            text=track_text, hovertemplate="Orbit: %{text}<extra>track</extra>", showlegend=False,
+        ))
+    x, y, z = _spherical_to_cartesian(pts_az, pts_el)
+    fig3.add_trace(go.Scatter3d(
+        x=x, y=y, z=z, mode="markers",
+        marker=dict(size=4, color=pts_val, colorscale="Turbo", colorbar=dict(title=color_title)),
+        customdata=customdata, hovertemplate=point_hover, showlegend=False,
+    ))
+    if unlock_custom is not None:
+        ux, uy, uz = _spherical_to_cartesian(az_vals[unlock_idx], el_vals[unlock_idx])
+        fig3.add_trace(go.Scatter3d(
+            x=ux, y=uy, z=uz, mode="markers",
+            marker=dict(size=5, color="#8A2BE2", line=dict(color="#5A189A", width=1)),
+            name="Unlocks (lock=0)", customdata=unlock_custom, hovertemplate=unlock_hover,
+        ))
+    fig3.update_layout(title=f"{metric_col} 3D spherical sky-view{title_suffix}", scene=dict(xaxis_title="X", yaxis_title="Y", zaxis_title="Z"))
+    return fig_p, fig3
+
+
+def _build_interactive_plot_artifacts(out_dir: Path, stem: str, series_map: dict, include_source=False, max_points=None):
+    """Render interactive Plotly HTML artifacts with hover metadata when available.
+
+    With ``max_points`` every layer is drawn as one WebGL trace of at most
+    ``max_points`` points (see :func:`_build_lod_interactive_figures`);
+    otherwise all samples and track chunks are drawn as they are.  The HTML
+    files load plotly.js from a shared ``plotly.min.js`` in ``out_dir``.
+    """
     if not series_map:
         return []
 
@@ -1186,12 +1700,23 @@ def _build_interactive_plot_artifacts(out_dir: Path, stem: str, series_map: dict
     artifacts = []
     out_dir = Path(out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
+    plotly_js = _plotly_bundle(out_dir)
 
     for selector in ("input_level", "eb_no", "snr"):
         series = series_map.get(selector)
         if not series:
             continue
 
+        if max_points:
+            metric_col = series["metric_col"]
+            source_label = series.get("source_label", "combined")
+            fig_p, fig3 = _build_lod_interactive_figures(go, series, selector, max_points, include_source)
+            for kind, fig in (("polar_interactive", fig_p), ("3d_interactive", fig3)):
+                html = out_dir / f"{stem}_{metric_col}_{kind}.html"
+                fig.write_html(str(html), include_plotlyjs=plotly_js)
+                artifacts.append({"plot": metric_col, "kind": kind, "path": str(html), "source": source_label})
+            continue
+
         metric_col = series["metric_col"]
         az_vals = np.asarray(series["azimuth"], dtype=float)
         el_vals = np.asarray(series["elevation"], dtype=float)
@@ -1266,7 +1791,7 @@ def _build_interactive_plot_artifacts(out_dir: Path, stem: str, series_map: dict
             polar=dict(angularaxis=dict(direction="clockwise", rotation=90), radialaxis=dict(range=[0, 1.02], tickvals=[0, 0.5, 1.0], ticktext=["0", "0.5", "1"])),
         )
         html_p = out_dir / f"{stem}_{metric_col}_polar_interactive.html"
-        fig_p.write_html(str(html_p), include_plotlyjs="cdn")
+        fig_p.write_html(str(html_p), include_plotlyjs=plotly_js)
         artifacts.append({"plot": metric_col, "kind": "polar_interactive", "path": str(html_p), "source": source_label})
 
         x, y, z = _spherical_to_cartesian(az_vals, el_vals)
@@ -1312,14 +1837,18 @@ def _build_interactive_plot_artifacts(out_dir: Path, stem: str, series_map: dict
             ))
         html3 = out_dir / f"{stem}_{metric_col}_3d_interactive.html"
         fig3.update_layout(title=f"{metric_col} 3D spherical sky-view{title_suffix}", scene=dict(xaxis_title="X", yaxis_title="Y", zaxis_title="Z"))
-        fig3.write_html(str(html3), include_plotlyjs="cdn")
+        fig3.write_html(str(html3), include_plotlyjs=plotly_js)
         artifacts.append({"plot": metric_col, "kind": "3d_interactive", "path": str(html3), "source": source_label})
 
     return artifacts
 
 
-def _build_plot_artifacts(out_dir: Path, stem: str, series_map: dict, include_source=False):
-    """Render polar/3D plot artifacts from pre-aligned series."""
+def _build_plot_artifacts(out_dir: Path, stem: str, series_map: dict, include_source=False, max_points=None):
+    """Render polar/3D plot artifacts from pre-aligned series.
+
+    ``max_points`` bounds the interactive figures (see
+    :func:`_build_interactive_plot_artifacts`); PNGs always use every sample.
+    """
     if not series_map:
         return []
 
@@ -1354,6 +1883,7 @@ def _build_plot_artifacts(out_dir: Path, stem: str, series_map: dict, include_so
         title_suffix = f" ({source_label})" if include_source else ""
 
         if has_matplotlib:
+            with span("plot_png", points=len(az_vals)):
                 theta = np.deg2rad(np.mod(az_vals, 360.0))
                 radius_norm = 1.0 - (el_vals / 90.0)
 
@@ -1466,116 +1996,56 @@ def _build_plot_artifacts(out_dir: Path, stem: str, series_map: dict, include_so
                 artifacts.append({"plot": metric_col, "kind": "3d", "path": str(png3d_path), "source": source_label})
 
 
-    artifacts.extend(_build_interactive_plot_artifacts(out_dir, stem, series_map, include_source=include_source))
+    with span("plot_interactive", points=sum(len(s["azimuth"]) for s in series_map.values())):
+        artifacts.extend(
+            _build_interactive_plot_artifacts(out_dir, stem, series_map, include_source=include_source, max_points=max_points)
+        )
     return artifacts
 
 
+def render_plot_job(job):
+    """Render the individual plot set described by ``job`` and return its artifact rows.
+
+    ``job`` holds ``out_dir``, ``stem`` and ``series`` (the dict returned by
+    :func:`collect_polar_plot_series`).  Safe to run in a worker process: it
+    only uses the Agg backend and writes files under ``out_dir``.
+    """
+    return _build_plot_artifacts(Path(job["out_dir"]), job["stem"], job["series"], include_source=False)
+
+
 def generate_polar_plot_artifacts(out_path: Path, section_frames: dict, selectors, source_label=None):
     """Generate polar color plots (metric over azimuth/elevation) for a single file."""
     series_map = collect_polar_plot_series(section_frames, selectors, source_label=source_label or out_path.stem)
     return _build_plot_artifacts(out_path.parent, out_path.stem, series_map, include_source=False)
 
 
-def generate_combined_polar_plot_artifacts(output_dir: Path, plot_series_rows: list, selectors):
-    """Generate one combined plot per selected parameter across all processed files."""
-    wanted = {s.lower() for s in (selectors or [])}
-    if not wanted or not plot_series_rows:
-        return []
-
-    combined = {}
-    for selector in ("input_level", "eb_no", "snr"):
-        if selector not in wanted:
-            continue
-        rows = [row for row in plot_series_rows if row.get("selector") == selector]
-        if not rows:
-            continue
-        track_az_parts = [np.asarray(row["track_az"], dtype=float) for row in rows if len(row.get("track_az", []))]
-        track_el_parts = [np.asarray(row["track_el"], dtype=float) for row in rows if len(row.get("track_el", []))]
-        track_segments = [
-            {
-                "azimuth": np.asarray(row["track_az"], dtype=float),
-                "elevation": np.asarray(row["track_el"], dtype=float),
-                "source": row.get("source_label", "combined"),
-            }
-            for row in rows
-            if len(row.get("track_az", [])) and len(row.get("track_el", []))
-        ]
-        combined[selector] = {
-            "selector": selector,
-            "metric_col": rows[0]["metric_col"],
-            "azimuth": np.concatenate([np.asarray(row["azimuth"], dtype=float) for row in rows]),
-            "elevation": np.concatenate([np.asarray(row["elevation"], dtype=float) for row in rows]),
-            "metric": np.concatenate([np.asarray(row["metric"], dtype=float) for row in rows]),
-            "lock_state": np.concatenate([np.asarray(row.get("lock_state", np.array([], dtype=float)), dtype=float) for row in rows]),
-            "unlock_mask": np.concatenate([np.asarray(row.get("unlock_mask", np.array([], dtype=bool)), dtype=bool) for row in rows]),
-            "point_source": np.concatenate([
-                np.asarray(row.get("point_source", np.array([row.get("source_label", "combined")] * len(row["azimuth"]), dtype=object)), dtype=object)
-                for row in rows
-            ]),
-            "track_az": np.concatenate(track_az_parts) if track_az_parts else np.array([]),
-            "track_el": np.concatenate(track_el_parts) if track_el_parts else np.array([]),
-            "track_segments": track_segments,
-            "source_label": "all files",
-        }
+def _as_accumulator(plot_series):
+    """``plot_series`` as a :class:`SeriesAccumulator` (lists of series rows are appended to a new one)."""
+    if isinstance(plot_series, SeriesAccumulator):
+        return plot_series
+    return SeriesAccumulator().extend(plot_series or [])
 
-    return _build_plot_artifacts(output_dir, "combined", combined, include_source=True)
 
+def generate_combined_polar_plot_artifacts(output_dir: Path, plot_series, selectors, max_points=DEFAULT_MAX_POINTS):
+    """Generate one combined plot per selected parameter across all processed files.
 
-def _numeric_tick_groups(ticks: pd.DataFrame):
-    """Split numeric ticks into one or two X-side groups (for dual Y axes)."""
-    if ticks is None or ticks.empty:
-        return []
-    num = ticks[ticks.get("kind") == "num"].copy()
-    if num.empty:
+    ``plot_series`` is a :class:`series_accumulator.SeriesAccumulator` or a
+    list of series rows.  The interactive figures are level-of-detail
+    bounded to ``max_points`` points per layer (``0``/``None``: every
+    sample, one trace per track).
+    """
+    wanted = {s.lower() for s in (selectors or [])}
+    if not wanted or not plot_series:
         return []
-    num["val"] = num["text"].apply(lambda t: float(re.sub(r"[^0-9+\-.,]", "", str(t)).replace(",", ".")))
-    num = num.dropna(subset=["x_px", "y_px", "val"])
-    if len(num) < 2:
-        return [num]
-
-    x_sorted = np.sort(num["x_px"].to_numpy(dtype=float))
-    x_diffs = np.diff(x_sorted)
-    if len(x_diffs) == 0 or np.nanmax(x_diffs) <= 0:
-        return [num]
-
-    split_at = int(np.nanargmax(x_diffs))
-    gap = float(x_diffs[split_at])
-    total_span = float(x_sorted[-1] - x_sorted[0])
-    if total_span <= 0 or gap < max(8.0, 0.15 * total_span):
-        return [num]
-
-    threshold = float((x_sorted[split_at] + x_sorted[split_at + 1]) / 2.0)
-    left = num[num["x_px"] <= threshold]
-    right = num[num["x_px"] > threshold]
-    groups = []
-    if len(left) >= 2:
-        groups.append(left)
-    if len(right) >= 2:
-        groups.append(right)
-    if not groups:
-        groups.append(num)
-    return groups
 
+    combined = _as_accumulator(plot_series).series_map(wanted)
+    return _build_plot_artifacts(output_dir, "combined", combined, include_source=True, max_points=max_points)
 
-def _tick_group_minmax(tick_group: pd.DataFrame):
-    """Return numeric min/max for a tick group."""
-    if tick_group is None or tick_group.empty:
-        return None, None
-    grp = tick_group.copy()
-    if "val" not in grp:
-        grp["val"] = grp["text"].apply(lambda t: float(re.sub(r"[^0-9+\-.,]", "", str(t)).replace(",", ".")))
-    vals = pd.to_numeric(grp["val"], errors="coerce").dropna()
-    if vals.empty:
-        return None, None
-    return float(vals.min()), float(vals.max())
 
-
-def _tick_group_matches_series(series_name: str, tick_group: pd.DataFrame):
-    """Check whether a Y-axis tick group is compatible with the expected series."""
+def _tick_group_matches_series(series_name: str, tick_group: dict):
+    """Check whether a Y-axis tick group (see :class:`tick_axis.TickAxis`) is compatible with the expected series."""
     name = (series_name or "").lower()
-    vmin, vmax = _tick_group_minmax(tick_group)
-    if vmin is None or vmax is None:
-        return False
+    vmin, vmax = tick_group["min"], tick_group["max"]
 
     is_plot1 = "gnuplot_plot_1" in name
     is_plot2 = "gnuplot_plot_2" in name
@@ -1611,19 +2081,6 @@ def _sanitize_curve_timebase(raw_df: pd.DataFrame):
     return df[["x_px", "y_px"]]
 
 
-def _map_curve_with_ticks_group(raw_df: pd.DataFrame, tick_group: pd.DataFrame, out_col: str):
-    """Map y_px to values using a specific numeric tick group."""
-    if raw_df.empty or tick_group is None or tick_group.empty:
-        tmp = raw_df.copy()
-        tmp[out_col] = np.nan
-        return tmp
-    Y = np.vstack([tick_group["y_px"].values, np.ones(len(tick_group))]).T
-    a, b = np.linalg.lstsq(Y, tick_group["val"].values, rcond=None)[0]
-    tmp = raw_df.copy()
-    tmp[out_col] = a * tmp["y_px"] + b
-    return tmp
-
-
 def _regularize_antenna_series(df: pd.DataFrame, az_col: str, el_col: str):
     """Regularize antenna az/el time series to reduce extraction jitter."""
     out = df.copy()
@@ -1631,10 +2088,10 @@ def _regularize_antenna_series(df: pd.DataFrame, az_col: str, el_col: str):
 
     # Collapse duplicated/near-duplicated timestamps by median value.
     out["t_key"] = out["t_sec_rel"].round(3)
+    time_cols = [c for c in ("time_HH:MM:SS", "time_iso_utc", "time_utc") if c in out]
     agg = out.groupby("t_key", as_index=False).agg({
         "t_sec_rel": "median",
-        "time_HH:MM:SS": "first",
-        "time_iso_utc": "first",
+        **{c: "first" for c in time_cols},
         "x_px_az": "median",
         "y_px_az": "median",
         az_col: "median",
@@ -1671,169 +2128,250 @@ def _regularize_antenna_series(df: pd.DataFrame, az_col: str, el_col: str):
     return agg.drop(columns=["t_key"], errors="ignore")
 
 
-def build_antenna_combined_df(ycol, curves, start_dt, stop_dt):
-    """Build a single antenna dataframe with azimuth and elevation columns."""
-    mapped = []
-    for idx, curve in enumerate(curves, start=1):
-        if len(curve) == 4:
-            series_name, raw_df, ticks, series_color = curve
-        else:
-            series_name, raw_df, ticks = curve
-            series_color = None
-        base_curve = _sanitize_curve_timebase(raw_df.copy())
-        base = map_x_to_time(base_curve, start_dt, stop_dt)
-        if base.empty:
-            continue
-
-        candidates = []
-        explicit_series_axis = (
-            "gnuplot_plot_1" in (series_name or "").lower()
-            or "gnuplot_plot_2" in (series_name or "").lower()
-            or _is_azimuth_label(series_name or "")
-            or _is_elevation_label(series_name or "")
-        )
-        # candidate 1: all numeric ticks together
-        all_num = ticks[ticks.get("kind") == "num"].copy() if ticks is not None and not ticks.empty else pd.DataFrame()
-        if not all_num.empty and not explicit_series_axis:
-            all_num["val"] = all_num["text"].apply(lambda t: float(re.sub(r"[^0-9+\-.,]", "", str(t)).replace(",", ".")))
-            all_num = all_num.dropna(subset=["x_px", "y_px", "val"])
-            if len(all_num) >= 2:
-                dfa = _map_curve_with_ticks_group(base, all_num, f"value_{idx}_all")
-                candidates.append((dfa, f"value_{idx}_all"))
-
-        # candidate 2..n: per-side numeric tick groups (dual-axis charts)
-        for g_i, grp in enumerate(_numeric_tick_groups(ticks), start=1):
-            if explicit_series_axis and not _tick_group_matches_series(series_name, grp):
-                continue
-            dfg = _map_curve_with_ticks_group(base, grp, f"value_{idx}_g{g_i}")
-            candidates.append((dfg, f"value_{idx}_g{g_i}"))
+# Shape features of the antenna az/el candidates (columns of the feature
+# matrix) and their weights in the azimuth and elevation scores.  Boolean
+# features are 0/1; ``bias`` is always 1.
+ANTENNA_FEATURES = (
+    "bias",
+    "frac_az",  # share of values in [-5, 365]
+    "frac_el",  # share of values in [-2, 92]
+    "mono",  # share of steps in the dominant direction
+    "bell",  # 1 / (1 + sign changes of the steps)
+    "interior_peak",  # 1 at mid-pass peak, 0 at the edges
+    "edge_relief",  # (max - mean of the first/last 1/12) / range, >= 0
+    "smooth",  # 1 - largest step / (0.12 * range), clipped to [0, 1]
+    "range",
+    "range_over_90",
+    "max_over_120",
+    "max_5_95",
+    "max_le_60",
+    "peak_at_edge",  # peak in the first or last 8 %
+    "step_excess",  # largest step / range above 0.12
+    "jump_outliers",  # share of steps above max(0.12 range, 3 median step)
+    "name_az",
+    "name_el",
+    "purple",
+    "green",
+)
+ANTENNA_AZ_WEIGHTS = {
+    "frac_az": 2.0,
+    "mono": 1.8,
+    "max_over_120": 1.2,
+    "range": 0.001,
+    "name_az": 4.0,
+    "purple": 6.0,
+    "name_el": -1.5,
+}
+ANTENNA_EL_WEIGHTS = {
+    "bias": -0.8,
+    "frac_el": 2.0,
+    "bell": 1.7,
+    "interior_peak": 1.6,
+    "edge_relief": 1.4,
+    "smooth": 1.2,
+    "max_5_95": 1.8,
+    "range_over_90": -0.001,
+    "peak_at_edge": -1.2,
+    "step_excess": -4.0,
+    "jump_outliers": -2.5,
+    "name_el": 4.0,
+    "green": 6.0,
+    "name_az": -1.5,
+    "max_le_60": 0.8,
+}
+
+
+def _antenna_weight_matrix():
+    """``(features, 2)`` weights: column 0 scores azimuth, column 1 elevation."""
+    return np.array([[ANTENNA_AZ_WEIGHTS.get(f, 0.0), ANTENNA_EL_WEIGHTS.get(f, 0.0)] for f in ANTENNA_FEATURES])
+
+
+def _antenna_shape_features(values: np.ndarray):
+    """Shape features of candidate series sharing their time base.
+
+    ``values`` is ``(candidates, samples)``.  Returns the ``(candidates,
+    len(ANTENNA_FEATURES))`` matrix (name/colour columns left at 0) and a
+    mask of the usable rows (rows without any non-flat step are not).
+    """
+    v = values
+    n = v.shape[1]
+    out = np.zeros((len(v), len(ANTENNA_FEATURES)))
+    col = {name: i for i, name in enumerate(ANTENNA_FEATURES)}
+
+    vmin, vmax = v.min(axis=1), v.max(axis=1)
+    vrng = vmax - vmin
+    safe_rng = np.maximum(vrng, 1e-6)
+    peak_frac = np.argmax(v, axis=1) / max(n - 1, 1)
+    edge_span = max(1, n // 12)
+    edge_mean = np.concatenate([v[:, :edge_span], v[:, -edge_span:]], axis=1).mean(axis=1)
+
+    d1 = np.diff(v, axis=1)
+    abs_d1 = np.abs(d1)
+    moving = abs_d1 > 1e-9
+    n_moving = moving.sum(axis=1)
+    usable = n_moving > 0
+    n_moving = np.maximum(n_moving, 1)
+    max_step_rel = abs_d1.max(axis=1) / safe_rng
+    jump_floor = np.maximum(np.maximum(0.12 * vrng, 3.0 * np.median(abs_d1, axis=1)), 1e-6)
+
+    # Sign changes between consecutive non-flat steps: carry the last
+    # non-zero sign forward and compare each step with the previous one.
+    signs = np.where(moving, np.sign(d1), 0.0)
+    last = np.maximum.accumulate(np.where(moving, np.arange(n - 1), 0), axis=1)
+    carried = np.take_along_axis(signs, last, axis=1)
+    transitions = np.count_nonzero(moving[:, 1:] & (signs[:, 1:] * carried[:, :-1] < 0), axis=1)
+
+    out[:, col["bias"]] = 1.0
+    out[:, col["frac_az"]] = np.mean((v >= -5) & (v <= 365), axis=1)
+    out[:, col["frac_el"]] = np.mean((v >= -2) & (v <= 92), axis=1)
+    out[:, col["mono"]] = np.maximum(((d1 > 0) & moving).sum(axis=1), ((d1 < 0) & moving).sum(axis=1)) / n_moving
+    out[:, col["bell"]] = 1.0 / (1.0 + transitions)
+    out[:, col["interior_peak"]] = np.maximum(0.0, 1.0 - np.abs(peak_frac - 0.5) / 0.5)
+    out[:, col["edge_relief"]] = np.maximum(0.0, (vmax - edge_mean) / safe_rng)
+    out[:, col["smooth"]] = np.maximum(0.0, 1.0 - np.minimum(1.0, max_step_rel / 0.12))
+    out[:, col["range"]] = vrng
+    out[:, col["range_over_90"]] = np.maximum(0.0, vrng - 90.0)
+    out[:, col["max_over_120"]] = vmax > 120
+    out[:, col["max_5_95"]] = (vmax >= 5) & (vmax <= 95)
+    out[:, col["max_le_60"]] = vmax <= 60
+    out[:, col["peak_at_edge"]] = (peak_frac <= 0.08) | (peak_frac >= 0.92)
+    out[:, col["step_excess"]] = np.maximum(0.0, max_step_rel - 0.12)
+    out[:, col["jump_outliers"]] = np.mean(abs_d1 > jump_floor[:, None], axis=1)
+    return out, usable
+
+
+def _log_antenna_features(ycol, labels, features, scores, az_i, el_i):
+    """Debug dump of the candidate feature matrix (one JSON object), for tuning the weights."""
+    rows = [
+        {
+            "candidate": col,
+            "series": name,
+            "az_score": round(float(scores[i, 0]), 4),
+            "el_score": round(float(scores[i, 1]), 4),
+            "features": {f: round(float(x), 4) for f, x in zip(ANTENNA_FEATURES, features[i])},
+        }
+        for i, (col, name) in enumerate(labels)
+    ]
+    dump = {"section": ycol, "azimuth": labels[az_i][0], "elevation": labels[el_i][0], "candidates": rows}
+    logger.debug("Antenna candidate features: %s", json.dumps(dump))
 
-        for cand_df, cand_col in candidates:
-            vals = pd.to_numeric(cand_df[cand_col], errors="coerce")
-            if vals.dropna().empty:
-                continue
-            mapped.append((idx, series_name, cand_df, vals, cand_col, series_color))
 
-    if len(mapped) < 2:
-        return None
+def build_antenna_combined_df(ycol, curves, start_dt, stop_dt, time_columns="strings"):
+    """Build a single antenna dataframe with azimuth and elevation columns.
 
-    # choose azimuth/elevation with value-domain aware scoring.
-    scored = []
-    for idx, series_name, df, vals, val_col, series_color in mapped:
-        tmp = df[["t_sec_rel", val_col]].copy()
-        tmp = tmp.dropna().sort_values("t_sec_rel")
-        if len(tmp) < 8:
-            continue
-        v = pd.to_numeric(tmp[val_col], errors="coerce").dropna().to_numpy(dtype=float)
-        if len(v) < 8:
-            continue
-        vmin, vmax = float(np.min(v)), float(np.max(v))
-        vrng = float(vmax - vmin)
-        peak_idx = int(np.nanargmax(v))
-        peak_frac = (peak_idx / max(len(v) - 1, 1)) if len(v) else 0.5
-        edge_span = max(1, len(v) // 12)
-        edge_mean = float(np.nanmean(np.concatenate([v[:edge_span], v[-edge_span:]])))
-        edge_relief = (vmax - edge_mean) / max(vrng, 1e-6)
-        interior_peak_score = max(0.0, 1.0 - abs(peak_frac - 0.5) / 0.5)
-
-        d1 = np.diff(v)
-        nz = d1[np.abs(d1) > 1e-9]
-        if len(nz) == 0:
-            continue
-        abs_d1 = np.abs(d1)
-        max_step_rel = float(np.nanmax(abs_d1) / max(vrng, 1e-6))
-        median_step = float(np.nanmedian(abs_d1)) if len(abs_d1) else 0.0
-        jump_floor = max(0.12 * vrng, 3.0 * median_step, 1e-6)
-        jump_outlier_frac = float(np.mean(abs_d1 > jump_floor)) if len(abs_d1) else 0.0
-        smooth_score = max(0.0, 1.0 - min(1.0, max_step_rel / 0.12))
-        frac_pos = float(np.mean(nz > 0))
-        frac_neg = float(np.mean(nz < 0))
-        mono_score = max(frac_pos, frac_neg)
-
-        # bell-shape score: signs should go + ... - with at most one transition.
-        signs = np.sign(nz)
-        trans = np.sum(signs[1:] * signs[:-1] < 0)
-        bell_score = 1.0 / (1.0 + trans)
-
-        frac_az = float(np.mean((v >= -5) & (v <= 365)))
-        frac_el = float(np.mean((v >= -2) & (v <= 92)))
-        name = (series_name or "").lower()
-        name_has_az = ("az" in name) or ("azimuth" in name)
-        name_has_el = ("el" in name) or ("elev" in name)
-        color_family = _color_family(series_color)
-
-        az_score = (
-            2.0 * frac_az
-            + 1.8 * mono_score
-            + (1.2 if vmax > 120 else 0.0)
-            + 0.001 * vrng
-            + (4.0 if name_has_az else 0.0)
-            + (6.0 if color_family == "purple" else 0.0)
-            - (1.5 if name_has_el else 0.0)
-        )
-        el_score = (
-            2.0 * frac_el
-            + 1.7 * bell_score
-            + 1.6 * interior_peak_score
-            + 1.4 * max(0.0, edge_relief)
-            + 1.2 * smooth_score
-            + (1.0 if 5 <= vmax <= 95 else -0.8)
-            - 0.001 * max(0.0, vrng - 90.0)
-            - (1.2 if peak_frac <= 0.08 or peak_frac >= 0.92 else 0.0)
-            - 4.0 * max(0.0, max_step_rel - 0.12)
-            - 2.5 * jump_outlier_frac
-            + (4.0 if name_has_el else 0.0)
-            + (6.0 if color_family == "green" else 0.0)
-            - (1.5 if name_has_az else 0.0)
-            + (0.8 if vmax <= 60 else 0.0)
-        )
+    Every curve is mapped with each compatible numeric tick group (all
+    ticks, then the left/right axis of dual-axis charts); the candidates are
+    described by the shape features of :data:`ANTENNA_FEATURES` and scored
+    as ``features @ weights`` (see :data:`ANTENNA_AZ_WEIGHTS` and
+    :data:`ANTENNA_EL_WEIGHTS`).  With ``DEBUG`` logging the feature matrix
+    is logged as JSON.
+    """
+    mapped = []  # (curve index, series name, base frame, colour, [(column, a, b), ...])
+    n_candidates = 0
+    with span("antenna_map"):
+        for idx, curve in enumerate(curves, start=1):
+            if len(curve) == 4:
+                series_name, raw_df, ticks, series_color = curve
+            else:
+                series_name, raw_df, ticks = curve
+                series_color = None
+            base_curve = _sanitize_curve_timebase(raw_df.copy())
+            # Time columns are only formatted for the curve chosen as azimuth.
+            base = map_x_to_time(base_curve, start_dt, stop_dt, "none")
+            if base.empty:
+                continue
 
-        scored.append((
-            idx,
-            series_name,
-            df,
-            val_col,
-            color_family,
-            az_score,
-            el_score,
-            vmin,
-            vmax,
-            vrng,
-            mono_score,
-            bell_score,
-            peak_frac,
-            edge_relief,
-            interior_peak_score,
-            max_step_rel,
-            jump_outlier_frac,
-            smooth_score,
-        ))
+            explicit_series_axis = (
+                "gnuplot_plot_1" in (series_name or "").lower()
+                or "gnuplot_plot_2" in (series_name or "").lower()
+                or _is_azimuth_label(series_name or "")
+                or _is_elevation_label(series_name or "")
+            )
+            # Tick groups and their fits are computed once per SVG (TickAxis).
+            axis = TickAxis.coerce(ticks)
+            fits = []
+            # candidate 1: all numeric ticks together
+            if axis.n_numeric >= 2 and not explicit_series_axis:
+                fits.append((f"value_{idx}_all", *axis.num_fit))
+            # candidate 2..n: per-side numeric tick groups (dual-axis charts)
+            for g_i, grp in enumerate(axis.groups, start=1):
+                if explicit_series_axis and not _tick_group_matches_series(series_name, grp):
+                    continue
+                fits.append((f"value_{idx}_g{g_i}", *grp["fit"]))
+            if fits:
+                mapped.append((idx, series_name, base, _color_family(series_color), fits))
+                n_candidates += len(fits)
+        count(curves=len(curves), candidates=n_candidates)
 
-    if len(scored) < 2:
+    if n_candidates < 2:
         return None
 
-    az_named = [t for t in scored if _is_azimuth_label(t[1] or "")]
-    el_named = [t for t in scored if _is_elevation_label(t[1] or "")]
-    az_group = [t for t in scored if re.search(r"\bgnuplot_plot_1\b", t[1] or "", flags=re.I)]
-    el_group = [t for t in scored if re.search(r"\bgnuplot_plot_2\b", t[1] or "", flags=re.I)]
-    az_colored = [t for t in scored if t[4] == "purple"]
-    el_colored = [t for t in scored if t[4] == "green"]
-
-    az_pool = az_group if az_group else (az_named if az_named else (az_colored if az_colored else scored))
-    az_item = max(az_pool, key=lambda t: t[5])
-    el_pool = el_group if el_group else (el_named if el_named else (el_colored if el_colored else scored))
-    el_candidates = [t for t in el_pool if t[0] != az_item[0]]
-    if not el_candidates:
-        # fallback to different mapping candidate from same raw curve
-        el_candidates = [t for t in el_pool if t[3] != az_item[3]]
-        if not el_candidates:
+    # choose azimuth/elevation with value-domain aware scoring: one feature
+    # row per candidate, the candidates of a curve computed together.
+    with span("antenna_score"):
+        blocks, owners = [], []
+        col = {name: i for i, name in enumerate(ANTENNA_FEATURES)}
+        for idx, series_name, base, color_family, fits in mapped:
+            t = pd.to_numeric(base["t_sec_rel"], errors="coerce").to_numpy(dtype=float)
+            y = pd.to_numeric(base["y_px"], errors="coerce").to_numpy(dtype=float)
+            ok = np.isfinite(t) & np.isfinite(y)
+            if np.count_nonzero(ok) < 8:
+                continue
+            y = y[ok][np.argsort(t[ok], kind="stable")]
+            a = np.array([fit[1] for fit in fits])
+            b = np.array([fit[2] for fit in fits])
+            features, usable = _antenna_shape_features(a[:, None] * y[None, :] + b[:, None])
+            name = (series_name or "").lower()
+            features[:, col["name_az"]] = ("az" in name) or ("azimuth" in name)
+            features[:, col["name_el"]] = ("el" in name) or ("elev" in name)
+            features[:, col["purple"]] = color_family == "purple"
+            features[:, col["green"]] = color_family == "green"
+            blocks.append(features[usable])
+            owners.extend((idx, series_name, base, color_family, fit) for fit, keep in zip(fits, usable) if keep)
+        if len(owners) < 2:
             return None
-    el_item = max(el_candidates, key=lambda t: t[6])
+        features = np.vstack(blocks)
+        scores = features @ _antenna_weight_matrix()
 
-    az_idx, az_df, az_col = az_item[0], az_item[2], az_item[3]
-    el_idx, el_df, el_col = el_item[0], el_item[2], el_item[3]
+        names = [o[1] or "" for o in owners]
+        curve_idx = np.array([o[0] for o in owners])
+        families = np.array([o[3] or "" for o in owners])
+        every = np.ones(len(owners), dtype=bool)
 
-    az = az_df[["t_sec_rel", "time_HH:MM:SS", "time_iso_utc", "x_px", "y_px", az_col]].copy()
+        def pool(*masks):
+            return next((m for m in masks if m.any()), every)
+
+        az_pool = pool(
+            np.array([GNUPLOT_PLOT_1_RE.search(n) is not None for n in names]),
+            np.array([_is_azimuth_label(n) for n in names]),
+            families == "purple",
+        )
+        az_i = int(np.flatnonzero(az_pool)[np.argmax(scores[az_pool, 0])])
+        el_pool = pool(
+            np.array([GNUPLOT_PLOT_2_RE.search(n) is not None for n in names]),
+            np.array([_is_elevation_label(n) for n in names]),
+            families == "green",
+        )
+        el_mask = el_pool & (curve_idx != curve_idx[az_i])
+        if not el_mask.any():
+            # fallback to different mapping candidate from same raw curve
+            el_mask = el_pool & (np.arange(len(owners)) != az_i)
+            if not el_mask.any():
+                return None
+        el_i = int(np.flatnonzero(el_mask)[np.argmax(scores[el_mask, 1])])
+        if logger.isEnabledFor(logging.DEBUG):
+            _log_antenna_features(ycol, [(o[4][0], o[1]) for o in owners], features, scores, az_i, el_i)
+
+    def candidate_frame(owner, columns="none"):
+        base, (out_col, a, b) = owner[2], owner[4]
+        if columns != "none":
+            base = map_x_to_time(base[["x_px", "y_px"]].copy(), start_dt, stop_dt, columns)
+        return base.assign(**{out_col: a * base["y_px"] + b}), out_col
+
+    az_df, az_col = candidate_frame(owners[az_i], time_columns)
+    el_df, el_col = candidate_frame(owners[el_i])
+
+    az = az_df[["t_sec_rel", *time_column_names(time_columns), "x_px", "y_px", az_col]].copy()
     az = az.rename(columns={"x_px": "x_px_az", "y_px": "y_px_az", az_col: f"{ycol}_azimuth"})
     el = el_df[["t_sec_rel", "x_px", "y_px", el_col]].copy()
     el = el.rename(columns={"x_px": "x_px_el", "y_px": "y_px_el", el_col: f"{ycol}_elevation"})
@@ -1845,12 +2383,14 @@ def build_antenna_combined_df(ycol, curves, start_dt, stop_dt):
     if az.empty or el.empty:
         return None
 
-    merged = pd.merge_asof(az, el, on="t_sec_rel", direction="nearest")
-    # sanitize physical ranges for pointing angles
-    merged[f"{ycol}_azimuth"] = pd.to_numeric(merged[f"{ycol}_azimuth"], errors="coerce") % 360.0
-    merged[f"{ycol}_elevation"] = pd.to_numeric(merged[f"{ycol}_elevation"], errors="coerce").clip(0.0, 90.0)
-    merged = merged.dropna(subset=[f"{ycol}_azimuth", f"{ycol}_elevation"])
-    merged = _regularize_antenna_series(merged, f"{ycol}_azimuth", f"{ycol}_elevation")
+    with span("antenna_merge"):
+        merged = pd.merge_asof(az, el, on="t_sec_rel", direction="nearest")
+        # sanitize physical ranges for pointing angles
+        merged[f"{ycol}_azimuth"] = pd.to_numeric(merged[f"{ycol}_azimuth"], errors="coerce") % 360.0
+        merged[f"{ycol}_elevation"] = pd.to_numeric(merged[f"{ycol}_elevation"], errors="coerce").clip(0.0, 90.0)
+        merged = merged.dropna(subset=[f"{ycol}_azimuth", f"{ycol}_elevation"])
+        merged = _regularize_antenna_series(merged, f"{ycol}_azimuth", f"{ycol}_elevation")
+        count(points=len(merged))
     return merged
 
 
@@ -1865,6 +2405,17 @@ def process_html(
     plot_rows=None,
     plot_series_rows=None,
     generate_individual_plots=True,
+    parser="bs4",
+    time_columns="strings",
+    excel_engine="auto",
+    ticks_sheets=True,
+    formats=("xlsx",),
+    artifact_paths=None,
+    progress=None,
+    sections=None,
+    stats_only=False,
+    plot_jobs=None,
+    svg_loader=None,
 ) -> Path:
     """Elabora un report HTML e salva i grafici in un file Excel.
 
@@ -1874,11 +2425,49 @@ def process_html(
         Percorso del file HTML del report.
     output_dir : Path
         Directory in cui salvare l'Excel risultante.
+    parser : str
+        Backend di lettura dell'HTML: ``"bs4"`` (default) o ``"stream"``
+        (lxml, vedi :func:`read_report`).
+    time_columns : str
+        Colonne temporali nei fogli: ``"strings"`` (default), ``"datetime"``
+        o ``"none"`` (vedi :func:`map_x_to_time`).
+    excel_engine : str
+        Motore di scrittura dell'Excel: ``"auto"`` (xlsxwriter se installato),
+        ``"xlsxwriter"`` o ``"openpyxl"`` (vedi :mod:`xlsx_writer`).
+    ticks_sheets : bool
+        Se ``False`` non scrive i fogli ``<sezione>_ticks``.
+    formats : iterable of str or str
+        Output da generare: ``"xlsx"`` e/o ``"parquet"``/``"feather"``
+        (dataset long-format partizionato per prefix/orbit, vedi
+        :mod:`dataset_writer`). Accetta anche ``"xlsx,parquet"``.
+    artifact_paths : list, optional
+        Se fornita viene estesa con tutti i file scritti per il report
+        (Excel, Parquet/Feather, plot), usata dal manifest delle esecuzioni
+        incrementali.
+    progress : callable, optional
+        Chiamata con un dict per ogni evento (``section_extracted``,
+        ``artifact_written``), vedi :func:`process_many`.
+    sections : list of str or str, optional
+        Sezioni da estrarre (alias, chiavi, sottostringhe o pattern glob, vedi
+        :func:`resolve_sections`); ``None`` = tutte. Le sezioni richieste da
+        ``stats_selectors``/``plot_selectors`` vengono sempre aggiunte.
+    stats_only : bool
+        Non scrive Excel né Parquet/Feather: estrae solo le sezioni che servono
+        a statistiche e plot polari (oltre a ``sections``, se indicate).
+    plot_jobs : list, optional
+        Se fornita, i plot individuali non vengono disegnati qui: viene
+        aggiunto un job (dict con ``out_dir``, ``stem``, ``series``) da passare
+        a :func:`render_plot_job`, ad es. in un pool separato.
+    svg_loader : svg_loader.SvgLoader, optional
+        Caricatore degli SVG ``<object>`` (default: quello condiviso del
+        processo, vedi :func:`svg_loader.get_loader`). I riferimenti delle
+        sezioni estratte vengono risolti in parallelo prima dell'estrazione.
 
     Returns
     -------
-    Path
-        Percorso del file Excel creato.
+    Path or None
+        Percorso del file Excel creato (o del file Parquet/Feather se
+        l'Excel non è tra i ``formats``); ``None`` con ``stats_only``.
     """
     html = Path(html_path)
     if not html.exists():
@@ -1890,57 +2479,47 @@ def process_html(
                 f"File HTML non trovato: {html_path} (cwd) o {alt} (script dir)"
             )
 
+    time_column_names(time_columns)  # validate before doing any work
+    formats = () if stats_only else parse_formats(formats)
+    if stats_only and sections is None:
+        sections = []  # only the dependencies of stats/plot selectors
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    with html.open("r", encoding="utf-8") as f:
-        soup = BeautifulSoup(f, "html.parser")
+    tr_stats_before = transform_cache_stats()
+    with span("read_report"):
+        report = read_report(html, parser=parser)
+        count(sections=len(report["sections"]))
+    tr_cache = {}  # composed SVG transforms, shared by every section of this report
+    start_dt, stop_dt, rep_dt = report["start_dt"], report["stop_dt"], report["rep_dt"]
 
-    # Tempi di sessione
-    start_dt = stop_dt = rep_dt = None
-    h2 = soup.find(id="_session")
-    if h2:
-        tbl = h2.find_next("table")
-        if tbl:
-            for row in tbl.find_all("tr"):
-                cells = row.find_all(["td", "th"])
-                if len(cells) < 2:
-                    continue
-                label = cells[0].get_text(" ", strip=True).lower()
-                value = cells[1].get_text(" ", strip=True)
-                if "start time" in label:
-                    start_dt = parse_iso_utc(value)
-                elif "stop time" in label:
-                    stop_dt = parse_iso_utc(value)
-                elif "report creation time" in label:
-                    rep_dt = parse_iso_utc(value)
-
-    # Sezioni target: cerca dinamicamente tutti gli header h2/h3 e verifica
-    # se contengono grafici (svg/object) prima del prossimo header.
+    # Sezioni target: indice costruito in un solo passaggio sul documento con
+    # tutti gli header h2/h3 e i grafici (svg/object) che li seguono.
     targets = []
-    for hdr in soup.find_all(["h2", "h3"]):
-        title = hdr.get_text(" ", strip=True)
-        if not title:
-            continue
-        cur = hdr
-        has_chart = False
-        while True:
-            cur = cur.find_next_sibling()
-            if cur is None or cur.name in ("h2", "h3"):
-                break
-            if cur.find("svg") or cur.find("object", type="image/svg+xml"):
-                has_chart = True
-                break
-        if not has_chart:
+    EXCLUDE = {"session", "activities", "channel"}
+    for section in report["sections"]:
+        key = section["key"]
+        if not key or not section["has_chart"]:
             continue
-        key = re.sub(r"\W+", "_", title.lower()).strip("_") or "section"
-        EXCLUDE = {"session", "activities", "channel"}
         if key in EXCLUDE or any(key.endswith(f"_{e}") for e in EXCLUDE):
             continue
-        targets.append((hdr, key))
+        targets.append(section)
+    if sections is not None:
+        keep = set(resolve_sections(
+            [t["key"] for t in targets], sections, stats_selectors, plot_selectors
+        ))
+        targets = [t for t in targets if t["key"] in keep]
+
+    # Gli SVG <object> (URL, file locali) delle sezioni estratte vengono
+    # caricati in parallelo; ``svg_cache`` evita di rileggerli quando la stessa
+    # sezione passa da più estrattori.
+    svg_loader = svg_loader or get_loader()
+    svg_cache = {}
+    with span("svg_prefetch"):
+        count(objects=svg_loader.prefetch(el for t in targets for el in t["nodes"] if el.name == "object"))
 
     # Nome file in base a (prefix, orbit_no) trovati nell'HTML
-    prefix, orbit_no = derive_orbit_filename(soup)
+    prefix, orbit_no = report["prefix"], report["orbit_no"]
     base = (
         f"{prefix}_orbit_{orbit_no}" if prefix and orbit_no else
         f"{prefix}_orbit" if prefix and not orbit_no else
@@ -1948,107 +2527,1341 @@ def process_html(
         "orbit"
     )
 
-    # writer: salva sempre in .xlsx
+    # Il nome .xlsx resta la base anche per i plot quando l'Excel non viene scritto.
     out_path = output_dir / (base + ".xlsx")
+    write_xlsx = "xlsx" in formats
     section_frames = {}
-    with pd.ExcelWriter(out_path, engine="openpyxl") as wr:
+    long_parts = []  # (section, t_sec_rel, value, x_px, y_px) per l'output colonnare
+    meta = {
+        "start_time_utc": start_dt.strftime("%Y-%m-%d %H:%M:%S") if start_dt else None,
+        "stop_time_utc": stop_dt.strftime("%Y-%m-%d %H:%M:%S") if stop_dt else None,
+        "report_time_utc": rep_dt.strftime("%Y-%m-%d %H:%M:%S") if rep_dt else None,
+    }
+    with WorkbookWriter(out_path, engine=excel_engine) if write_xlsx else nullcontext() as wr:
+        def write_sheet(sheet, df):
+            if wr is not None:
+                with span("excel_write", sheets=1, rows=len(df)):
+                    wr.write(sheet, df)
+
         # Meta
-        pd.DataFrame([
-            {
-                "start_time_utc": start_dt.strftime("%Y-%m-%d %H:%M:%S") if start_dt else None,
-                "stop_time_utc": stop_dt.strftime("%Y-%m-%d %H:%M:%S") if stop_dt else None,
-                "report_time_utc": rep_dt.strftime("%Y-%m-%d %H:%M:%S") if rep_dt else None,
-            }
-        ]).to_excel(wr, sheet_name="__meta__", index=False)
+        write_sheet("__meta__", pd.DataFrame([meta]))
+
+        def write_ticks(sheet_key, ticks):
+            if not ticks_sheets:
+                return
+            tname = safe_sheet_name(sheet_key + "_ticks")
+            frame = TickAxis.coerce(ticks).frame
+            write_sheet(tname, frame if not frame.empty else pd.DataFrame([{"note": "no ticks"}]))
 
         # Per ogni sezione, estrai e salva in un foglio
         def write_section(sheet_key, df, ticks):
-            df = map_x_to_time(df, start_dt, stop_dt)
-            df = map_y_from_ticks(df, ticks, colname=sheet_key)
+            with span("map_time"):
+                df = map_x_to_time(df, start_dt, stop_dt, time_columns)
+                df = map_y_from_ticks(df, ticks, colname=sheet_key)
             section_frames[sheet_key] = df.copy()
 
-            cols = ["x_px", "y_px", "t_sec_rel", "time_HH:MM:SS", "time_iso_utc", sheet_key]
+            cols = ["x_px", "y_px", "t_sec_rel", *time_column_names(time_columns), sheet_key]
             df = df.reindex(cols, axis=1)
             sheet = safe_sheet_name(sheet_key)
-            if df.empty:
-                pd.DataFrame([{"note": "nessun dato estratto"}]).to_excel(wr, sheet_name=sheet, index=False)
-            else:
-                df.to_excel(wr, sheet_name=sheet, index=False)
+            write_sheet(sheet, df if not df.empty else pd.DataFrame([{"note": "nessun dato estratto"}]))
+            write_ticks(sheet_key, ticks)
+            if not df.empty:
+                long_parts.append((sheet_key, df["t_sec_rel"], df[sheet_key], df["x_px"], df["y_px"]))
 
-            tname = safe_sheet_name(sheet_key + "_ticks")
-            (ticks if not ticks.empty else pd.DataFrame([{"note": "no ticks"}])).to_excel(
-                wr, sheet_name=tname, index=False
-            )
-
-        for hdr, ycol in targets:
+        for section in targets:
+            hdr, ycol, nodes = section["header"], section["key"], section["nodes"]
             is_antenna = any(k in ycol.lower() for k in ("antenna", "azimuth", "elevation"))
+            # Geometria della sezione letta una volta sola, anche se l'antenna
+            # ripiega sulla curva singola.
+            extraction = None
             if is_antenna:
-                multi = extract_curves_for_header(hdr)
-                combined = build_antenna_combined_df(ycol, multi, start_dt, stop_dt) if multi else None
+                with span("extract"):
+                    extraction = SectionExtraction(hdr, nodes, tr_cache, svg_cache, svg_loader)
+                    multi = extraction.top_curves()
+                    combined = build_antenna_combined_df(ycol, multi, start_dt, stop_dt, time_columns) if multi else None
                 if combined is not None:
                     section_frames[f"{ycol}_azimuth"] = combined[["t_sec_rel", f"{ycol}_azimuth"]].copy()
                     section_frames[f"{ycol}_elevation"] = combined[["t_sec_rel", f"{ycol}_elevation"]].copy()
                     sheet = safe_sheet_name(ycol)
-                    combined.to_excel(wr, sheet_name=sheet, index=False)
+                    write_sheet(sheet, combined)
                     # Save ticks of first detected curve as reference for this combined sheet
-                    tname = safe_sheet_name(ycol + "_ticks")
-                    ref_ticks = multi[0][2] if multi else pd.DataFrame([{"note": "no ticks"}])
-                    (ref_ticks if not ref_ticks.empty else pd.DataFrame([{"note": "no ticks"}])).to_excel(
-                        wr, sheet_name=tname, index=False
-                    )
+                    write_ticks(ycol, multi[0][2])
+                    for axis, suffix in (("azimuth", "az"), ("elevation", "el")):
+                        col = f"{ycol}_{axis}"
+                        long_parts.append(
+                            (col, combined["t_sec_rel"], combined[col], combined[f"x_px_{suffix}"], combined[f"y_px_{suffix}"])
+                        )
+                    _emit(progress, "section_extracted", path=str(html), section=ycol, rows=len(combined))
                     continue
 
-            df, ticks = extract_curve_for_header(hdr)
+            with span("extract"):
+                if extraction is None:
+                    extraction = SectionExtraction(hdr, nodes, tr_cache, svg_cache, svg_loader)
+                df, ticks = extraction.best_curve()
             write_section(ycol, df, ticks)
-    wb = wr.book
-    if "Sheet" in wb.sheetnames:
-        wb.remove(wb["Sheet"])
+            _emit(progress, "section_extracted", path=str(html), section=ycol, rows=len(df))
+
+        if wr is not None:
+            with span("excel_close"):
+                wr.close()
+
+    dataset_paths = []
+    if any(fmt in DATASET_FORMATS for fmt in formats):
+        with span("dataset_write"):
+            frame = long_format_frame(long_parts, start_dt)
+            count(rows=len(frame))
+            for fmt in formats:
+                if fmt in DATASET_FORMATS:
+                    path = write_report_dataset(output_dir, fmt, base, frame, meta, prefix=prefix, orbit_no=orbit_no)
+                    if path is not None:
+                        dataset_paths.append(path)
+    _log_transform_cache_stats(tr_stats_before, html.name)
+    tr_cache.clear()
+    svg_cache.clear()
 
     if stats_rows is not None:
-        stats_rows.extend(summarize_selected_stats(orbit_no, section_frames, stats_selectors))
-
+        with span("stats"):
+            stats_rows.extend(summarize_selected_stats(orbit_no, section_frames, stats_selectors))
+
+    want_plots = plot_rows is not None and generate_individual_plots
+    series_map = {}
+    if plot_series_rows is not None or want_plots:
+        with span("plot_series"):
+            series_map = collect_polar_plot_series(section_frames, plot_selectors, source_label=out_path.stem)
+            count(points=sum(len(s["azimuth"]) for s in series_map.values()))
     if plot_series_rows is not None:
-        plot_series_rows.extend(
-            collect_polar_plot_series(section_frames, plot_selectors, source_label=out_path.stem).values()
+        plot_series_rows.extend(series_map.values())
+    series_path = None
+    if series_map:
+        # Lets ``combine-plots`` redraw combined charts without parsing the HTML again.
+        with span("series_cache"):
+            series_path = save_series(out_path.with_name(out_path.stem + SERIES_SUFFIX), list(series_map.values()))
+
+    plot_artifacts = []
+    if want_plots and series_map:
+        job = {"out_dir": str(out_path.parent), "stem": out_path.stem, "series": series_map}
+        if plot_jobs is not None:
+            plot_jobs.append(job)  # rendered later by the caller (see process_many plot_workers)
+        else:
+            with span("plots"):
+                plot_artifacts = render_plot_job(job)
+            plot_rows.extend(plot_artifacts)
+
+    written = (
+        ([out_path] if write_xlsx else [])
+        + dataset_paths
+        + ([series_path] if series_path else [])
+        + [Path(row["path"]) for row in plot_artifacts]
+    )
+    for artifact in written:
+        _emit(progress, "artifact_written", path=str(html), artifact=str(artifact))
+    if artifact_paths is not None:
+        artifact_paths.extend(written)
+
+    if write_xlsx:
+        return out_path
+    return dataset_paths[0] if dataset_paths else None
+
+
+def _emit(progress, event, **fields):
+    """Send a progress event (a dict with an ``event`` key) to ``progress`` if set."""
+    if progress is not None:
+        progress({"event": event, **fields})
+
+
+class _QueueProgress:
+    """Picklable progress callback forwarding events from worker processes to a queue."""
+
+    def __init__(self, events, index):
+        self.events = events
+        self.index = index
+
+    def __call__(self, event):
+        self.events.put({**event, "index": self.index})
+
+
+def _process_report_task(html_path, output_dir, options, progress=None, defer_plots=False, profile=False,
+                         cprofile_dir=None, svg_options=None):
+    """Worker entry point: run :func:`process_html` and return its collected rows.
+
+    Exceptions are caught and returned as text so that one broken report does
+    not abort the rest of the batch.  With ``defer_plots`` the individual plots
+    are not rendered: their jobs are returned under ``plot_jobs``.  With
+    ``profile`` the stage timings are returned under ``profile`` (see
+    :mod:`profiling`); ``cprofile_dir`` also dumps a ``<report>.pstats`` file
+    there.  ``svg_options`` are the :func:`svg_loader.get_loader` settings
+    for ``<object>`` SVGs.
+    """
+    stats_rows, plot_rows, plot_series_rows, artifacts = [], [], [], []
+    plot_jobs = [] if defer_plots else None
+    result = {
+        "path": str(html_path),
+        "out_path": None,
+        "stats_rows": stats_rows,
+        "plot_rows": plot_rows,
+        "plot_series_rows": plot_series_rows,
+        "artifacts": artifacts,
+        "error": None,
+    }
+    cprofile_path = Path(cprofile_dir) / (Path(html_path).stem + ".pstats") if cprofile_dir else None
+    with profiling.profiled(Path(html_path).name, cprofile_path) if profile or cprofile_path else nullcontext() as prof:
+        try:
+            with span("process_html"):
+                result["out_path"] = process_html(
+                    html_path,
+                    output_dir,
+                    stats_rows=stats_rows,
+                    plot_rows=plot_rows,
+                    plot_series_rows=plot_series_rows,
+                    artifact_paths=artifacts,
+                    progress=progress,
+                    plot_jobs=plot_jobs,
+                    svg_loader=get_loader(**svg_options) if svg_options else None,
+                    **options,
+                )
+        except Exception:
+            result["error"] = traceback.format_exc()
+    if prof is not None:
+        result["profile"] = prof.to_dict()
+    if plot_jobs:
+        result["plot_jobs"] = plot_jobs
+    return result
+
+
+def _report_options(stats_selectors, plot_selectors, generate_individual_plots, parser, time_columns, excel_engine,
+                    ticks_sheets, formats, sections, stats_only):
+    """:func:`process_html` options of a batch (their :func:`run_manifest.settings_key` identifies the outputs)."""
+    return {
+        "stats_selectors": stats_selectors,
+        "plot_selectors": plot_selectors,
+        "generate_individual_plots": generate_individual_plots,
+        "parser": parser,
+        "time_columns": time_columns,
+        "excel_engine": excel_engine,
+        "ticks_sheets": ticks_sheets,
+        "formats": parse_formats(formats),
+        "sections": list(sections) if sections is not None and not isinstance(sections, str) else sections,
+        "stats_only": stats_only,
+    }
+
+
+def _svg_options(svg_threads, svg_timeout, svg_cache_dir):
+    """``svg_options`` of :func:`_process_report_task`, ``None`` for the defaults.
+
+    Not part of the :func:`process_html` options: they do not change the
+    outputs (``settings_key``).
+    """
+    if svg_threads == DEFAULT_FETCH_THREADS and svg_timeout == DEFAULT_TIMEOUT_S and not svg_cache_dir:
+        return None
+    return {
+        "threads": svg_threads,
+        "timeout": svg_timeout,
+        "cache_dir": str(svg_cache_dir) if svg_cache_dir else None,
+    }
+
+
+def process_many(
+    paths,
+    output_dir: Path,
+    workers: int = 1,
+    stats_selectors=None,
+    plot_selectors=None,
+    generate_individual_plots=True,
+    parser="bs4",
+    time_columns="strings",
+    excel_engine="auto",
+    ticks_sheets=True,
+    formats=("xlsx",),
+    incremental=True,
+    force=False,
+    prune_stale=False,
+    progress=None,
+    cancel_event=None,
+    sections=None,
+    stats_only=False,
+    plot_workers=0,
+    series_spill_mb=None,
+    profile=False,
+    cprofile_dir=None,
+    svg_threads=DEFAULT_FETCH_THREADS,
+    svg_timeout=DEFAULT_TIMEOUT_S,
+    svg_cache_dir=None,
+):
+    """Process several HTML reports, optionally in parallel.
+
+    Parameters
+    ----------
+    paths : iterable of Path
+        Reports to process.  The iterable is consumed lazily (e.g. straight
+        from :func:`report_discovery.iter_reports`): a report is submitted as
+        soon as a worker is free, while the rest is still being discovered.
+    output_dir : Path
+        Directory receiving the Excel files and plot artifacts.
+    workers : int
+        Number of worker processes. ``1`` (or less) processes the reports
+        serially in the calling process.
+    plot_workers : int
+        Number of processes rendering the individual polar plots (matplotlib
+        Agg + plotly).  With ``0`` the plots are rendered by whoever extracts
+        the report; otherwise extraction only collects the polar series and
+        the rendering runs in a separate pool, overlapping with the
+        extraction of the next reports.  A report is recorded (and reported
+        as done) once its plots are written.
+    series_spill_mb : float, optional
+        Size (MiB) above which the accumulated polar series are moved to
+        memory-mapped files in ``output_dir`` (see :mod:`series_accumulator`).
+    profile : bool
+        Time the stages of each processed report (see :mod:`profiling`).
+        Plots rendered by the ``plot_workers`` pool are not included.
+    cprofile_dir : path, optional
+        Also run :mod:`cProfile` on each processed report and write
+        ``<report>.pstats`` files to this directory (implies ``profile``).
+    svg_threads, svg_timeout, svg_cache_dir
+        Loading of ``<object>`` SVGs (see :class:`svg_loader.SvgLoader`):
+        threads resolving the references of a report in parallel, timeout in
+        seconds of each request and optional disk cache of remote SVGs.
+    stats_selectors, plot_selectors, generate_individual_plots, parser, time_columns,
+    excel_engine, ticks_sheets, formats, sections, stats_only
+        Forwarded to :func:`process_html`.
+    incremental : bool
+        Keep a content-hash manifest in ``output_dir`` (see :mod:`run_manifest`)
+        and skip reports whose content and settings are unchanged since the
+        last run, reusing their cached stats rows, plot rows and polar series.
+    force : bool
+        Reprocess every report even if the manifest says it is unchanged.
+    prune_stale : bool
+        Delete artifacts that a reprocessed report no longer produces and
+        drop manifest entries (and their files) of reports that no longer
+        exist.
+    progress : callable, optional
+        Called (in the calling process, possibly from a helper thread) with
+        one dict per event: ``report_started``, ``section_extracted``,
+        ``artifact_written``, ``report_done``, ``report_skipped``,
+        ``report_failed`` and a final ``batch_done``.  Events carry
+        ``path`` and ``index``; report-level events also ``done``, ``total``,
+        ``elapsed_s`` and ``eta_s``.  ``total`` and ``eta_s`` are ``None``
+        while ``paths`` has not been fully consumed.
+    cancel_event : threading.Event, optional
+        When set, no further report is started; reports already running are
+        completed and recorded.
+
+    Returns
+    -------
+    dict
+        ``saved`` (output paths), ``skipped`` (unchanged reports reused from
+        the manifest), ``failed`` (``(path, traceback)`` pairs), ``cancelled``
+        (reports not started because of ``cancel_event``), the merged
+        ``stats_rows`` and ``plot_rows`` and ``plot_series``, a
+        :class:`series_accumulator.SeriesAccumulator` with the polar series
+        of every report.  Rows are merged in input order regardless of
+        completion order; polar series are appended as reports complete, so
+        that they are not all kept as separate arrays until the end.
+        With ``profile``, ``profiles`` lists the stage timings (a
+        :meth:`profiling.Profile.to_dict` summary) of each processed report,
+        in input order.
+    """
+    source = iter(paths)
+    paths = []  # grows as ``source`` is consumed
+    exhausted = False
+    options = _report_options(
+        stats_selectors, plot_selectors, generate_individual_plots, parser, time_columns, excel_engine,
+        ticks_sheets, formats, sections, stats_only,
+    )
+    results = []
+    series = SeriesAccumulator(
+        spill_bytes=series_spill_mb * 2**20 if series_spill_mb else None,
+        spill_dir=output_dir if series_spill_mb else None,
+    )
+    manifest = RunManifest.load(output_dir) if incremental else None
+    settings = settings_key(options) if manifest is not None else None
+    digests = {}
+    t_start = time.perf_counter()
+    done = 0
+
+    def report(i, res):
+        nonlocal done
+        results[i] = res
+        done += 1
+        if res["error"]:
+            logger.error("Error processing %s:\n%s", res["path"], res["error"])
+            event = "report_failed"
+        elif res.get("skipped"):
+            logger.info("Unchanged, reusing cached outputs: %s", res["path"])
+            event = "report_skipped"
+        else:
+            logger.info("Salvato: %s", res["out_path"] or f"{res['path']} (stats only)")
+            event = "report_done"
+            if manifest is not None and digests.get(i):
+                manifest.record(paths[i], digests[i], settings, res, prune=prune_stale)
+        series.extend(res["plot_series_rows"])
+        res["plot_series_rows"] = []  # now held by ``series``
+        elapsed = time.perf_counter() - t_start
+        total = len(paths) if exhausted else None
+        _emit(
+            progress,
+            event,
+            path=res["path"],
+            index=i,
+            done=done,
+            total=total,
+            elapsed_s=elapsed,
+            eta_s=elapsed / done * (total - done) if total is not None else None,
+        )
+
+    def next_index():
+        """Index of the next report needing work, ``None`` once ``source`` is exhausted.
+
+        Unchanged reports found in the manifest are reported on the way.
+        """
+        nonlocal exhausted
+        for html_path in source:
+            i = len(paths)
+            paths.append(Path(html_path))
+            results.append(None)
+            if manifest is not None:
+                try:
+                    digests[i] = file_sha256(paths[i])
+                except OSError:
+                    digests[i] = None  # let process_html report the missing file
+                cached = None if force or not digests[i] else manifest.lookup(paths[i], digests[i], settings)
+                if cached is not None:
+                    report(i, cached)
+                    continue
+            return i
+        exhausted = True
+        return None
+
+    def started(i):
+        _emit(progress, "report_started", path=str(paths[i]), index=i, done=done,
+              total=len(paths) if exhausted else None)
+
+    workers = max(1, int(workers or 1))
+    plot_workers = max(0, int(plot_workers or 0))
+    render_pool = None
+    rendering = {}  # report index -> (extraction result, render futures)
+    task_options = {}
+    if profile or cprofile_dir:
+        task_options.update(profile=True, cprofile_dir=str(cprofile_dir) if cprofile_dir else None)
+    svg_options = _svg_options(svg_threads, svg_timeout, svg_cache_dir)
+    if svg_options:
+        task_options["svg_options"] = svg_options
+    if plot_workers and generate_individual_plots and plot_selectors:
+        render_pool = ProcessPoolExecutor(max_workers=plot_workers, mp_context=multiprocessing.get_context("spawn"))
+        task_options["defer_plots"] = True
+    task = functools.partial(_process_report_task, **task_options) if task_options else _process_report_task
+
+    def finish_render(i):
+        res, futures = rendering.pop(i)
+        for fut in futures:
+            try:
+                rows = fut.result()
+            except Exception:  # noqa: BLE001 - the report fails, the batch goes on
+                res["error"] = traceback.format_exc()
+                continue
+            res["plot_rows"].extend(rows)
+            for row in rows:
+                res["artifacts"].append(Path(row["path"]))
+                _emit(progress, "artifact_written", path=res["path"], index=i, artifact=str(row["path"]))
+        report(i, res)
+
+    def collect_renders(block=False):
+        for i in [i for i, (_, futures) in rendering.items() if block or all(f.done() for f in futures)]:
+            finish_render(i)
+
+    def extracted(i, res):
+        jobs = res.pop("plot_jobs", None)
+        if render_pool is not None and jobs and not res["error"]:
+            rendering[i] = (res, [render_pool.submit(render_plot_job, job) for job in jobs])
+        else:
+            report(i, res)
+        collect_renders()
+
+    try:
+        _run_report_tasks(
+            paths, next_index, output_dir, options, workers, extracted, started, progress, cancel_event, task
         )
+        collect_renders(block=True)
+    finally:
+        if render_pool is not None:
+            render_pool.shutdown(wait=True, cancel_futures=True)
+        if manifest is not None:
+            if prune_stale:
+                manifest.prune_missing_sources()
+            manifest.save()
+
+    merged = {
+        "saved": [],
+        "skipped": [],
+        "failed": [],
+        "cancelled": [],
+        "stats_rows": [],
+        "plot_rows": [],
+        "plot_series": series,
+    }
+    if profile or cprofile_dir:
+        merged["profiles"] = [res["profile"] for res in results if res is not None and res.get("profile")]
+    for path, res in zip(paths, results):
+        if res is None:
+            merged["cancelled"].append(str(path))
+            continue
+        if res["error"]:
+            merged["failed"].append((res["path"], res["error"]))
+            continue
+        merged["skipped" if res.get("skipped") else "saved"].append(res["out_path"])
+        merged["stats_rows"].extend(res["stats_rows"])
+        merged["plot_rows"].extend(res["plot_rows"])
+    if merged["cancelled"]:
+        logger.warning("Batch cancelled: %d report(s) not processed", len(merged["cancelled"]))
+    _emit(progress, "batch_done", done=done, total=len(paths), elapsed_s=time.perf_counter() - t_start)
+    return merged
+
 
-    if plot_rows is not None and generate_individual_plots:
-        plot_rows.extend(generate_polar_plot_artifacts(out_path, section_frames, plot_selectors, source_label=out_path.stem))
+def _run_report_tasks(
+    paths, next_index, output_dir, options, workers, report, started, progress, cancel_event, task=_process_report_task
+):
+    """Run ``task`` (:func:`_process_report_task`) for ``paths[i]`` as ``next_index()`` hands them out.
+
+    ``next_index()`` returns ``None`` when there is nothing left.
+    ``started(i)`` and ``report(i, result)`` are called in the calling
+    process.  A new report is only started while ``cancel_event`` is not set,
+    so cancelling stops the batch at the next report boundary.
+    """
+    def cancelled():
+        return cancel_event is not None and cancel_event.is_set()
 
-    return out_path
+    if workers == 1:
+        while not cancelled():
+            i = next_index()
+            if i is None:
+                break
+            started(i)
+            task_progress = (lambda event, i=i: progress({**event, "index": i})) if progress else None
+            report(i, task(paths[i], output_dir, options, task_progress))
+        return
+
+    # "spawn" keeps workers independent of the parent's Tk/logging state.
+    ctx = multiprocessing.get_context("spawn")
+    events = relay = manager = None
+    if progress is not None:
+        # Worker events go through a manager queue; a thread relays them to ``progress``.
+        manager = ctx.Manager()
+        events = manager.Queue()
+
+        def forward():
+            while True:
+                event = events.get()
+                if event is None:
+                    break
+                progress(event)
+
+        relay = threading.Thread(target=forward, name="meos-progress-relay", daemon=True)
+        relay.start()
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+            running = {}
+            more = True
+            while more or running:
+                # Keep at most ``workers`` reports in flight so that cancel
+                # never has to undo already queued work.
+                while more and len(running) < workers and not cancelled():
+                    i = next_index()
+                    if i is None:
+                        more = False
+                        break
+                    started(i)
+                    task_progress = _QueueProgress(events, i) if events is not None else None
+                    running[pool.submit(task, paths[i], output_dir, options, task_progress)] = i
+                if not running:
+                    break  # nothing left, or cancelled with no report in flight
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    i = running.pop(fut)
+                    try:
+                        res = fut.result()
+                    except Exception:  # worker crashed (e.g. killed, unpicklable result)
+                        res = {
+                            "path": str(paths[i]),
+                            "out_path": None,
+                            "stats_rows": [],
+                            "plot_rows": [],
+                            "plot_series_rows": [],
+                            "artifacts": [],
+                            "error": traceback.format_exc(),
+                        }
+                    report(i, res)
+    finally:
+        if relay is not None:
+            events.put(None)
+            relay.join(timeout=5)
+            manager.shutdown()
+
+
+def write_batch_summaries(
+    output_dir: Path,
+    batch: dict,
+    stats_selectors=None,
+    plot_selectors=None,
+    generate_combined_plots=False,
+    max_points=DEFAULT_MAX_POINTS,
+    sky_grid_step=None,
+):
+    """Write the batch-level outputs (lock-state stats, combined plots, plot index).
+
+    ``max_points`` is the point budget per layer of the interactive combined plots.
+    With ``sky_grid_step`` (degrees) the polar series of all reports are also
+    aggregated into a :class:`sky_grid.SkyGrid`, saved as ``sky_grid.npz``
+    and drawn as one mean heatmap per metric (plus the unlock ratio); a grid
+    already aggregated by the caller can be passed as ``batch["sky_grid"]``.
+    """
+    output_dir = Path(output_dir)
+    written = []
+    if stats_selectors:
+        stats_path = output_dir / "lock_state_stats.xlsx"
+        if batch["stats_rows"]:
+            pd.DataFrame(batch["stats_rows"], columns=["Orbit Number", "Unlocks"]).to_excel(stats_path, index=False)
+        else:
+            pd.DataFrame([{"Orbit Number": "N/A", "Unlocks": 0}]).to_excel(stats_path, index=False)
+        logger.info("Saved statistics: %s", stats_path)
+        written.append(stats_path)
+
+    if plot_selectors:
+        plot_rows = batch["plot_rows"]
+        if generate_combined_plots:
+            plot_rows.extend(
+                generate_combined_polar_plot_artifacts(
+                    output_dir, batch["plot_series"], plot_selectors, max_points=max_points
+                )
+            )
+        if sky_grid_step and batch["plot_series"]:
+            plot_rows.extend(
+                write_sky_grid_artifacts(output_dir, batch["plot_series"], sky_grid_step, grid=batch.get("sky_grid"))
+            )
+        plot_index = output_dir / "polar_plots_index.xlsx"
+        if plot_rows:
+            pd.DataFrame(plot_rows).to_excel(plot_index, index=False)
+            logger.info("Saved polar plot index: %s", plot_index)
+            written.append(plot_index)
+        else:
+            logger.warning("Polar plots requested, but none were generated. Check detailed warnings in log for matching/metric diagnostics.")
+    return written
+
+
+def write_sky_grid_artifacts(output_dir: Path, plot_series, step=5.0, grid=None):
+    """Aggregate the polar series on a ``step``-degree sky grid; save it and its heatmaps.
+
+    ``plot_series`` is a :class:`series_accumulator.SeriesAccumulator` or a
+    list of series rows.  A ``grid`` already holding them is written as is.
+    """
+    output_dir = Path(output_dir)
+    if grid is None:
+        grid = SkyGrid.from_series(_as_accumulator(plot_series).series_map().values(), az_step=step)
+    grid_path = grid.save(output_dir / "sky_grid.npz")
+    logger.info("Saved sky grid: %s", grid_path)
+    # The unlock ratio is the same for every metric: draw it once, on SNR when available.
+    unlock_selector = next(
+        (s for s in ("snr", "input_level", "eb_no") if s in grid.layers and grid.layers[s]["lock_samples"].any()),
+        None,
+    )
+    rows = []
+    for selector in ("input_level", "eb_no", "snr"):
+        if selector not in grid.layers:
+            continue
+        metric_col = grid.metric_cols.get(selector, selector)
+        stats = [("mean", "sky_heatmap")]
+        if selector == unlock_selector:
+            stats.append(("unlock_ratio", "sky_unlock_ratio"))
+        for stat, kind in stats:
+            path = render_polar_heatmap(grid, selector, output_dir / f"combined_{metric_col}_{kind}.png", stat=stat)
+            if path is not None:
+                rows.append({"plot": metric_col, "kind": kind, "path": str(path), "source": "all files"})
+    return rows
+
+
+def load_cached_series(paths, recursive=True, accumulator=None):
+    """Append the ``*_polar_series.npz`` files found under ``paths`` to a :class:`SeriesAccumulator`."""
+    series = accumulator if accumulator is not None else SeriesAccumulator()
+    for path in iter_reports(paths, include=("*" + SERIES_SUFFIX,), recursive=recursive):
+        try:
+            series.extend(load_series(path))
+        except (OSError, ValueError, KeyError) as exc:
+            logger.warning("Skipping unreadable series cache %s: %s", path, exc)
+    return series
+
+
+def watch_reports(
+    paths,
+    output_dir: Path,
+    workers: int = 1,
+    stats_selectors=None,
+    plot_selectors=None,
+    generate_combined_plots=False,
+    max_points=DEFAULT_MAX_POINTS,
+    sky_grid_step=None,
+    parser="bs4",
+    time_columns="strings",
+    excel_engine="auto",
+    ticks_sheets=True,
+    formats=("xlsx",),
+    sections=None,
+    stats_only=False,
+    include=DEFAULT_INCLUDE,
+    exclude=(),
+    recursive=True,
+    poll_s=watch_service.DEFAULT_POLL_S,
+    settle_s=watch_service.DEFAULT_SETTLE_S,
+    queue_size=watch_service.DEFAULT_QUEUE_SIZE,
+    summary_interval_s=watch_service.DEFAULT_SUMMARY_INTERVAL_S,
+    series_spill_mb=None,
+    status_path=None,
+    stop_event=None,
+    abort_event=None,
+    svg_threads=DEFAULT_FETCH_THREADS,
+    svg_timeout=DEFAULT_TIMEOUT_S,
+    svg_cache_dir=None,
+):
+    """Watch ``paths`` and process every report dropped there until ``stop_event`` is set.
+
+    Each report is processed with :func:`process_html` in one of ``workers``
+    processes once it has finished being written (see
+    :class:`watch_service.FolderWatcher`), and recorded in the manifest of
+    ``output_dir`` as soon as it is done, so that a restarted service only
+    processes what arrived meanwhile (unchanged reports reuse their cached
+    outputs).  The batch summaries of every report seen (``lock_state_stats.xlsx``,
+    combined plots, sky grid, plot index; see :func:`write_batch_summaries`)
+    are rewritten when the queue runs empty, and at most every
+    ``summary_interval_s`` seconds while it is busy; the combined plots and
+    the sky grid only when the polar series changed.  The sky grid is kept
+    up to date report by report (:meth:`sky_grid.SkyGrid.merge`).  A report
+    written again replaces its previous rows, and its previous series are
+    taken out of the accumulator and the grid
+    (:meth:`series_accumulator.SeriesAccumulator.remove_source`,
+    :meth:`sky_grid.SkyGrid.subtract`).
+
+    ``stop_event`` drains (queued reports are still processed), ``abort_event``
+    also drops the queue; see :class:`watch_service.WatchService`.  The
+    service state is written to ``status_path`` (default
+    ``output_dir/watch_status.json``).  The other parameters are those of
+    :func:`process_many` and :func:`write_batch_summaries`.
+
+    Returns the final status (a dict, as in the status file).
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    options = _report_options(
+        stats_selectors, plot_selectors, True, parser, time_columns, excel_engine,
+        ticks_sheets, formats, sections, stats_only,
+    )
+    task_options = {"output_dir": output_dir, "options": options}
+    svg_options = _svg_options(svg_threads, svg_timeout, svg_cache_dir)
+    if svg_options:
+        task_options["svg_options"] = svg_options
+    manifest = RunManifest.load(output_dir)
+    settings = settings_key(options)
+    digests = {}
+    reports = {}  # manifest key -> {"stats_rows", "plot_rows", "sources"} of its last successful run
+    series = SeriesAccumulator(
+        spill_bytes=series_spill_mb * 2**20 if series_spill_mb else None,
+        spill_dir=output_dir if series_spill_mb else None,
+    )
+    grid = SkyGrid(az_step=sky_grid_step) if sky_grid_step and plot_selectors else None
+    combined = {"changed": False, "rows": []}  # combined plot rows of the last refresh
+
+    def series_grid(rows):
+        # Binned from the float32 values the accumulator keeps, so that
+        # subtracting it later removes exactly what was merged.
+        return SkyGrid.from_series(
+            ({**row, **{k: np.asarray(row[k], dtype=np.float32) for k in ("azimuth", "elevation", "metric")}}
+             for row in rows),
+            az_step=sky_grid_step,
+        )
+
+    def lookup(path):
+        try:
+            digests[path] = file_sha256(path)
+        except OSError:
+            return None  # let process_html report the missing file
+        return manifest.lookup(path, digests[path], settings)
+
+    def on_result(path, res):
+        digest = digests.pop(path, None)
+        if res["error"]:
+            return
+        if res.get("skipped"):
+            logger.info("Unchanged, reusing cached outputs: %s", path)
+        else:
+            logger.info("Salvato: %s", res["out_path"] or f"{path} (stats only)")
+            if digest:
+                manifest.record(path, digest, settings, res)
+                manifest.save()
+        key = RunManifest.key(path)
+        if res.get("skipped") and key in reports:
+            return  # touched, but same content and settings
+        old = reports.get(key)
+        rows = res["plot_series_rows"]
+        reports[key] = {
+            "stats_rows": res["stats_rows"],
+            "plot_rows": res["plot_rows"],
+            "sources": {row.get("source_label") for row in rows},
+        }
+        removed = []
+        for label in old["sources"] if old else ():
+            removed.extend(series.remove_source(label))
+        series.extend(rows)
+        if grid is not None:
+            if removed:
+                grid.subtract(series_grid(removed), remaining=series.series_map().values())
+            grid.merge(series_grid(rows))
+        combined["changed"] |= bool(rows or removed)
+
+    def refresh():
+        keys = sorted(reports)
+        batch = {
+            "stats_rows": [row for k in keys for row in reports[k]["stats_rows"]],
+            "plot_rows": [dict(row) for k in keys for row in reports[k]["plot_rows"]],
+            "plot_series": series,
+            "sky_grid": grid,
+        }
+        if not combined["changed"]:
+            # Same polar series: only the statistics and the plot index change.
+            batch["plot_rows"].extend(combined["rows"])
+        n_rows = len(batch["plot_rows"])
+        write_batch_summaries(
+            output_dir,
+            batch,
+            stats_selectors=stats_selectors,
+            plot_selectors=plot_selectors,
+            generate_combined_plots=generate_combined_plots and combined["changed"],
+            max_points=max_points,
+            sky_grid_step=sky_grid_step if combined["changed"] else None,
+        )
+        if combined["changed"]:
+            combined["rows"] = batch["plot_rows"][n_rows:]
+            combined["changed"] = False
+
+    watcher = watch_service.FolderWatcher(
+        paths,
+        include=include or DEFAULT_INCLUDE,
+        exclude=exclude,
+        recursive=recursive,
+        exclude_dirs=[output_dir],
+        settle_s=settle_s,
+    )
+    status = watch_service.WatchStatus(
+        status_path or output_dir / watch_service.STATUS_NAME,
+        roots=paths,
+        workers=workers,
+        queue_size=queue_size,
+    )
+    service = watch_service.WatchService(
+        watcher,
+        functools.partial(_process_report_task, **task_options),
+        on_result,
+        lookup=lookup,
+        refresh=refresh,
+        status=status,
+        workers=workers,
+        queue_size=queue_size,
+        poll_s=poll_s,
+        summary_interval_s=summary_interval_s,
+    )
+    try:
+        service.run(stop_event if stop_event is not None else threading.Event(), abort_event)
+    finally:
+        series.close()
+    return status.snapshot()
 
 
-def main_cli():
+def combine_plots_cli(argv):
+    """``combine-plots``: combined polar plots from the series caches alone, without any HTML."""
     parser = argparse.ArgumentParser(
-        description="Estrae i grafici da un report HTML e li salva in un Excel unico."
+        prog="Extract_all_charts.py combine-plots",
+        description="Genera i plot polari complessivi dai file *_polar_series.npz, senza rileggere i report HTML.",
     )
     parser.add_argument(
-        "path",
-        nargs="?",
-        default=Path("."),
+        "paths",
+        nargs="*",
+        default=[Path(".")],
         type=Path,
-        help="File HTML o directory contenente l'HTML (default: cartella corrente)",
+        help="File *_polar_series.npz e/o directory da esplorare (default: cartella corrente)",
     )
     parser.add_argument(
         "-o",
         "--output-dir",
         default=Path("."),
         type=Path,
-        help="Directory in cui salvare l'Excel (default: cartella corrente)",
+        help="Directory in cui salvare i plot complessivi (default: cartella corrente)",
+    )
+    parser.add_argument(
+        "--plots",
+        type=_comma_list,
+        default=["input_level", "eb_no", "snr"],
+        metavar="LIST",
+        help="Plot polari da generare, separati da virgola tra input_level, eb_no, snr (default: tutti)",
+    )
+    parser.add_argument(
+        "--plot-max-points",
+        type=int,
+        default=DEFAULT_MAX_POINTS,
+        metavar="N",
+        help=f"Punti massimi per livello nei plot interattivi (default: {DEFAULT_MAX_POINTS}; 0 = tutti i campioni)",
+    )
+    parser.add_argument(
+        "--sky-grid",
+        type=float,
+        default=None,
+        metavar="DEG",
+        help="Aggrega anche i campioni in celle az/el di DEG gradi (sky_grid.npz e heatmap polari)",
+    )
+    parser.add_argument(
+        "--no-recursive",
+        dest="recursive",
+        action="store_false",
+        help="Non esplorare le sottocartelle",
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--series-spill-mb",
+        type=float,
+        default=None,
+        metavar="MB",
+        help="Oltre questa dimensione le serie caricate vengono spostate su file mappati in memoria",
+    )
+    args = parser.parse_args(argv)
+
+    series = load_cached_series(
+        args.paths,
+        recursive=args.recursive,
+        accumulator=SeriesAccumulator(
+            spill_bytes=args.series_spill_mb * 2**20 if args.series_spill_mb else None,
+            spill_dir=args.output_dir if args.series_spill_mb else None,
+        ),
+    )
+    logging.info("Serie polari caricate: %d da %d report", len(series), len(series.sources))
+    if not series:
+        logging.error("Nessun file *%s trovato", SERIES_SUFFIX)
+        sys.exit(1)
+    rows = generate_combined_polar_plot_artifacts(
+        args.output_dir, series, args.plots, max_points=args.plot_max_points
+    )
+    if args.sky_grid:
+        rows.extend(write_sky_grid_artifacts(args.output_dir, series, args.sky_grid))
+    for row in rows:
+        logging.info("Saved: %s", row["path"])
+    if not rows:
+        logging.warning("Nessun plot generato per %s", ", ".join(args.plots))
 
-    html_path = args.path
-    if html_path.is_dir():
-        html_files = sorted(html_path.glob("*.html"))
-        if html_files:
-            html_path = html_files[0]
+
+def _add_extraction_args(parser):
+    """Options shared by the main command and ``watch``: report selection, extraction and outputs."""
+    parser.add_argument(
+        "--parser",
+        choices=("bs4", "stream"),
+        default="bs4",
+        help="Backend di lettura dell'HTML: bs4 (html.parser) o stream (lxml, minore memoria)",
+    )
+    parser.add_argument(
+        "--time-columns",
+        choices=TIME_COLUMN_MODES,
+        default="strings",
+        help="Colonne temporali nei fogli: strings (HH:MM:SS + ISO), datetime (time_utc) o none",
+    )
+    parser.add_argument(
+        "--excel-engine",
+        choices=EXCEL_ENGINES,
+        default="auto",
+        help="Motore di scrittura Excel (auto: xlsxwriter se installato, altrimenti openpyxl)",
+    )
+    parser.add_argument(
+        "--no-ticks-sheets",
+        dest="ticks_sheets",
+        action="store_false",
+        help="Non scrivere i fogli <sezione>_ticks",
+    )
+    parser.add_argument(
+        "--format",
+        dest="formats",
+        type=parse_formats,
+        default=("xlsx",),
+        help="Output separati da virgola tra xlsx, parquet, feather (es. xlsx,parquet)",
+    )
+    parser.add_argument(
+        "--include",
+        action="append",
+        metavar="GLOB",
+        help="Pattern dei report da includere (ripetibile, default: *.html); "
+        "con '/' si applica al percorso relativo, altrimenti al nome del file",
+    )
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        default=[],
+        metavar="GLOB",
+        help="Pattern di file o cartelle da escludere (ripetibile)",
+    )
+    parser.add_argument(
+        "--no-recursive",
+        dest="recursive",
+        action="store_false",
+        help="Non esplorare le sottocartelle",
+    )
+    parser.add_argument(
+        "--stats",
+        type=_comma_list,
+        default=[],
+        metavar="LIST",
+        help="Statistiche da calcolare (es. demodulator_lock_state) -> lock_state_stats.xlsx",
+    )
+    parser.add_argument(
+        "--plots",
+        type=_comma_list,
+        default=[],
+        metavar="LIST",
+        help="Plot polari da generare, separati da virgola tra input_level, eb_no, snr",
+    )
+    parser.add_argument(
+        "--combined-plots",
+        action="store_true",
+        help="Genera anche un set di plot polari complessivo per tutti i report",
+    )
+    parser.add_argument(
+        "--plot-max-points",
+        type=int,
+        default=DEFAULT_MAX_POINTS,
+        metavar="N",
+        help=f"Punti massimi per livello nei plot interattivi complessivi (default: {DEFAULT_MAX_POINTS}; "
+        "0 = tutti i campioni)",
+    )
+    parser.add_argument(
+        "--series-spill-mb",
+        type=float,
+        default=None,
+        metavar="MB",
+        help="Oltre questa dimensione le serie polari accumulate per i plot complessivi "
+        "vengono spostate su file mappati in memoria nella cartella di output",
+    )
+    parser.add_argument(
+        "--sky-grid",
+        type=float,
+        default=None,
+        metavar="DEG",
+        help="Aggrega i campioni dei plot di tutti i report in celle az/el di DEG gradi: "
+        "sky_grid.npz e heatmap polari (media e unlock ratio)",
+    )
+    parser.add_argument(
+        "--sections",
+        type=_comma_list,
+        default=None,
+        metavar="LIST",
+        help="Estrae solo queste sezioni (alias come snr/antenna, chiavi, sottostringhe o glob), "
+        "più quelle richieste da --stats/--plots",
+    )
+    parser.add_argument(
+        "--stats-only",
+        action="store_true",
+        help="Non scrive Excel/Parquet: estrae solo le sezioni necessarie a --stats/--plots",
+    )
+    parser.add_argument(
+        "--svg-threads",
+        type=int,
+        default=DEFAULT_FETCH_THREADS,
+        metavar="N",
+        help=f"Thread che caricano in parallelo gli SVG <object> (URL, file) di un report (default: {DEFAULT_FETCH_THREADS})",
+    )
+    parser.add_argument(
+        "--svg-timeout",
+        type=float,
+        default=DEFAULT_TIMEOUT_S,
+        metavar="S",
+        help=f"Timeout in secondi per ogni SVG <object> remoto (default: {DEFAULT_TIMEOUT_S:g})",
+    )
+    parser.add_argument(
+        "--svg-cache-dir",
+        type=Path,
+        default=None,
+        metavar="DIR",
+        help="Salva in DIR gli SVG <object> remoti scaricati e li riusa nelle esecuzioni successive",
+    )
+
+
+def watch_cli(argv):
+    """``watch``: servizio che elabora i report man mano che arrivano nelle cartelle sorvegliate."""
+    parser = argparse.ArgumentParser(
+        prog="Extract_all_charts.py watch",
+        description="Sorveglia una o più cartelle ed elabora ogni nuovo report HTML appena è stato scritto "
+        "completamente, aggiornando le statistiche e i plot complessivi. Ctrl+C (o SIGTERM) termina dopo aver "
+        "completato i report in coda; un secondo Ctrl+C scarta la coda e attende solo quelli in corso.",
+    )
+    parser.add_argument("paths", nargs="+", type=Path, help="Cartelle da sorvegliare")
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        default=Path("."),
+        type=Path,
+        help="Directory in cui salvare Excel, statistiche e plot (default: cartella corrente)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        default=1,
+        type=int,
+        help="Numero di processi che elaborano i report (default: 1)",
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=watch_service.DEFAULT_QUEUE_SIZE,
+        metavar="N",
+        help=f"Report al massimo in coda; gli altri vengono presi ai controlli successivi "
+        f"(default: {watch_service.DEFAULT_QUEUE_SIZE})",
+    )
+    parser.add_argument(
+        "--poll",
+        type=float,
+        default=watch_service.DEFAULT_POLL_S,
+        metavar="S",
+        help=f"Intervallo in secondi tra due controlli delle cartelle (default: {watch_service.DEFAULT_POLL_S:g})",
+    )
+    parser.add_argument(
+        "--settle",
+        type=float,
+        default=watch_service.DEFAULT_SETTLE_S,
+        metavar="S",
+        help="Secondi in cui dimensione e data di modifica di un report devono restare invariate prima di "
+        f"elaborarlo, cioè quando ha finito di essere scritto (default: {watch_service.DEFAULT_SETTLE_S:g})",
+    )
+    parser.add_argument(
+        "--summary-interval",
+        type=float,
+        default=watch_service.DEFAULT_SUMMARY_INTERVAL_S,
+        metavar="S",
+        help="Finché la coda non è vuota aggiorna statistiche e plot complessivi al massimo ogni S secondi; "
+        f"altrimenti appena la coda si svuota (default: {watch_service.DEFAULT_SUMMARY_INTERVAL_S:g})",
+    )
+    parser.add_argument(
+        "--status-file",
+        type=Path,
+        default=None,
+        metavar="FILE",
+        help=f"File JSON con lo stato del servizio: coda, report in corso, conteggi, report/ora "
+        f"(default: <output>/{watch_service.STATUS_NAME})",
+    )
+    _add_extraction_args(parser)
+    args = parser.parse_args(argv)
+    missing = [str(p) for p in args.paths if not p.is_dir()]
+    if missing:
+        parser.error(f"cartelle inesistenti: {', '.join(missing)}")
+
+    stop, abort = threading.Event(), threading.Event()
+
+    def on_signal(signum, frame):
+        if stop.is_set():
+            abort.set()
+            logging.warning("Interruzione: la coda viene scartata, attendo i report in corso")
         else:
-            html_path = html_path / DEFAULT_HTML
+            stop.set()
+            logging.info("Arresto: completo i report in coda (ripetere per scartarli)")
+
+    signal.signal(signal.SIGINT, on_signal)
+    signal.signal(signal.SIGTERM, on_signal)
+    logging.info("In attesa di report in %s (output: %s)", ", ".join(map(str, args.paths)), args.output_dir)
+    status = watch_reports(
+        args.paths,
+        args.output_dir,
+        workers=args.jobs,
+        stats_selectors=args.stats,
+        plot_selectors=args.plots,
+        generate_combined_plots=args.combined_plots,
+        max_points=args.plot_max_points,
+        sky_grid_step=args.sky_grid,
+        parser=args.parser,
+        time_columns=args.time_columns,
+        excel_engine=args.excel_engine,
+        ticks_sheets=args.ticks_sheets,
+        formats=args.formats,
+        sections=args.sections,
+        stats_only=args.stats_only,
+        include=args.include or DEFAULT_INCLUDE,
+        exclude=args.exclude,
+        recursive=args.recursive,
+        poll_s=args.poll,
+        settle_s=args.settle,
+        queue_size=args.queue_size,
+        summary_interval_s=args.summary_interval,
+        series_spill_mb=args.series_spill_mb,
+        status_path=args.status_file,
+        stop_event=stop,
+        abort_event=abort,
+        svg_threads=args.svg_threads,
+        svg_timeout=args.svg_timeout,
+        svg_cache_dir=args.svg_cache_dir,
+    )
+    logging.info(
+        "Report elaborati: %d, invariati: %d, con errori: %d, scartati: %d",
+        status["processed"],
+        status["skipped"],
+        status["failed"],
+        status["cancelled"],
+    )
+
+
+def _comma_list(text):
+    return [item.strip() for item in text.split(",") if item.strip()]
 
-    out_path = process_html(html_path, args.output_dir)
-    logging.info("Salvato: %s", out_path)
+
+def main_cli(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv and argv[0] == "combine-plots":
+        return combine_plots_cli(argv[1:])
+    if argv and argv[0] == "watch":
+        return watch_cli(argv[1:])
+    parser = argparse.ArgumentParser(
+        description="Estrae i grafici da un report HTML e li salva in un Excel unico. "
+        "Con 'combine-plots' genera i plot complessivi dalle serie già estratte; "
+        "con 'watch' sorveglia le cartelle ed elabora i report man mano che arrivano."
+    )
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        default=[Path(".")],
+        type=Path,
+        help="File HTML e/o directory da esplorare ricorsivamente (default: cartella corrente)",
+    )
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        default=Path("."),
+        type=Path,
+        help="Directory in cui salvare l'Excel (default: cartella corrente)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        default=1,
+        type=int,
+        help="Numero di processi paralleli per elaborare più report (default: 1)",
+    )
+    parser.add_argument(
+        "--plot-jobs",
+        default=0,
+        type=int,
+        help="Processi dedicati al disegno dei plot polari, in parallelo all'estrazione "
+        "(default: 0, i plot sono disegnati da chi estrae il report)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rielabora tutti i report anche se invariati rispetto al manifest dell'output",
+    )
+    parser.add_argument(
+        "--prune-stale",
+        action="store_true",
+        help="Elimina gli output non più prodotti e quelli di report non più esistenti",
+    )
+    parser.add_argument(
+        "--since",
+        type=parse_time_bound,
+        help="Solo report modificati da questa data (ISO, es. 2024-05-01) o da un intervallo (es. 7d, 12h)",
+    )
+    parser.add_argument(
+        "--until",
+        type=parse_time_bound,
+        help="Solo report modificati prima di questa data (ISO) o intervallo",
+    )
+    parser.add_argument(
+        "--scan-threads",
+        type=int,
+        default=DEFAULT_SCAN_THREADS,
+        help=f"Thread per l'esplorazione delle cartelle (default: {DEFAULT_SCAN_THREADS})",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Misura i tempi delle fasi di ogni report e stampa una tabella per report e una complessiva",
+    )
+    parser.add_argument(
+        "--profile-json",
+        type=Path,
+        default=None,
+        metavar="FILE",
+        help="Salva i tempi per fase (per report e complessivi) in FILE JSON (implica --profile)",
+    )
+    parser.add_argument(
+        "--profile-cprofile",
+        type=Path,
+        default=None,
+        metavar="DIR",
+        help="Esegue anche cProfile su ogni report e salva <report>.pstats in DIR (implica --profile)",
+    )
+    _add_extraction_args(parser)
+    args = parser.parse_args(argv)
+    profile = args.profile or args.profile_json is not None or args.profile_cprofile is not None
+
+    reports = iter_reports(
+        args.paths,
+        include=args.include or DEFAULT_INCLUDE,
+        exclude=args.exclude,
+        recursive=args.recursive,
+        modified_after=args.since,
+        modified_before=args.until,
+        exclude_dirs=[args.output_dir],
+        threads=args.scan_threads,
+    )
+    # A single directory without any report keeps the historical fallback to
+    # ``report.html`` (looked up next to the script by process_html).
+    if len(args.paths) == 1 and args.paths[0].is_dir():
+        first = next(reports, None)
+        reports = itertools.chain([first], reports) if first is not None else [args.paths[0] / DEFAULT_HTML]
+
+    batch = process_many(
+        reports,
+        args.output_dir,
+        workers=args.jobs,
+        plot_workers=args.plot_jobs,
+        parser=args.parser,
+        time_columns=args.time_columns,
+        excel_engine=args.excel_engine,
+        ticks_sheets=args.ticks_sheets,
+        formats=args.formats,
+        force=args.force,
+        prune_stale=args.prune_stale,
+        stats_selectors=args.stats,
+        plot_selectors=args.plots,
+        sections=args.sections,
+        stats_only=args.stats_only,
+        series_spill_mb=args.series_spill_mb,
+        profile=profile,
+        cprofile_dir=args.profile_cprofile,
+        svg_threads=args.svg_threads,
+        svg_timeout=args.svg_timeout,
+        svg_cache_dir=args.svg_cache_dir,
+    )
+    write_batch_summaries(
+        args.output_dir,
+        batch,
+        stats_selectors=args.stats,
+        plot_selectors=args.plots,
+        generate_combined_plots=args.combined_plots,
+        max_points=args.plot_max_points,
+        sky_grid_step=args.sky_grid,
+    )
+    if profile:
+        profiles = batch.get("profiles", [])
+        for prof in profiles:
+            print(profiling.format_table(prof), end="\n\n")
+        if len(profiles) > 1:
+            print(profiling.format_table(profiling.aggregate(profiles)))
+        if args.profile_json is not None:
+            logging.info("Tempi per fase salvati in %s", profiling.write_json(args.profile_json, profiles))
+    logging.info(
+        "Report elaborati: %d, invariati: %d, con errori: %d",
+        len(batch["saved"]),
+        len(batch["skipped"]),
+        len(batch["failed"]),
+    )
+    if batch["failed"]:
+        logging.error("Report non elaborati: %d", len(batch["failed"]))
+        sys.exit(1)
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main_cli()
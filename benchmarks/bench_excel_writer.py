@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""Compare the Excel writer engines of ``process_html``: wall time, file size and parity.
+
+The report is extracted once; the resulting sheets are then written with each
+engine (and with/without the ``_ticks`` sheets) ``--repeat`` times through
+:class:`xlsx_writer.WorkbookWriter`.  Full ``process_html`` runs are timed as
+well.  The workbooks written by the two engines must read back identically
+with ``pandas.read_excel``; otherwise the script exits with status 1.
+
+A synthetic report whose section titles are longer than Excel's 31-character
+sheet names (so that ``<key>`` and ``<key>_ticks`` would collapse into one
+name) is also written with both engines: both must succeed with the same,
+distinct sheet names.
+
+Usage::
+
+    python benchmarks/bench_excel_writer.py [report.html] [--repeat N]
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import pandas as pd  # noqa: E402
+
+import synthetic_report  # noqa: E402
+from Extract_all_charts import process_html  # noqa: E402
+from xlsx_writer import WorkbookWriter, resolve_engine  # noqa: E402
+
+DEFAULT_REPORT = ROOT / "web_report_AWS-PFM_8297_meos8_lan.html"
+ENGINES = ("openpyxl", "xlsxwriter")
+LONG_TITLES = {"Input Level": "Input Level of the Demodulator Channel A", "Eb/N0": "Eb/N0 of the Demodulator Channel A"}
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples)
+
+
+def write_sheets(path, sheets, engine):
+    with WorkbookWriter(path, engine=engine) as wr:
+        for name, df in sheets.items():
+            wr.write(name, df)
+
+
+def compare_workbooks(a: Path, b: Path) -> list[str]:
+    sheets_a = pd.read_excel(a, sheet_name=None)
+    sheets_b = pd.read_excel(b, sheet_name=None)
+    problems = []
+    if list(sheets_a) != list(sheets_b):
+        problems.append(f"sheet lists differ: {sorted(set(sheets_a) ^ set(sheets_b))}")
+    for name in sheets_a:
+        if name not in sheets_b:
+            continue
+        try:
+            pd.testing.assert_frame_equal(sheets_a[name], sheets_b[name])
+        except AssertionError as exc:
+            problems.append(f"{name}: {str(exc).splitlines()[0]}")
+    return problems
+
+
+def long_title_problems(tmp: Path) -> list[str]:
+    """Write a report with over-long section titles with both engines."""
+    html = synthetic_report.generate_report(sections=4, points=200)
+    for short, long in LONG_TITLES.items():
+        html = html.replace(f". {short}</h3>", f". {long}</h3>")
+    report = tmp / "long_titles.html"
+    report.write_text(html, encoding="utf-8")
+    outputs = {}
+    for engine in ENGINES:
+        try:
+            outputs[engine] = process_html(report, tmp / f"long_{engine}", excel_engine=engine)
+        except Exception as exc:  # noqa: BLE001 - reported as a failed check
+            return [f"long titles, {engine}: {type(exc).__name__}: {exc}"]
+    names = list(pd.read_excel(outputs["openpyxl"], sheet_name=None))
+    problems = compare_workbooks(outputs["openpyxl"], outputs["xlsxwriter"])
+    renamed = [n for n in names if n.endswith("~2")]  # the _ticks sheets of the long sections
+    if len({n.casefold() for n in names}) != len(names) or len(renamed) != len(LONG_TITLES):
+        problems.append(f"unexpected sheet names {names}")
+    return [f"long titles: {p}" for p in problems]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("report", nargs="?", type=Path, default=DEFAULT_REPORT)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    if resolve_engine("xlsxwriter") != "xlsxwriter":
+        sys.exit("xlsxwriter is not installed")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        reference = process_html(args.report, tmp / "reference", excel_engine="openpyxl")
+        sheets = pd.read_excel(reference, sheet_name=None)
+        no_ticks = {k: v for k, v in sheets.items() if not k.endswith(("_ticks", "_tick"))}
+        rows = sum(len(df) for df in sheets.values())
+
+        print(f"report: {args.report.name}, {len(sheets)} sheets, {rows} rows")
+        print(f"{'engine':<12}{'ticks':>7}{'write ms':>11}{'size KiB':>10}{'process_html ms':>17}")
+        outputs = {}
+        for engine in ENGINES:
+            for ticks, data in ((True, sheets), (False, no_ticks)):
+                path = tmp / f"{engine}_{ticks}.xlsx"
+                t_write = timed(lambda: write_sheets(path, data, engine), args.repeat)
+                t_full = timed(
+                    lambda: process_html(args.report, tmp / engine, excel_engine=engine, ticks_sheets=ticks),
+                    args.repeat,
+                )
+                outputs[engine, ticks] = path
+                print(
+                    f"{engine:<12}{'yes' if ticks else 'no':>7}{t_write * 1e3:>11.1f}"
+                    f"{path.stat().st_size / 1024:>10.0f}{t_full * 1e3:>17.1f}"
+                )
+
+        problems = compare_workbooks(outputs["openpyxl", True], outputs["xlsxwriter", True])
+        problems += long_title_problems(tmp)
+    if problems:
+        print("PARITY FAILED:")
+        for line in problems:
+            print("  " + line)
+        sys.exit(1)
+    print("parity: identical workbooks (long section titles included)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""Time curve extraction per section (``extract_curve_for_header`` / ``extract_curves_for_header``).
+
+The report is parsed and indexed once; each chart section is then extracted
+``--repeat`` times and the median is reported.  ``--section`` restricts the
+run to sections whose key contains the given text (e.g. ``antenna``).
+
+With ``--baseline REV`` the same measurement is also run, in a subprocess,
+against the code of git revision ``REV`` (exported with ``git archive``),
+and both are printed side by side with the speedup.  The extracted curves
+(row counts and value sums) must match; otherwise the script exits with
+status 1.  For example ``--baseline 88e45c1^`` compares with the per-point
+scoring that preceded the NumPy candidate pipeline.
+
+Usage::
+
+    python benchmarks/bench_extraction.py [report.html] [--section antenna] [--repeat N] [--baseline REV]
+"""
+from __future__ import annotations
+
+import argparse
+import importlib
+import io
+import json
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_REPORT = ROOT / "web_report_AWS-PFM_8297_meos8_lan.html"
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples)
+
+
+def _digest(df):
+    """Row count and rounded value sum of an extracted curve."""
+    if df is None or df.empty:
+        return [0, 0.0]
+    return [len(df), round(float(df[["x_px", "y_px"]].to_numpy(dtype=float).sum()), 3)]
+
+
+def measure(root, report, section, parser, repeat):
+    """Per-section timings (and output digests) with the code found in ``root``."""
+    sys.path.insert(0, str(root))
+    charts = importlib.import_module("Extract_all_charts")
+
+    parsed = charts.read_report(report, parser=parser)
+    sections = [
+        s for s in parsed["sections"]
+        if s["key"] and s["has_chart"] and s["nodes"] and section in s["key"]
+    ]
+    results = []
+    for s in sections:
+        df, _ = charts.extract_curve_for_header(s["header"], s["nodes"])
+        multi = charts.extract_curves_for_header(s["header"], s["nodes"])
+        results.append({
+            "key": s["key"],
+            "single": timed(lambda: charts.extract_curve_for_header(s["header"], s["nodes"]), repeat),
+            "multi": timed(lambda: charts.extract_curves_for_header(s["header"], s["nodes"]), repeat),
+            "digest": [_digest(df), [_digest(c[1]) for c in multi or []]],
+        })
+    return results
+
+
+def run_baseline(rev, args):
+    """Run :func:`measure` on the tree of git revision ``rev`` in a subprocess."""
+    archive = subprocess.run(["git", "-C", str(ROOT), "archive", rev], check=True, capture_output=True).stdout
+    with tempfile.TemporaryDirectory() as tmp:
+        with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+            tar.extractall(tmp)
+        cmd = [
+            sys.executable, __file__, str(args.report), "--section", args.section, "--parser", args.parser,
+            "--repeat", str(args.repeat), "--root", tmp, "--json",
+        ]
+        proc = subprocess.run(cmd, check=True, capture_output=True, text=True)
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("report", nargs="?", type=Path, default=DEFAULT_REPORT)
+    parser.add_argument("--section", default="", help="only sections whose key contains this text")
+    parser.add_argument("--parser", choices=("bs4", "stream"), default="bs4")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--baseline", metavar="REV", help="also time the code of this git revision")
+    parser.add_argument("--root", type=Path, default=ROOT, help=argparse.SUPPRESS)
+    parser.add_argument("--json", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    current = measure(args.root, args.report, args.section, args.parser, args.repeat)
+    if args.json:
+        print(json.dumps(current))
+        return
+
+    if not args.baseline:
+        print(f"{'section':<32}{'single ms':>12}{'multi ms':>12}")
+        for r in current:
+            print(f"{r['key']:<32}{r['single'] * 1e3:>12.2f}{r['multi'] * 1e3:>12.2f}")
+        total_single = sum(r["single"] for r in current)
+        total_multi = sum(r["multi"] for r in current)
+        print(f"{'total':<32}{total_single * 1e3:>12.2f}{total_multi * 1e3:>12.2f}")
+        return
+
+    baseline = {r["key"]: r for r in run_baseline(args.baseline, args)}
+    print(f"baseline: {args.baseline}")
+    print(f"{'section':<32}{'single ms':>16}{'multi ms':>16}{'speedup':>9}")
+    mismatches = []
+    totals = {"old": 0.0, "new": 0.0}
+    for r in current:
+        old = baseline.get(r["key"])
+        if old is None:
+            mismatches.append(f"{r['key']}: not found in the baseline")
+            continue
+        if old["digest"] != r["digest"]:
+            mismatches.append(f"{r['key']}: extracted curves differ")
+        totals["old"] += old["single"] + old["multi"]
+        totals["new"] += r["single"] + r["multi"]
+        speedup = (old["single"] + old["multi"]) / max(r["single"] + r["multi"], 1e-12)
+        print(
+            f"{r['key']:<32}{old['single'] * 1e3:>7.2f} → {r['single'] * 1e3:>6.2f}"
+            f"{old['multi'] * 1e3:>7.2f} → {r['multi'] * 1e3:>6.2f}{speedup:>8.2f}x"
+        )
+    print(f"{'total (single + multi)':<32}{totals['old'] * 1e3:>14.2f} ms → {totals['new'] * 1e3:.2f} ms")
+    if mismatches:
+        print("PARITY FAILED:")
+        for line in mismatches:
+            print("  " + line)
+        sys.exit(1)
+    print("parity: identical curves")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Compare the ``bs4`` and ``stream`` report readers: parity, wall time and peak RSS.
+
+Each backend runs ``process_html`` in a fresh subprocess so that peak RSS
+(``ru_maxrss``) reflects that backend alone.  The workbooks written by the
+two runs are then compared sheet by sheet.  The section index (titles,
+``has_chart``, node counts) of both readers is also compared on small
+documents covering the sibling-region edge cases (a bare ``<svg>`` next to
+the header, charts nested in siblings or in the header itself).  Any
+difference is reported and makes the script exit with status 1.
+
+Usage::
+
+    python benchmarks/bench_parser.py [report.html] [--repeat N]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_REPORT = ROOT / "web_report_AWS-PFM_8297_meos8_lan.html"
+
+SVG = "<svg><path d='M0 0 L1 1'/></svg>"
+EDGE_CASES = {
+    "bare sibling svg": f"<div><h3>A</h3>{SVG}<h3>B</h3><p>text</p></div>",
+    "svg in sibling": f"<div><h3>A</h3><div><div>{SVG}</div></div><h3>B</h3></div>",
+    "object in sibling": "<div><h3>A</h3><p><object type='image/svg+xml' data='x.svg'></object></p></div>",
+    "svg in header": f"<div><h3>A {SVG}</h3><h3>B</h3><div>{SVG}</div></div>",
+    "svg after parent": f"<div><div><h2>A</h2></div>{SVG}<h2>B</h2></div>",
+}
+
+CHILD = r"""
+import json, sys, time, resource, logging
+sys.path.insert(0, {root!r})
+logging.disable(logging.WARNING)
+from pathlib import Path
+import Extract_all_charts as E
+html, out_dir, backend, repeat = Path(sys.argv[1]), Path(sys.argv[2]), sys.argv[3], int(sys.argv[4])
+base_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+read, full = [], []
+for _ in range(repeat):
+    t0 = time.perf_counter()
+    E.read_report(html, parser=backend)
+    read.append(time.perf_counter() - t0)
+    t0 = time.perf_counter()
+    out = E.process_html(html, out_dir, parser=backend)
+    full.append(time.perf_counter() - t0)
+rss_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{"read": min(read), "full": min(full), "rss_kib": rss_kib, "base_kib": base_kib, "out": str(out)}}))
+"""
+
+
+def run_backend(report: Path, out_dir: Path, backend: str, repeat: int) -> dict:
+    code = CHILD.format(root=str(ROOT))
+    proc = subprocess.run(
+        [sys.executable, "-c", code, str(report), str(out_dir), backend, str(repeat)],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def compare_workbooks(a: Path, b: Path) -> list[str]:
+    import pandas as pd
+
+    sheets_a = pd.read_excel(a, sheet_name=None)
+    sheets_b = pd.read_excel(b, sheet_name=None)
+    problems = []
+    if list(sheets_a) != list(sheets_b):
+        problems.append(f"sheet lists differ: {sorted(set(sheets_a) ^ set(sheets_b))}")
+    for name in sheets_a:
+        if name not in sheets_b:
+            continue
+        try:
+            pd.testing.assert_frame_equal(sheets_a[name], sheets_b[name])
+        except AssertionError as exc:
+            problems.append(f"{name}: {str(exc).splitlines()[0]}")
+    return problems
+
+
+def section_problems(tmp: Path) -> list[str]:
+    """Compare the section index of both readers on :data:`EDGE_CASES`."""
+    sys.path.insert(0, str(ROOT))
+    from Extract_all_charts import read_report
+
+    problems = []
+    for name, body in EDGE_CASES.items():
+        path = tmp / "edge.html"
+        path.write_text(f"<html><head><title>edge</title></head><body>{body}</body></html>", encoding="utf-8")
+        index = {
+            backend: [(s["title"], s["has_chart"], len(s["nodes"])) for s in read_report(path, parser=backend)["sections"]]
+            for backend in ("bs4", "stream")
+        }
+        if index["bs4"] != index["stream"]:
+            problems.append(f"sections, {name}: bs4 {index['bs4']} != stream {index['stream']}")
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("report", nargs="?", type=Path, default=DEFAULT_REPORT)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+        for backend in ("bs4", "stream"):
+            out_dir = Path(tmp) / backend
+            results[backend] = run_backend(args.report, out_dir, backend, args.repeat)
+        problems = compare_workbooks(Path(results["bs4"]["out"]), Path(results["stream"]["out"]))
+        problems += section_problems(Path(tmp))
+
+    print(f"report: {args.report.name}")
+    print(f"{'backend':<10}{'read ms':>10}{'process_html ms':>18}{'peak RSS MiB':>15}{'over imports':>15}")
+    for backend, res in results.items():
+        print(
+            f"{backend:<10}{res['read'] * 1e3:>10.1f}{res['full'] * 1e3:>18.1f}"
+            f"{res['rss_kib'] / 1024:>15.1f}{(res['rss_kib'] - res['base_kib']) / 1024:>15.1f}"
+        )
+    if problems:
+        print("PARITY FAILED:")
+        for line in problems:
+            print("  " + line)
+        sys.exit(1)
+    print(f"parity: identical workbooks and section index ({len(EDGE_CASES)} edge cases)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""Micro-benchmark for ``parse_path_subpaths`` + transform on large synthetic ``d`` strings.
+
+The legacy token loop (list of mixed str/float walked by index, one
+``apply_tr`` call per point) is kept here as the reference.  Before timing,
+both implementations are run on randomized paths mixing every supported
+command, odd argument counts and unsupported letters, and their outputs must
+match exactly.
+
+Usage::
+
+    python benchmarks/bench_path_parser.py [--points 5000] [--repeat 20]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+
+from Extract_all_charts import apply_tr, apply_tr_array, parse_path_subpaths  # noqa: E402
+
+
+def legacy_parse_path_subpaths(d_attr):
+    tokens = re.findall(r"([MmLlHhVv])|([-+]?\d*\.?\d+(?:e[-+]?\d+)?)", d_attr or "")
+    flat = [a if a else float(b) for a, b in tokens]
+    subpaths, current = [], []
+    x = y = 0.0
+    cmd = None
+    i = 0
+
+    def flush():
+        nonlocal current
+        if len(current) >= 2:
+            subpaths.append(current)
+        current = []
+
+    while i < len(flat):
+        t = flat[i]
+        if isinstance(t, str):
+            cmd = t
+            if cmd in ("M", "m"):
+                flush()
+            i += 1
+            continue
+        pair = i + 1 < len(flat) and not isinstance(flat[i + 1], str)
+        if cmd in ("M", "m", "L", "l"):
+            if not pair:
+                i += 1
+                continue
+            if cmd in ("M", "L"):
+                x, y = flat[i], flat[i + 1]
+            else:
+                x += flat[i]
+                y += flat[i + 1]
+            if cmd in ("M", "m"):
+                current = [(x, y)]
+            else:
+                current.append((x, y))
+            i += 2
+        elif cmd == "H":
+            x = flat[i]; current.append((x, y)); i += 1
+        elif cmd == "h":
+            x += flat[i]; current.append((x, y)); i += 1
+        elif cmd == "V":
+            y = flat[i]; current.append((x, y)); i += 1
+        elif cmd == "v":
+            y += flat[i]; current.append((x, y)); i += 1
+        else:
+            i += 1
+    flush()
+    return subpaths
+
+
+TR = (1.25, -0.8, 54.0, 380.0)
+
+
+def legacy(d):
+    return [[apply_tr(x, y, *TR) for x, y in sp] for sp in legacy_parse_path_subpaths(d)]
+
+
+def vectorized(d):
+    return [apply_tr_array(sp, *TR) for sp in parse_path_subpaths(d)]
+
+
+def gnuplot_like(n_points, rng):
+    """Absolute polyline as emitted by gnuplot: ``M x,y L x,y x,y ...``."""
+    xs = np.linspace(60.0, 1150.0, n_points)
+    ys = 200.0 + 80.0 * np.sin(xs / 90.0) + rng.normal(0, 2, n_points)
+    body = " ".join(f"{x:.2f},{y:.2f}" for x, y in zip(xs[1:], ys[1:]))
+    return f"M{xs[0]:.2f},{ys[0]:.2f} L{body}"
+
+
+def relative_mix(n_points, rng):
+    """Relative l/h/v steps, several subpaths."""
+    parts = []
+    for _ in range(max(1, n_points // 500)):
+        parts.append(f"M{rng.uniform(0, 100):.3f},{rng.uniform(0, 100):.3f}")
+        steps = []
+        for _ in range(500):
+            kind = rng.choice(["l", "h", "v"])
+            if kind == "l":
+                steps.append(f"l{rng.uniform(-3, 3):.3f},{rng.uniform(-3, 3):.3f}")
+            else:
+                steps.append(f"{kind}{rng.uniform(-3, 3):.3f}")
+        parts.append(" ".join(steps))
+    return " ".join(parts)
+
+
+def fuzz_case(rng):
+    letters = list("MmLlHhVv") + ["Z", "z", "C", ","]
+    out = []
+    for _ in range(rng.randint(1, 25)):
+        out.append(rng.choice(letters))
+        # Mix short runs (scalar path) with long ones (vectorized path).
+        n_args = rng.randint(0, 5) if rng.random() < 0.7 else rng.randint(15, 40)
+        for _ in range(n_args):
+            out.append(f"{rng.uniform(-50, 50):.{rng.randint(0, 3)}f}")
+            if rng.random() < 0.1:
+                out.append("1e-2")
+    return " ".join(out)
+
+
+def check_parity(rng, cases=2000):
+    for _ in range(cases):
+        d = fuzz_case(rng)
+        old, new = legacy(d), vectorized(d)
+        assert len(old) == len(new), d
+        for a, b in zip(old, new):
+            assert np.array_equal(np.asarray(a, dtype=float).reshape(-1, 2), b), d
+
+
+def timed(fn, arg, repeat):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(arg)
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(1234)
+    check_parity(rng)
+    print("parity: legacy and vectorized parsers agree on 2000 random paths")
+
+    nrng = np.random.default_rng(1234)
+    cases = {
+        "gnuplot absolute": gnuplot_like(args.points, nrng),
+        "relative l/h/v": relative_mix(args.points, rng),
+    }
+    print(f"{'case':<20}{'chars':>10}{'legacy ms':>12}{'numpy ms':>12}{'speedup':>10}")
+    for name, d in cases.items():
+        t_old = timed(legacy, d, args.repeat)
+        t_new = timed(vectorized, d, args.repeat)
+        print(f"{name:<20}{len(d):>10}{t_old * 1e3:>12.2f}{t_new * 1e3:>12.2f}{t_old / t_new:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
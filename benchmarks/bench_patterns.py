@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""Micro-benchmark of the precompiled patterns and memoized label predicates.
+
+The per-report regex workload of one report (synthetic by default, see
+:mod:`synthetic_report`, or the ``--report`` files) is collected once:
+
+- every ``<text>`` label of every inline SVG (tick classification);
+- every ``<polyline points>`` string (coordinate pairs);
+- every path/polyline/group node (``stroke``/``fill``/``style`` colour lookup)
+  and the colours found (``_color_family``);
+- every section key, with the ``_azimuth``/``_elevation`` variants, run
+  ``--passes`` times through ``_normalized_label`` and the five label
+  predicates (section selection, statistics and plots each scan the keys).
+
+The legacy code, which passes pattern strings to ``re.fullmatch``/``re.search``
+on every call, is kept here as reference.  Both variants must give identical
+results before timing (exit status 1 otherwise).  The memoized functions'
+caches are cleared before every timed run, so the numbers are those of a
+cold report.
+
+Usage::
+
+    python benchmarks/bench_patterns.py [--repeat 20] [--passes 3] [--report FILE ...]
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+import synthetic_report  # noqa: E402
+from Extract_all_charts import (  # noqa: E402
+    SECTION_HEADERS,
+    _color_family,
+    _is_azimuth_label,
+    _is_ebno_label,
+    _is_elevation_label,
+    _is_input_level_label,
+    _is_snr_label,
+    _normalized_label,
+    _section_key,
+    _svg_series_color,
+)
+from patterns import POLYLINE_PAIR_RE, WHITESPACE_RE, tick_kind  # noqa: E402
+
+MEMOIZED = (
+    _color_family,
+    _normalized_label,
+    _is_azimuth_label,
+    _is_elevation_label,
+    _is_input_level_label,
+    _is_ebno_label,
+    _is_snr_label,
+)
+
+
+# -------------------- Legacy reference --------------------
+def legacy_tick_kind(content):
+    is_num = re.fullmatch(r"[-+]?\d+(?:[.,]\d+)?(?:\s*(dB|°|deg))?", content) is not None
+    is_time = (
+        re.fullmatch(r"\d{2}:\d{2}", content) is not None or
+        re.fullmatch(r"\d{2}:\d{2}:\d{2}", content) is not None
+    )
+    is_lock_state = re.fullmatch(
+        r"(?i)(lock(?:ed)?|unlock(?:ed)?|no\s*lock|out\s*of\s*lock|loss\s*of\s*lock)",
+        content,
+    ) is not None
+    if is_num:
+        return "num"
+    if is_time:
+        return "time"
+    return "state" if is_lock_state else None
+
+
+def legacy_polyline_pairs(raw):
+    raw = re.sub(r"\s+", " ", raw)
+    return re.findall(r"([-+]?\d*\.?\d+(?:e[-+]?\d+)?)\s*,\s*([-+]?\d*\.?\d+(?:e[-+]?\d+)?)", raw)
+
+
+def legacy_series_color(*nodes):
+    def read_color(node):
+        if node is None:
+            return None
+        for attr in ("stroke", "fill"):
+            val = (node.get(attr) or "").strip()
+            if val and val.lower() != "none":
+                return val
+        style = node.get("style") or ""
+        for key in ("stroke", "fill"):
+            m = re.search(rf"{key}\s*:\s*([^;]+)", style, flags=re.I)
+            if m:
+                val = m.group(1).strip()
+                if val and val.lower() != "none":
+                    return val
+        return None
+
+    for node in nodes:
+        color = read_color(node)
+        if color:
+            return color
+    return None
+
+
+def legacy_color_family(color):
+    if not color:
+        return None
+    c = color.strip().lower()
+    if any(k in c for k in ("green", "lime", "chartreuse")):
+        return "green"
+    if any(k in c for k in ("purple", "violet", "magenta", "fuchsia")):
+        return "purple"
+    for pattern in (r"#?([0-9a-f]{6})", r"rgb\(\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*\)"):
+        m = re.fullmatch(pattern, c)
+        if m:
+            if m.lastindex == 1:
+                hx = m.group(1)
+                r, g, b = int(hx[0:2], 16), int(hx[2:4], 16), int(hx[4:6], 16)
+            else:
+                r, g, b = map(int, m.groups())
+            if g >= max(r, b) + 20:
+                return "green"
+            if (r + b) / 2 >= g + 20:
+                return "purple"
+    return None
+
+
+def legacy_normalized_label(s):
+    return re.sub(r"[^a-z0-9]+", "", (s or "").lower())
+
+
+def legacy_predicates(label):
+    n = legacy_normalized_label(label)
+    return (
+        "azimuth" in n or n.startswith("az") or "antennaaz" in n,
+        "elevation" in n or n.startswith("el") or "antennael" in n,
+        "inputlevel" in n or "iflevel" in n or ("input" in n and "level" in n),
+        "ebn0" in n or "ebno" in n or "esn0" in n or "esno" in n or ("eb" in n and ("n0" in n or "no" in n)),
+        "snr" in n or "signaltonoiseratio" in n or "signalnoiseratio" in n or "cn0" in n or "cno" in n,
+    )
+
+
+def new_predicates(label):
+    _normalized_label(label)
+    return (
+        _is_azimuth_label(label),
+        _is_elevation_label(label),
+        _is_input_level_label(label),
+        _is_ebno_label(label),
+        _is_snr_label(label),
+    )
+
+
+def new_polyline_pairs(raw):
+    return POLYLINE_PAIR_RE.findall(WHITESPACE_RE.sub(" ", raw))
+
+
+# -------------------- Workload --------------------
+def load_workload(reports, passes):
+    if reports:
+        sources = [Path(p).read_text(encoding="utf-8", errors="ignore") for p in reports]
+    else:
+        sources = [synthetic_report.generate_report(sections=12, points=50)]
+    work = {"ticks": [], "polylines": [], "nodes": [], "colors": [], "labels": []}
+    for html in sources:
+        soup = BeautifulSoup(html, "html.parser")
+        keys = [_section_key(h.get_text(" ", strip=True)) for h in soup.find_all(SECTION_HEADERS)]
+        frame_keys = keys + [f"{k}_{axis}" for k in keys for axis in ("azimuth", "elevation")]
+        work["labels"].extend(frame_keys * passes)
+        for svg in soup.find_all("svg"):
+            work["ticks"].extend(t.get_text().strip() for t in svg.find_all("text") if t.get_text().strip())
+            work["polylines"].extend(pl.get("points") for pl in svg.find_all("polyline") if pl.get("points"))
+            for node in svg.find_all(["path", "polyline"]):
+                work["nodes"].append((node, node.find_parent("g")))
+    work["colors"] = [legacy_series_color(*nodes) for nodes in work["nodes"]]
+    return work
+
+
+STAGES = {
+    "ticks": (legacy_tick_kind, tick_kind, False),
+    "polylines": (legacy_polyline_pairs, new_polyline_pairs, False),
+    "nodes": (legacy_series_color, _svg_series_color, True),
+    "colors": (legacy_color_family, _color_family, False),
+    "labels": (legacy_predicates, new_predicates, False),
+}
+
+
+def run_stage(fn, items, star):
+    if star:
+        return [fn(*item) for item in items]
+    return [fn(item) for item in items]
+
+
+def check_parity(work):
+    bad = 0
+    for stage, (legacy, new, star) in STAGES.items():
+        if run_stage(legacy, work[stage], star) != run_stage(new, work[stage], star):
+            print(f"  MISMATCH {stage}")
+            bad += 1
+    return bad
+
+
+def bench(fn, repeat):
+    fn()
+    samples = []
+    for _ in range(repeat):
+        for cached in MEMOIZED:
+            cached.cache_clear()
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--passes", type=int, default=3, help="scans of the section keys per report")
+    parser.add_argument("--report", nargs="*", default=None, help="HTML reports (default: one synthetic report)")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    work = load_workload(args.report, args.passes)
+    bad = check_parity(work)
+    print(f"parity: {', '.join(f'{k}={len(v)}' for k, v in work.items())}, {bad} mismatches")
+    if bad:
+        sys.exit(1)
+
+    print(f"{'stage':<12}{'calls':>8}{'legacy ms':>12}{'new ms':>10}{'saved ms':>10}{'speedup':>9}")
+    totals = [0.0, 0.0]
+    for stage, (legacy, new, star) in STAGES.items():
+        items = work[stage]
+        if not items:
+            continue
+        t_old = bench(lambda: run_stage(legacy, items, star), args.repeat)
+        t_new = bench(lambda: run_stage(new, items, star), args.repeat)
+        totals[0] += t_old
+        totals[1] += t_new
+        print(
+            f"{stage:<12}{len(items):>8}{t_old * 1e3:>12.3f}{t_new * 1e3:>10.3f}"
+            f"{(t_old - t_new) * 1e3:>10.3f}{t_old / t_new:>9.2f}"
+        )
+    n_reports = len(args.report) if args.report else 1
+    print(
+        f"{'per report':<12}{'':>8}{totals[0] / n_reports * 1e3:>12.3f}{totals[1] / n_reports * 1e3:>10.3f}"
+        f"{(totals[0] - totals[1]) / n_reports * 1e3:>10.3f}{totals[0] / totals[1]:>9.2f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
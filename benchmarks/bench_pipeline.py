@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""Regression benchmarks of the extraction pipeline on synthetic reports.
+
+Suites follow the asv conventions (a class with ``params``/``param_names``,
+``setup(*params)`` and ``time_*`` methods) so they can be collected by asv as
+they are, but the script also runs them directly: every parameter
+combination is set up once, each ``time_*`` method runs ``--repeat`` times and
+the median is printed.  Inputs come from :mod:`synthetic_report`, so sizes
+can be scaled beyond the single real fixture.
+
+Suites: ``parse_path_subpaths``, ``svg_axes_from_ticks``,
+``build_antenna_combined_df``, antenna section extraction (best curve plus
+top curves, separate extractors vs one shared ``SectionExtraction``),
+``map_x_to_time``, Excel writing (per engine) and full ``process_html`` (per
+parser).
+
+Usage::
+
+    python benchmarks/bench_pipeline.py [-k antenna] [--repeat N] [--quick] [--json results.json]
+"""
+from __future__ import annotations
+
+import argparse
+import inspect
+import itertools
+import json
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+from bs4 import BeautifulSoup  # noqa: E402
+
+import synthetic_report  # noqa: E402
+from Extract_all_charts import (  # noqa: E402
+    SectionExtraction,
+    build_antenna_combined_df,
+    extract_curve_for_header,
+    extract_curves_for_header,
+    map_x_to_time,
+    parse_path_subpaths,
+    process_html,
+    read_report,
+    svg_axes_from_ticks,
+)
+from xlsx_writer import WorkbookWriter, resolve_engine  # noqa: E402
+
+START = datetime(2026, 2, 24, 12, 56, 1)
+STOP = START + timedelta(seconds=410)
+
+
+def _svg(markup):
+    return BeautifulSoup(markup, "html.parser").svg
+
+
+class PathParser:
+    params = [[1_000, 10_000, 100_000]]
+    param_names = ["points"]
+
+    def setup(self, points):
+        rng = np.random.default_rng(0)
+        xs = np.linspace(72.0, 1115.0, points)
+        ys = 300.0 + np.cumsum(rng.normal(0.0, 1.0, points))
+        self.d = synthetic_report._path_d(xs, ys, legend=((1055.5, 36.0), (1098.1, 36.0)))
+
+    def time_parse_path_subpaths(self, points):
+        parse_path_subpaths(self.d)
+
+
+class SvgAxes:
+    params = [["metric", "antenna", "lock_state"]]
+    param_names = ["chart"]
+
+    def setup(self, chart):
+        rng = np.random.default_rng(0)
+        if chart == "metric":
+            markup = synthetic_report.metric_chart(rng, 50, START, STOP, "snRatio", "dB", (0.0, 50.0))
+        elif chart == "antenna":
+            az, el = synthetic_report.antenna_track(50, rng)
+            markup = synthetic_report.antenna_time_chart(az, el, START, STOP)
+        else:
+            markup = synthetic_report.lock_state_chart(rng, 50, START, STOP)
+        self.svg = _svg(markup)
+
+    def time_svg_axes_from_ticks(self, chart):
+        svg_axes_from_ticks(self.svg, {})
+
+
+class AntennaCombined:
+    params = [[500, 5_000]]
+    param_names = ["points"]
+
+    def setup(self, points):
+        html = synthetic_report.generate_report(sections=0, points=points, lock_state=False)
+        soup = BeautifulSoup(html, "html.parser")
+        hdr = soup.find(id="_antenna")
+        self.curves = extract_curves_for_header(hdr)
+        if not self.curves:
+            raise RuntimeError("no antenna curves extracted from the synthetic report")
+
+    def time_build_antenna_combined_df(self, points):
+        build_antenna_combined_df("6_1_antenna", self.curves, START, STOP)
+
+
+class AntennaExtraction:
+    """Antenna section whose combined frame is rejected: top curves, then the best single curve."""
+
+    params = [[500, 5_000]]
+    param_names = ["points"]
+
+    def setup(self, points):
+        html = synthetic_report.generate_report(sections=0, points=points, lock_state=False)
+        self.hdr = BeautifulSoup(html, "html.parser").find(id="_antenna")
+
+    def time_separate_extractors(self, points):
+        extract_curves_for_header(self.hdr, tr_cache={})
+        extract_curve_for_header(self.hdr, tr_cache={})
+
+    def time_shared_extraction(self, points):
+        extraction = SectionExtraction(self.hdr, tr_cache={})
+        extraction.top_curves()
+        extraction.best_curve()
+
+
+class MapXToTime:
+    params = [[1_000, 100_000], ["strings", "datetime", "none"]]
+    param_names = ["rows", "time_columns"]
+
+    def setup(self, rows, time_columns):
+        self.df = pd.DataFrame({"x_px": np.linspace(72.0, 1115.0, rows), "y_px": np.zeros(rows)})
+
+    def time_map_x_to_time(self, rows, time_columns):
+        map_x_to_time(self.df.copy(), START, STOP, time_columns)
+
+
+class ExcelWrite:
+    params = [["openpyxl", "xlsxwriter"], [10, 40]]
+    param_names = ["engine", "sections"]
+
+    def setup(self, engine, sections):
+        if resolve_engine(engine) != engine:
+            raise NotImplementedError(f"{engine} not installed")
+        rows = 800
+        t = np.linspace(0.0, 410.0, rows)
+        frame = map_x_to_time(pd.DataFrame({"x_px": np.linspace(72.0, 1115.0, rows), "y_px": t}), START, STOP)
+        self.sheets = {f"section_{i}": frame.assign(value=np.sin(t + i)) for i in range(sections)}
+        self.tmp = tempfile.TemporaryDirectory()
+        self.engine = engine
+
+    def teardown(self, engine, sections):
+        self.tmp.cleanup()
+
+    def time_write_workbook(self, engine, sections):
+        with WorkbookWriter(Path(self.tmp.name) / "out.xlsx", engine=self.engine) as wr:
+            for name, df in self.sheets.items():
+                wr.write(name, df)
+
+
+class ProcessHtml:
+    params = [[(12, 800), (24, 4_000)], ["bs4", "stream"]]
+    param_names = ["sections_points", "parser"]
+
+    def setup(self, sections_points, parser):
+        sections, points = sections_points
+        self.tmp = tempfile.TemporaryDirectory()
+        self.report = synthetic_report.write_report(
+            Path(self.tmp.name) / "report.html", sections=sections, points=points, object_svgs=2
+        )
+        self.parser = parser
+        read_report(self.report, parser=parser)  # warm imports
+
+    def teardown(self, sections_points, parser):
+        self.tmp.cleanup()
+
+    def time_process_html(self, sections_points, parser):
+        process_html(self.report, Path(self.tmp.name) / "out", parser=self.parser)
+
+    def time_process_html_stats_only(self, sections_points, parser):
+        process_html(
+            self.report,
+            Path(self.tmp.name) / "out",
+            parser=self.parser,
+            stats_selectors=["demodulator_lock_state"],
+            stats_rows=[],
+            stats_only=True,
+        )
+
+
+SUITES = (PathParser, SvgAxes, AntennaCombined, AntennaExtraction, MapXToTime, ExcelWrite, ProcessHtml)
+
+
+def run_suite(cls, repeat, pattern="", quick=False):
+    """Yield one result dict per (parameter combination, ``time_*`` method)."""
+    methods = [name for name, _ in inspect.getmembers(cls, inspect.isfunction) if name.startswith("time_")]
+    combos = list(itertools.product(*cls.params)) if getattr(cls, "params", None) else [()]
+    if quick:
+        combos = combos[:1]
+    for combo in combos:
+        wanted = [m for m in methods if pattern in f"{cls.__name__}.{m}".lower()]
+        if not wanted:
+            continue
+        bench = cls()
+        try:
+            bench.setup(*combo)
+        except NotImplementedError as exc:  # asv's way of skipping a combination
+            print(f"  skipped {cls.__name__}{combo}: {exc}")
+            continue
+        try:
+            for name in wanted:
+                fn = getattr(bench, name)
+                fn(*combo)  # warm-up
+                samples = []
+                for _ in range(repeat):
+                    t0 = time.perf_counter()
+                    fn(*combo)
+                    samples.append(time.perf_counter() - t0)
+                yield {
+                    "benchmark": f"{cls.__name__}.{name}",
+                    "params": dict(zip(cls.param_names, map(str, combo))),
+                    "median_s": statistics.median(samples),
+                    "min_s": min(samples),
+                    "repeat": repeat,
+                }
+        finally:
+            if hasattr(bench, "teardown"):
+                bench.teardown(*combo)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", dest="pattern", default="", help="only benchmarks whose Suite.time_name contains this text")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--quick", action="store_true", help="first parameter combination of each suite only")
+    parser.add_argument("--json", type=Path, default=None, help="also write the results to this JSON file")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    results = []
+    print(f"{'benchmark':<50}{'params':<42}{'median ms':>12}{'min ms':>10}")
+    for cls in SUITES:
+        for res in run_suite(cls, args.repeat, args.pattern.lower(), args.quick):
+            results.append(res)
+            params = ", ".join(f"{k}={v}" for k, v in res["params"].items())
+            print(f"{res['benchmark']:<50}{params:<42}{res['median_s'] * 1e3:>12.2f}{res['min_s'] * 1e3:>10.2f}")
+    if args.json is not None:
+        args.json.write_text(json.dumps(results, indent=1), encoding="utf-8")
+        print(f"results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
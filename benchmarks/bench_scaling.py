@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Throughput of ``process_many`` versus report size and worker count.
+
+For each ``--points`` value a batch of ``--reports`` synthetic reports (see
+:mod:`synthetic_report`) is generated once; the batch is then processed with
+each ``--workers`` count (``incremental=False``, fresh output directory) and
+the wall time, reports/s, input MB/s and the speedup over the first worker
+count are printed.  Worker counts above ``os.cpu_count()`` are still run but
+flagged, since they cannot scale on this machine.
+
+Usage::
+
+    python benchmarks/bench_scaling.py [--points 400,2000,8000] [--workers 1,2,4]
+        [--reports 8] [--sections 12] [--stats-only] [--csv scaling.csv]
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import synthetic_report  # noqa: E402
+from Extract_all_charts import process_many  # noqa: E402
+
+
+def _int_list(text):
+    return [int(v) for v in text.split(",") if v.strip()]
+
+
+def make_batch(directory, reports, sections, points):
+    return [
+        synthetic_report.write_report(
+            Path(directory) / f"report_{i:03d}.html", sections=sections, points=points, seed=i, orbit=9000 + i
+        )
+        for i in range(reports)
+    ]
+
+
+def run_batch(paths, out_dir, workers, stats_only):
+    t0 = time.perf_counter()
+    batch = process_many(
+        paths,
+        out_dir,
+        workers=workers,
+        incremental=False,
+        stats_selectors=["demodulator_lock_state"],
+        plot_selectors=["snr"] if not stats_only else None,
+        generate_individual_plots=False,
+        stats_only=stats_only,
+    )
+    elapsed = time.perf_counter() - t0
+    if batch["failed"]:
+        raise RuntimeError(f"{len(batch['failed'])} report(s) failed:\n{batch['failed'][0][1]}")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", type=_int_list, default=[400, 2000, 8000], help="points per curve, comma separated")
+    parser.add_argument("--workers", type=_int_list, default=[1, 2, 4], help="worker counts, comma separated")
+    parser.add_argument("--reports", type=int, default=8, help="reports per batch")
+    parser.add_argument("--sections", type=int, default=12, help="metric sections per report")
+    parser.add_argument("--stats-only", action="store_true", help="process with stats_only=True (no Excel)")
+    parser.add_argument("--csv", type=Path, default=None, help="also write the table to this CSV file")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    cpus = os.cpu_count() or 1
+    print(f"{args.reports} reports x {args.sections} sections, cpu_count={cpus}")
+    print(f"{'points':>8}{'MB/report':>11}{'workers':>9}{'wall s':>9}{'reports/s':>11}{'MB/s':>8}{'speedup':>9}")
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for points in args.points:
+            src = Path(tmp) / f"in_{points}"
+            paths = make_batch(src, args.reports, args.sections, points)
+            mb = sum(p.stat().st_size for p in paths) / 1e6
+            base = None
+            for workers in args.workers:
+                elapsed = run_batch(paths, Path(tmp) / f"out_{points}_{workers}", workers, args.stats_only)
+                base = base or elapsed
+                row = {
+                    "points": points,
+                    "mb_per_report": mb / args.reports,
+                    "workers": workers,
+                    "wall_s": elapsed,
+                    "reports_per_s": args.reports / elapsed,
+                    "mb_per_s": mb / elapsed,
+                    "speedup": base / elapsed,
+                }
+                rows.append(row)
+                flag = "  (> cpu_count)" if workers > cpus else ""
+                print(
+                    f"{points:>8}{row['mb_per_report']:>11.2f}{workers:>9}{elapsed:>9.2f}"
+                    f"{row['reports_per_s']:>11.2f}{row['mb_per_s']:>8.2f}{row['speedup']:>9.2f}{flag}"
+                )
+    if args.csv is not None:
+        with args.csv.open("w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"table written to {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Benchmark section discovery: legacy per-header walks vs. the single-pass index.
+
+The legacy path reproduces what ``process_html`` used to do: a
+``find_next_sibling`` walk for every h2/h3 to detect charts, followed by a
+``next_elements`` walk per target section to collect its SVG/object nodes.
+
+Usage::
+
+    python benchmarks/bench_section_index.py [report.html] [--repeat N]
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from Extract_all_charts import _section_key, _section_nodes, build_section_index  # noqa: E402
+
+DEFAULT_REPORT = ROOT / "web_report_AWS-PFM_8297_meos8_lan.html"
+
+
+def legacy_sections(soup):
+    """Header discovery + node collection as done before the section index."""
+    out = []
+    for hdr in soup.find_all(["h2", "h3"]):
+        title = hdr.get_text(" ", strip=True)
+        if not title:
+            continue
+        cur = hdr
+        has_chart = False
+        while True:
+            cur = cur.find_next_sibling()
+            if cur is None or cur.name in ("h2", "h3"):
+                break
+            if cur.find("svg") or cur.find("object", type="image/svg+xml"):
+                has_chart = True
+                break
+        if not has_chart:
+            continue
+        # Both extractors walked ``next_elements`` for antenna-like sections.
+        nodes = _section_nodes(hdr)
+        out.append((_section_key(title), nodes))
+    return out
+
+
+def indexed_sections(soup):
+    return [
+        (s["key"], s["nodes"])
+        for s in build_section_index(soup)
+        if s["key"] and s["has_chart"]
+    ]
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("report", nargs="?", type=Path, default=DEFAULT_REPORT)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    html = args.report.read_text(encoding="utf-8")
+    soup = BeautifulSoup(html, "html.parser")
+
+    legacy = legacy_sections(soup)
+    indexed = indexed_sections(soup)
+    same = [(k, len(n)) for k, n in legacy] == [(k, len(n)) for k, n in indexed]
+
+    t_parse = timed(lambda: BeautifulSoup(html, "html.parser"), args.repeat)
+    t_legacy = timed(lambda: legacy_sections(soup), args.repeat)
+    t_index = timed(lambda: indexed_sections(soup), args.repeat)
+
+    print(f"report: {args.report.name} ({len(html) / 1024:.0f} KiB), {len(indexed)} chart sections, parity={same}")
+    print(f"{'stage':<28}{'median ms':>12}")
+    print(f"{'parse (html.parser)':<28}{t_parse * 1e3:>12.1f}")
+    print(f"{'index (legacy walks)':<28}{t_legacy * 1e3:>12.1f}")
+    print(f"{'index (single pass)':<28}{t_index * 1e3:>12.1f}")
+    print(f"{'parse+index before':<28}{(t_parse + t_legacy) * 1e3:>12.1f}")
+    print(f"{'parse+index after':<28}{(t_parse + t_index) * 1e3:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
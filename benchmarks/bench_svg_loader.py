@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""Remote ``<object>`` SVG loading against a local HTTP stand-in server.
+
+A synthetic report (see :mod:`synthetic_report`) is generated with every
+chart embedded as ``<object>``; the base64 payloads are then served by a
+local ``http.server`` (with ``--latency`` ms of delay per request) and the
+report is rewritten to reference them by URL.  The script then:
+
+1. checks that ``process_html`` extracts the same sheets from the URL
+   report as from the base64 one;
+2. times loading every reference of the report: the legacy serial loop (one
+   blocking ``urlopen`` + parse per object, kept here as reference), a cold
+   :class:`svg_loader.SvgLoader` (``prefetch`` on its thread pool, then
+   ``load``) and a warm one (trees from its LRU);
+3. checks the disk cache: a second loader with the same ``cache_dir`` loads
+   every chart without any request to the server;
+4. checks failures: a request slower than the timeout and a 404 both give
+   ``None`` without blocking longer than the timeout.
+
+Exits with status 1 when a check fails.
+
+Usage::
+
+    python benchmarks/bench_svg_loader.py [--sections 12] [--latency 50] [--threads 8] [--repeat 3]
+"""
+from __future__ import annotations
+
+import argparse
+import base64
+import logging
+import re
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import pandas as pd  # noqa: E402
+from bs4 import BeautifulSoup  # noqa: E402
+
+import synthetic_report  # noqa: E402
+from Extract_all_charts import build_section_index, process_html  # noqa: E402
+from svg_loader import SvgLoader, parse_svg_bytes  # noqa: E402
+
+DATA_URI_RE = re.compile(r'data="data:image/svg\+xml;base64,([^"]+)"')
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # the default 5 drops concurrent connects (1 s SYN retry)
+
+
+class StandInServer:
+    """Serve ``files`` (name -> bytes) on 127.0.0.1; ``/slow.svg`` never answers in time."""
+
+    def __init__(self, files, latency_s=0.0, slow_s=5.0):
+        self.files = files
+        self.requests = 0
+        outer = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):  # noqa: N802 - http.server API
+                outer.requests += 1
+                name = self.path.lstrip("/")
+                time.sleep(slow_s if name == "slow.svg" else latency_s)
+                body = outer.files.get(name)
+                if body is None:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "image/svg+xml")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = _Server(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}/"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        return False
+
+
+def make_reports(directory, sections, points):
+    """Write ``base64.html``; return its path, the served files and the URL report (``{base}`` placeholder)."""
+    n_charts = sections + 3  # metric sections + lock state + polar and time antenna charts
+    html = synthetic_report.generate_report(sections=sections, points=points, object_svgs=n_charts)
+    files = {}
+
+    def to_url(m):
+        name = f"chart_{len(files):03d}.svg"
+        files[name] = base64.b64decode(m.group(1))
+        return f'data="{{base}}{name}"'
+
+    remote = DATA_URI_RE.sub(to_url, html)
+    base64_path = Path(directory) / "base64.html"
+    base64_path.write_text(html, encoding="utf-8")
+    return base64_path, files, remote
+
+
+def object_nodes(html):
+    soup = BeautifulSoup(html, "html.parser")
+    return [el for s in build_section_index(soup) for el in s["nodes"] if el.name == "object"]
+
+
+def legacy_load_all(nodes):
+    trees = []
+    for el in nodes:
+        with urllib.request.urlopen(el.get("data")) as resp:
+            trees.append(parse_svg_bytes(resp.read()))
+    return trees
+
+
+def loader_load_all(loader, nodes):
+    loader.prefetch(nodes)
+    return [loader.load(el) for el in nodes]
+
+
+def same_sheets(a, b):
+    sa, sb = pd.read_excel(a, sheet_name=None), pd.read_excel(b, sheet_name=None)
+    if sa.keys() != sb.keys():
+        return False
+    for name in sa:
+        try:
+            pd.testing.assert_frame_equal(sa[name], sb[name])
+        except AssertionError:
+            return False
+    return True
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sections", type=int, default=12, help="metric sections of the synthetic report")
+    parser.add_argument("--points", type=int, default=400)
+    parser.add_argument("--latency", type=float, default=50.0, help="server delay per request, ms")
+    parser.add_argument("--threads", type=int, default=8, help="SvgLoader threads")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    failures = []
+
+    def check(ok, what):
+        print(f"  {'ok  ' if ok else 'FAIL'} {what}")
+        if not ok:
+            failures.append(what)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        base64_path, files, remote_template = make_reports(tmp, args.sections, args.points)
+        with StandInServer(files, latency_s=args.latency / 1e3) as server:
+            remote_html = remote_template.replace("{base}", server.base_url)
+            remote_path = tmp / "remote.html"
+            remote_path.write_text(remote_html, encoding="utf-8")
+            nodes = object_nodes(remote_html)
+            print(f"{len(nodes)} <object> charts served from {server.base_url} ({args.latency:g} ms latency)")
+
+            print("parity")
+            with SvgLoader(threads=args.threads, timeout=10.0) as loader:
+                ref = process_html(base64_path, tmp / "out_base64", stats_rows=[])
+                got = process_html(remote_path, tmp / "out_remote", stats_rows=[], svg_loader=loader)
+            check(same_sheets(ref, got), "process_html: same sheets from URLs as from base64")
+
+            print("loading every <object> of the report")
+            warm = SvgLoader(threads=args.threads, timeout=10.0)
+            loader_load_all(warm, nodes)
+
+            def cold():
+                with SvgLoader(threads=args.threads, timeout=10.0) as loader:
+                    loader_load_all(loader, nodes)
+
+            base = None
+            print(f"  {'variant':<26}{'ms':>10}{'speedup':>9}")
+            for name, fn in (
+                ("legacy serial urlopen", lambda: legacy_load_all(nodes)),
+                (f"SvgLoader cold ({args.threads} thr)", cold),
+                ("SvgLoader warm (LRU)", lambda: loader_load_all(warm, nodes)),
+            ):
+                elapsed = timed(fn, args.repeat)
+                base = base or elapsed
+                print(f"  {name:<26}{elapsed * 1e3:>10.1f}{base / elapsed:>9.1f}")
+            warm.close()
+
+            print("disk cache")
+            cache_dir = tmp / "svg_cache"
+            with SvgLoader(threads=args.threads, timeout=10.0, cache_dir=cache_dir) as loader:
+                first = loader_load_all(loader, nodes)
+            before = server.requests
+            with SvgLoader(threads=args.threads, timeout=10.0, cache_dir=cache_dir) as loader:
+                second = loader_load_all(loader, nodes)
+                disk_hits = loader.stats["disk_hits"]
+            check(server.requests == before, f"second run made {server.requests - before} requests")
+            check(disk_hits == len(set(el.get("data") for el in nodes)), f"{disk_hits} charts read from disk")
+            check(
+                [str(a) for a in first] == [str(b) for b in second] and all(t is not None for t in second),
+                "trees from disk equal the downloaded ones",
+            )
+
+            print("failures")
+            slow, missing = (
+                BeautifulSoup(f'<object type="image/svg+xml" data="{server.base_url}{name}"></object>', "html.parser").object
+                for name in ("slow.svg", "missing.svg")
+            )
+            with SvgLoader(threads=args.threads, timeout=0.5) as loader:
+                t0 = time.perf_counter()
+                loader.prefetch([slow, missing])
+                results = [loader.load(slow), loader.load(missing)]
+                elapsed = time.perf_counter() - t0
+            check(results == [None, None], "slow and missing charts give None")
+            check(elapsed < 2.0, f"failures resolved in {elapsed:.2f} s (timeout 0.5 s)")
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""Micro-benchmark of the per-section pixel → value mapping (tick fits).
+
+Every inline ``<svg>`` of a synthetic report (see :mod:`synthetic_report`,
+metric, lock-state and antenna charts) or of the ``--report`` files is run
+through ``svg_axes_from_ticks`` once; then, per section, three variants map
+``--points`` pixel rows and compute the per-side tick groups used by the
+antenna scorer:
+
+- ``legacy``: the previous code kept here as reference, which re-parses the
+  tick labels with ``re.sub`` and solves ``np.linalg.lstsq`` on every call;
+- ``build+map``: a :class:`tick_axis.TickAxis` built from the tick table
+  (what ``svg_axes_from_ticks`` now does once per SVG) and then applied;
+- ``map``: the prebuilt axis applied (the cost left per mapper call).
+
+Before timing, mapped values and group fits of both implementations must
+match (``rtol=1e-9``); the script exits with status 1 otherwise.
+
+Usage::
+
+    python benchmarks/bench_tick_mapping.py [--points 800] [--repeat 50] [--report FILE ...]
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+from bs4 import BeautifulSoup  # noqa: E402
+
+import synthetic_report  # noqa: E402
+from Extract_all_charts import map_y_from_ticks, svg_axes_from_ticks  # noqa: E402
+from tick_axis import TickAxis  # noqa: E402
+
+
+def _legacy_value(text):
+    return float(re.sub(r"[^0-9+\-.,]", "", str(text)).replace(",", "."))
+
+
+def legacy_map_y_from_ticks(df, ticks, colname):
+    if df.empty or ticks is None or ticks.empty:
+        df[colname] = np.nan
+        return df
+    y_ticks = ticks[ticks["kind"] == "num"].copy()
+    if not y_ticks.empty:
+        y_ticks["value"] = y_ticks["text"].apply(_legacy_value)
+        Y = np.vstack([y_ticks["y_px"].values, np.ones(len(y_ticks))]).T
+        a, b = np.linalg.lstsq(Y, y_ticks["value"].values, rcond=None)[0]
+        df[colname] = a * df["y_px"] + b
+        return df
+    state_ticks = ticks[ticks["kind"] == "state"].copy()
+    if not state_ticks.empty:
+        state_ticks["value"] = state_ticks["text"].apply(
+            lambda s: 0.0 if re.search(r"(?i)unlock|no\s*lock|out\s*of\s*lock|loss", s) else 1.0
+        )
+        if len(state_ticks) >= 2:
+            Y = np.vstack([state_ticks["y_px"].values, np.ones(len(state_ticks))]).T
+            a, b = np.linalg.lstsq(Y, state_ticks["value"].values, rcond=None)[0]
+            df[colname] = np.round(a * df["y_px"] + b).clip(0, 1)
+        else:
+            df[colname] = state_ticks["value"].iloc[0]
+        return df
+    df[colname] = np.nan
+    return df
+
+
+def legacy_tick_groups(ticks):
+    """``[(vmin, vmax, (a, b)), ...]`` of the per-side numeric groups, as the old antenna code."""
+    if ticks is None or ticks.empty:
+        return []
+    num = ticks[ticks.get("kind") == "num"].copy()
+    if num.empty:
+        return []
+    num["val"] = num["text"].apply(_legacy_value)
+    num = num.dropna(subset=["x_px", "y_px", "val"])
+    groups = [num]
+    if len(num) >= 2:
+        x_sorted = np.sort(num["x_px"].to_numpy(dtype=float))
+        x_diffs = np.diff(x_sorted)
+        if np.nanmax(x_diffs) > 0:
+            split_at = int(np.nanargmax(x_diffs))
+            gap = float(x_diffs[split_at])
+            total_span = float(x_sorted[-1] - x_sorted[0])
+            if total_span > 0 and gap >= max(8.0, 0.15 * total_span):
+                threshold = float((x_sorted[split_at] + x_sorted[split_at + 1]) / 2.0)
+                sides = [num[num["x_px"] <= threshold], num[num["x_px"] > threshold]]
+                groups = [g for g in sides if len(g) >= 2] or [num]
+    out = []
+    for grp in groups:
+        Y = np.vstack([grp["y_px"].values, np.ones(len(grp))]).T
+        a, b = np.linalg.lstsq(Y, grp["val"].values, rcond=None)[0]
+        out.append((float(grp["val"].min()), float(grp["val"].max()), (float(a), float(b))))
+    return out
+
+
+def new_tick_groups(axis):
+    return [(g["min"], g["max"], g["fit"]) for g in axis.groups]
+
+
+def load_sections(reports, points):
+    """``[(label, tick table, pixel frame), ...]`` for every inline SVG."""
+    if reports:
+        sources = [(Path(p).name, Path(p).read_text(encoding="utf-8", errors="ignore")) for p in reports]
+    else:
+        sources = [("synthetic", synthetic_report.generate_report(sections=12, points=50))]
+    sections = []
+    for name, html in sources:
+        for i, svg in enumerate(BeautifulSoup(html, "html.parser").find_all("svg")):
+            axis, box = svg_axes_from_ticks(svg, {})
+            if axis.empty:
+                continue
+            y_lo, y_hi = (box[2], box[3]) if box[2] is not None else (0.0, 500.0)
+            y_px = np.linspace(y_lo - 5.0, y_hi + 5.0, points)
+            sections.append((f"{name}#{i}", axis.frame, pd.DataFrame({"x_px": np.zeros(points), "y_px": y_px})))
+    return sections
+
+
+def check_parity(sections):
+    bad = 0
+    for label, frame, px in sections:
+        axis = TickAxis(frame)
+        ref = legacy_map_y_from_ticks(px.copy(), frame, "value")["value"].to_numpy(dtype=float)
+        got = map_y_from_ticks(px.copy(), axis, "value")["value"].to_numpy(dtype=float)
+        if not np.allclose(ref, got, rtol=1e-9, atol=1e-9, equal_nan=True):
+            print(f"  MISMATCH values {label}")
+            bad += 1
+        ref_groups, new_groups = legacy_tick_groups(frame), new_tick_groups(axis)
+        if len(ref_groups) != len(new_groups) or not all(
+            np.allclose([r[0], r[1], *r[2]], [n[0], n[1], *n[2]], rtol=1e-9, atol=1e-9)
+            for r, n in zip(ref_groups, new_groups)
+        ):
+            print(f"  MISMATCH groups {label}: {ref_groups} != {new_groups}")
+            bad += 1
+    return bad
+
+
+def bench(fn, repeat):
+    fn()
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", type=int, default=800, help="pixel rows mapped per section")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--report", nargs="*", default=None, help="HTML reports (default: one synthetic report)")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    sections = load_sections(args.report, args.points)
+    bad = check_parity(sections)
+    print(f"parity: {len(sections)} sections, {bad} mismatches")
+    if bad:
+        sys.exit(1)
+
+    axes = [TickAxis(frame) for _, frame, _ in sections]
+
+    def legacy():
+        for _, frame, px in sections:
+            legacy_map_y_from_ticks(px.copy(), frame, "value")
+            legacy_tick_groups(frame)
+
+    def build_and_map():
+        for _, frame, px in sections:
+            axis = TickAxis(frame)
+            map_y_from_ticks(px.copy(), axis, "value")
+            new_tick_groups(axis)
+
+    def map_only():
+        for (_, _, px), axis in zip(sections, axes):
+            map_y_from_ticks(px.copy(), axis, "value")
+            new_tick_groups(axis)
+
+    n = len(sections)
+    print(f"{'variant':<12}{'ms total':>10}{'us/section':>12}{'speedup':>9}")
+    base = None
+    for name, fn in (("legacy", legacy), ("build+map", build_and_map), ("map", map_only)):
+        elapsed = bench(fn, args.repeat)
+        base = base or elapsed
+        print(f"{name:<12}{elapsed * 1e3:>10.2f}{elapsed / n * 1e6:>12.1f}{base / elapsed:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
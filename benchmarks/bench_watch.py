@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""Watch-folder service (``Extract_all_charts.py watch``) fed with synthetic reports.
+
+``--reports`` synthetic reports (see :mod:`synthetic_report`, one orbit
+each) are dropped into a watched folder while :func:`watch_reports` runs in
+a thread, as a station would: every file is written in two halves
+``--write-gap`` seconds apart, so that a report processed before it has
+settled would fail to parse.  The script then checks:
+
+1. every report is processed exactly once, without failures, and
+   ``lock_state_stats.xlsx`` and the combined SNR plot cover all of them;
+   the throughput (reports/s from first drop to last result) is printed;
+   then one report is overwritten by a different pass: its statistics row
+   is replaced and the running ``sky_grid.npz`` equals a grid aggregated
+   from scratch over the series files;
+2. graceful shutdown: a second wave is dropped and the stop is requested as
+   soon as the first of it is queued; the service still processes the whole
+   wave before exiting, and the status file ends in ``stopped``;
+3. restart: with one report overwritten by a different pass, a new service
+   reprocesses only that report, reuses the others from the manifest, and
+   the statistics still have one row per orbit (the old rows are replaced).
+
+Exits with status 1 when a check fails.
+
+Usage::
+
+    python benchmarks/bench_watch.py [--reports 6] [--workers 2] [--points 400] [--settle 0.5]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+import synthetic_report  # noqa: E402
+from Extract_all_charts import load_cached_series, watch_reports  # noqa: E402
+from sky_grid import SkyGrid  # noqa: E402
+
+SKY_GRID_STEP = 5.0
+
+
+def drop(path, html, gap):
+    """Write ``html`` to ``path`` in two halves ``gap`` seconds apart."""
+    data = html.encode("utf-8")
+    half = len(data) // 2
+    with open(path, "wb") as f:
+        f.write(data[:half])
+        f.flush()
+        time.sleep(gap)
+        f.write(data[half:])
+
+
+def read_status(path):
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def wait_for(predicate, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+class Service:
+    """``watch_reports`` running in a thread until :meth:`stop`."""
+
+    def __init__(self, watch_dir, out_dir, args):
+        self.stop_event = threading.Event()
+        self.status_path = Path(out_dir) / "watch_status.json"
+        self.status_path.unlink(missing_ok=True)  # left by the previous run
+        self.result = None
+
+        def run():
+            self.result = watch_reports(
+                [watch_dir],
+                out_dir,
+                workers=args.workers,
+                stats_selectors=["demodulator_lock_state"],
+                plot_selectors=["snr"],
+                generate_combined_plots=True,
+                sky_grid_step=SKY_GRID_STEP,
+                stats_only=True,
+                poll_s=0.1,
+                settle_s=args.settle,
+                summary_interval_s=5.0,
+                stop_event=self.stop_event,
+            )
+
+        self.thread = threading.Thread(target=run, name="watch", daemon=True)
+        self.thread.start()
+
+    def status(self):
+        return read_status(self.status_path)
+
+    def stop(self, timeout=600):
+        self.stop_event.set()
+        self.thread.join(timeout)
+        return self.result
+
+
+def same_grid(path, out_dir):
+    """``sky_grid.npz`` equals the grid aggregated from the ``*_polar_series.npz`` files."""
+    got = SkyGrid.load(path)
+    ref = SkyGrid.from_series(load_cached_series([out_dir]).series_map().values(), az_step=SKY_GRID_STEP)
+    if got.layers.keys() != ref.layers.keys():
+        return False
+    for selector, layer in ref.layers.items():
+        for field, values in layer.items():
+            mine = got.layers[selector][field]
+            if not (np.allclose(mine, values) if field == "sum" else np.array_equal(mine, values)):
+                return False
+    return True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reports", type=int, default=6, help="reports per wave")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--points", type=int, default=400)
+    parser.add_argument("--sections", type=int, default=6)
+    parser.add_argument("--settle", type=float, default=0.5, help="debounce, s")
+    parser.add_argument("--write-gap", type=float, default=0.2, help="pause between the two halves of a file, s")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    failures = []
+
+    def check(ok, what):
+        print(f"  {'ok  ' if ok else 'FAIL'} {what}")
+        if not ok:
+            failures.append(what)
+
+    def report(i, seed=0):
+        return synthetic_report.generate_report(
+            sections=args.sections, points=args.points, orbit=9000 + i, seed=seed
+        )
+
+    def stats_orbits(out_dir):
+        stats = pd.read_excel(Path(out_dir) / "lock_state_stats.xlsx")
+        return sorted(str(v) for v in stats["Orbit Number"])
+
+    n = args.reports
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        watch_dir, out_dir = tmp / "incoming", tmp / "out"
+        watch_dir.mkdir()
+        htmls = [report(i) for i in range(2 * n)]
+
+        print(f"wave 1: {n} reports, {args.workers} worker(s), settle {args.settle:g} s")
+        service = Service(watch_dir, out_dir, args)
+        t0 = time.perf_counter()
+        for i in range(n):
+            drop(watch_dir / f"pass_{i:03d}.html", htmls[i], args.write_gap)
+        done = wait_for(lambda: service.status().get("processed", 0) + service.status().get("failed", 0) >= n, 600)
+        elapsed = time.perf_counter() - t0
+        status = service.status()
+        check(done and status.get("failed") == 0, f"{status.get('processed')} processed, {status.get('failed')} failed")
+        print(f"  {n / elapsed:.2f} reports/s ({elapsed:.1f} s including {args.settle:g} s settle); "
+              f"status reports_per_hour={status.get('reports_per_hour')}, mean_report_s={status.get('mean_report_s')}")
+        check(
+            wait_for(lambda: (out_dir / "lock_state_stats.xlsx").exists() and len(stats_orbits(out_dir)) == n, 60),
+            "lock_state_stats.xlsx has a row per report",
+        )
+        check(any(out_dir.glob("combined_*_polar.png")), "combined SNR plot written")
+
+        print("one report overwritten while running")
+        drop(watch_dir / "pass_001.html", report(1, seed=2), 0)
+        check(wait_for(lambda: service.status().get("processed", 0) >= n + 1, 600), "overwritten report processed")
+        check(len(stats_orbits(out_dir)) == n, "its statistics row is replaced")
+        check(same_grid(out_dir / "sky_grid.npz", out_dir), "running sky grid equals one aggregated from scratch")
+
+        print(f"wave 2: {n} reports, stop requested while queued")
+        for i in range(n, 2 * n):
+            drop(watch_dir / f"pass_{i:03d}.html", htmls[i], 0)
+        wait_for(lambda: service.status().get("queue_depth", 0) + service.status().get("in_flight", 0) > 0, 60)
+        status = service.stop()
+        check(
+            status is not None and status["processed"] == 2 * n + 1,
+            f"drained: {status and status['processed']} processed",
+        )
+        check(service.status().get("state") == "stopped", "status file ends in 'stopped'")
+        check(len(stats_orbits(out_dir)) == 2 * n, "statistics cover both waves")
+
+        print("restart with one report overwritten")
+        (watch_dir / "pass_000.html").write_text(report(0, seed=1), encoding="utf-8")
+        service = Service(watch_dir, out_dir, args)
+        wait_for(lambda: service.status().get("processed", 0) + service.status().get("skipped", 0) >= 2 * n, 600)
+        status = service.stop()
+        check(
+            status["processed"] == 1 and status["skipped"] == 2 * n - 1,
+            f"{status['processed']} reprocessed, {status['skipped']} reused from the manifest",
+        )
+        check(stats_orbits(out_dir) == sorted(str(9000 + i) for i in range(2 * n)), "one statistics row per orbit")
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""Generate synthetic MEOS-style HTML reports for benchmarks.
+
+The reports mimic the Asciidoctor/gnuplot layout of
+``web_report_AWS-PFM_8297_meos8_lan.html``: a Session table (satellite,
+orbit, start/stop times), ``sect1``/``sect2`` blocks with h2/h3 headers and
+one gnuplot SVG per chart section, with tick labels placed by
+``translate(...)`` groups and curves as ``gnuplot_plot_N`` paths (legend
+sample first, then the data in lines of six points).
+
+Configurable: number of metric sections, points per curve, the Antenna
+section (polar sky track plus the dual-axis azimuth/elevation chart), the
+Demodulator Lock State chart and how many charts are embedded as base64
+``<object type="image/svg+xml">`` instead of inline ``<svg>``.  Curves are
+deterministic for a given ``seed``.
+
+Usage::
+
+    python benchmarks/synthetic_report.py out.html [--sections 12] [--points 800]
+        [--object-svgs 2] [--no-antenna] [--no-lock-state] [--seed 0]
+"""
+from __future__ import annotations
+
+import argparse
+import base64
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+# Metric sections of a real channel block, reused cyclically (then numbered).
+METRIC_SECTIONS = (
+    ("Input Level", "inputLevel", "dBm", (-80.0, -20.0)),
+    ("Signal/Noise Ratio", "snRatio", "dB", (0.0, 50.0)),
+    ("Carrier Offset", "carrierOffset", "Hz", (-2000.0, 2000.0)),
+    ("Eb/N0", "ebN0", "dB", (0.0, 40.0)),
+    ("Phase Loop Error", "phaseError", "deg", (0.0, 20.0)),
+    ("Reed-Solomon Frames", "rsFrames", "", (0.0, 5000.0)),
+    ("Frame Error Rate", "frameErrorRate", "", (0.0, 1.0)),
+    ("CPU Utilization", "cpu", "%", (0.0, 100.0)),
+)
+
+PURPLE = "rgb(148,   0, 211)"
+GREEN = "rgb(  0, 158, 115)"
+_GROUP = '<g fill="none" color="black" stroke="currentColor" stroke-width="{w}" stroke-linecap="butt" stroke-linejoin="miter">'
+
+
+class _Frame:
+    """Plot box of a gnuplot chart in SVG pixels."""
+
+    def __init__(self, width=1200, height=600, left=72.53, right=1114.87, top=18.01, bottom_margin=57.6):
+        self.width = width
+        self.height = height
+        self.left = left
+        self.right = right
+        self.top = top
+        self.bottom = height - bottom_margin
+
+    def x(self, frac):
+        return self.left + np.asarray(frac, dtype=float) * (self.right - self.left)
+
+    def y(self, values, lo, hi):
+        return self.bottom - (np.asarray(values, dtype=float) - lo) / (hi - lo) * (self.bottom - self.top)
+
+
+def _text(x, y, text, anchor="middle"):
+    return (
+        f'\t<g transform="translate({x:.2f},{y:.2f})" stroke="none" fill="black" font-family="arial" '
+        f'font-size="12.00"  text-anchor="{anchor}">\n\t\t<text>{text}</text>\n\t</g>\n'
+    )
+
+
+def _path_d(xs, ys, legend=None):
+    """gnuplot-style ``d`` attribute: optional legend sample, then six points per line."""
+    coords = [f"{x:.2f},{y:.2f}" for x, y in zip(xs, ys)]
+    lines = []
+    for i in range(0, len(coords), 6):
+        chunk = coords[i:i + 6]
+        prefix = "M" if i == 0 else "L"
+        lines.append(f"{prefix}{chunk[0]} " + " ".join(f"L{c}" for c in chunk[1:]))
+    body = "\n\t\t".join(lines)
+    if legend is not None:
+        (x0, y0), (x1, y1) = legend
+        body = f"M{x0:.2f},{y0:.2f} L{x1:.2f},{y1:.2f} " + body
+    return body + "  "
+
+
+def _svg_open(frame):
+    return (
+        f'<svg\n viewBox="0 0 {frame.width} {frame.height}"\n xmlns="http://www.w3.org/2000/svg"\n'
+        ' xmlns:xlink="http://www.w3.org/1999/xlink"\n>\n\n<title>Gnuplot</title>\n'
+        '<desc>Produced by GNUPLOT 6.0 patchlevel 1 </desc>\n\n<g id="gnuplot_canvas">\n\n'
+        f'<rect x="0" y="0" width="{frame.width}" height="{frame.height}" fill="none"/>\n'
+    )
+
+
+def _svg_close(frame, y_label=None, y2_label=None):
+    out = [_GROUP.format(w="0.20") + "\n"]
+    out.append(
+        f"\t<path stroke='black'  d='M{frame.left:.2f},{frame.top:.2f} L{frame.left:.2f},{frame.bottom:.2f} "
+        f"L{frame.right:.2f},{frame.bottom:.2f} L{frame.right:.2f},{frame.top:.2f} Z  '/>"
+    )
+    if y_label:
+        out.append(_text(19.18, (frame.top + frame.bottom) / 2, y_label))
+    if y2_label:
+        out.append(_text(frame.width - 30.28, (frame.top + frame.bottom) / 2, y2_label))
+    out.append("</g>\n")
+    out.append(_text(frame.width / 2, frame.height - 8.7, "Time"))
+    out.append("</g>\n</svg>\n")
+    return "".join(out)
+
+
+def _y_ticks(frame, lo, hi, count, side="left"):
+    out = []
+    x = frame.left - 8.39 if side == "left" else frame.right + 8.39
+    anchor = "end" if side == "left" else "start"
+    for v in np.linspace(lo, hi, count):
+        y = float(frame.y(v, lo, hi))
+        out.append(_GROUP.format(w="0.20") + "\n")
+        out.append(f"\t<path stroke='black'  d='M{frame.left:.2f},{y:.2f} L{frame.left + 9:.2f},{y:.2f}  '/>")
+        out.append(_text(x, y + 3.9, f" {v:g}", anchor))
+        out.append("</g>\n")
+    return "".join(out)
+
+
+def _time_ticks(frame, start, stop):
+    out = []
+    first = start.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    total = (stop - start).total_seconds()
+    t = first
+    while t <= stop:
+        frac = (t - start).total_seconds() / total
+        out.append(_GROUP.format(w="0.20") + "\n")
+        out.append(_text(float(frame.x(frac)), frame.bottom + 21.9, t.strftime("%H:%M")))
+        out.append("</g>\n")
+        t += timedelta(minutes=1)
+    return "".join(out)
+
+
+def _series(index, label, color, xs, ys, frame, legend_row=0):
+    ly = 36.01 + 18.0 * legend_row
+    legend = ((frame.right - 59.34, ly), (frame.right - 16.78, ly))
+    return (
+        f'\t<g id="gnuplot_plot_{index}"  fill="none"><title>gnuplot_plot_{index}</title>\n'
+        + _GROUP.format(w="2.00") + "\n" + _text(frame.right - 67.73, ly + 3.9, label, "end") + "</g>\n"
+        + _GROUP.format(w="2.00") + "\n"
+        + f"\t<path stroke='{color}'  d='{_path_d(xs, ys, legend)}'/></g>\n\t</g>\n"
+    )
+
+
+def metric_chart(rng, points, start, stop, label, unit, value_range):
+    """Single-curve chart (e.g. SNR): noisy bell-shaped pass profile."""
+    frame = _Frame()
+    lo, hi = value_range
+    t = np.linspace(0.0, 1.0, points)
+    profile = np.sin(np.pi * t) ** 1.5
+    values = lo + (hi - lo) * (0.15 + 0.7 * profile) + rng.normal(0.0, 0.02 * (hi - lo), points)
+    values = np.clip(values, lo, hi)
+    return (
+        _svg_open(frame)
+        + _y_ticks(frame, lo, hi, 6)
+        + _time_ticks(frame, start, stop)
+        + _series(1, label, PURPLE, frame.x(t), frame.y(values, lo, hi), frame)
+        + _svg_close(frame, unit)
+    )
+
+
+def lock_state_chart(rng, points, start, stop, unlocks=2):
+    """Two-level lock chart with ``unlocked``/``locked`` state ticks and a few drop-outs."""
+    frame = _Frame(height=200, left=88.09, right=1174.82, top=32.28, bottom_margin=64.07)
+    t = np.linspace(0.0, 1.0, points)
+    state = np.ones(points)
+    state[: max(1, points // 50)] = 0.0
+    for _ in range(unlocks):
+        at = int(rng.integers(points // 10, max(points // 10 + 1, points - points // 10)))
+        state[at:at + max(1, points // 100)] = 0.0
+    ticks = (
+        _GROUP.format(w="0.20") + "\n" + _text(frame.left - 8.39, frame.bottom + 3.9, "unlocked", "end") + "</g>\n"
+        + _GROUP.format(w="0.20") + "\n" + _text(frame.left - 8.39, frame.top, "locked", "end") + "</g>\n"
+    )
+    return (
+        _svg_open(frame)
+        + ticks
+        + _time_ticks(frame, start, stop)
+        + _series(1, "demodLock", PURPLE, frame.x(t), frame.y(state, 0.0, 1.0), frame)
+        + _svg_close(frame)
+    )
+
+
+def antenna_track(points, rng):
+    """Azimuth/elevation of a pass: monotonic azimuth, bell-shaped elevation."""
+    t = np.linspace(0.0, 1.0, points)
+    az0 = float(rng.uniform(20.0, 120.0))
+    az = az0 + 160.0 * t
+    el = 2.0 + float(rng.uniform(40.0, 80.0)) * np.sin(np.pi * t)
+    return az, el
+
+
+def antenna_polar_chart(az, el):
+    """Polar sky view (N/E/S/W, radial elevation ticks) with the pass track."""
+    frame = _Frame(width=600, height=600, left=31.69, right=568.30, top=34.0, bottom_margin=34.0)
+    cx, cy, radius = 300.0, 303.0, 268.3
+    out = [_svg_open(frame)]
+    for i, v in enumerate(range(0, 90, 20)):
+        x = cx + radius * (1.0 - v / 90.0)
+        out.append(_GROUP.format(w="1.00") + "\n")
+        out.append(f"\t<path stroke='black'  d='M{x:.2f},{cy:.2f} L{x:.2f},{cy - 9:.2f}  '/>")
+        out.append(_text(x, cy + 21.9, f" {v}"))
+        out.append("</g>\n")
+    for letter, (x, y) in {"N": (cx, 25.54), "E": (595.12, 306.9), "S": (cx, 588.27), "W": (4.87, 306.9)}.items():
+        out.append(_GROUP.format(w="1.00") + "\n" + _text(x, y, letter) + "</g>\n")
+    r = radius * (1.0 - el / 90.0)
+    theta = np.deg2rad(az)
+    xs, ys = cx + r * np.sin(theta), cy - r * np.cos(theta)
+    out.append('\t<g id="gnuplot_plot_1a"  fill="none"><title>gnuplot_plot_1a</title>\n')
+    out.append(_GROUP.format(w="1.00") + f"\n\t<path stroke='{PURPLE}'  d='{_path_d(xs, ys)}'/></g>\n\t</g>\n")
+    out.append("</g>\n</svg>\n")
+    return "".join(out)
+
+
+def antenna_time_chart(az, el, start, stop):
+    """Dual-axis chart: azimuth on the left axis (0..360), elevation on the right (0..90)."""
+    frame = _Frame(height=400)
+    t = np.linspace(0.0, 1.0, len(az))
+    xs = frame.x(t)
+    return (
+        _svg_open(frame)
+        + _y_ticks(frame, 0.0, 360.0, 19, "left")
+        + _time_ticks(frame, start, stop)
+        + _y_ticks(frame, 0.0, 90.0, 10, "right")
+        + _series(1, "azPosition", PURPLE, xs, frame.y(az, 0.0, 360.0), frame, 0)
+        + _series(2, "elPosition", GREEN, xs, frame.y(el, 0.0, 90.0), frame, 1)
+        + _svg_close(frame, "azimuth deg", "elevation deg")
+    )
+
+
+def _embed(svg, as_object):
+    if not as_object:
+        return svg
+    data = base64.b64encode(('<?xml version="1.0" encoding="utf-8"?>\n' + svg).encode("utf-8")).decode("ascii")
+    return f'<object type="image/svg+xml" data="data:image/svg+xml;base64,{data}"></object>\n'
+
+
+def _sect2(anchor, title, charts, source="MEOS.CHANNEL_1.HRDR"):
+    blocks = "".join(f'<div class="imageblock">\n<div class="content">\n{c}\n</div>\n</div>\n' for c in charts)
+    return (
+        f'<div class="sect2">\n<h3 id="{anchor}">{title}</h3>\n<div class="paragraph">\n'
+        f'<p><span class="small">{source}</span></p>\n</div>\n{blocks}</div>\n'
+    )
+
+
+def _session(prefix, orbit, start, stop):
+    rows = [
+        ("System hostname", "synthetic"),
+        ("Satellite name", prefix),
+        ("Orbit number", str(orbit)),
+        ("Start time", start.strftime("%Y-%m-%d %H:%M:%SZ")),
+        ("Stop time", stop.strftime("%Y-%m-%d %H:%M:%SZ")),
+        ("Report creation time", (stop + timedelta(seconds=16)).strftime("%Y-%m-%d %H:%M:%SZ")),
+    ]
+    cells = "".join(
+        f'<tr>\n<td class="tableblock halign-left valign-top"><p class="tableblock">{k}</p></td>\n'
+        f'<td class="tableblock halign-left valign-top"><div class="content"><div class="paragraph">\n'
+        f"<p>{v}</p>\n</div></div></td>\n</tr>\n"
+        for k, v in rows
+    )
+    return (
+        '<div class="sect1">\n<h2 id="_session">1. Session</h2>\n<div class="sectionbody">\n'
+        f'<table class="tableblock frame-all grid-all stretch">\n<tbody>\n{cells}</tbody>\n</table>\n</div>\n</div>\n'
+    )
+
+
+def generate_report(
+    sections=12,
+    points=800,
+    antenna=True,
+    lock_state=True,
+    object_svgs=0,
+    seed=0,
+    prefix="SYN-PFM",
+    orbit=9000,
+    start=datetime(2026, 2, 24, 12, 56, 1),
+    duration_s=410,
+):
+    """Return the HTML text of a synthetic report.
+
+    Parameters
+    ----------
+    sections : int
+        Metric chart sections in the channel block (names cycle through
+        :data:`METRIC_SECTIONS`).
+    points : int
+        Samples per curve (every chart, including the antenna ones).
+    antenna, lock_state : bool
+        Add the Antenna section (polar + dual-axis chart) and the Demodulator
+        Lock State chart.
+    object_svgs : int
+        Number of charts (in document order) embedded as base64 ``<object>``.
+    """
+    rng = np.random.default_rng(seed)
+    stop = start + timedelta(seconds=duration_s)
+    remaining_objects = [object_svgs]
+
+    def embed(svg):
+        as_object = remaining_objects[0] > 0
+        remaining_objects[0] -= as_object
+        return _embed(svg, as_object)
+
+    channel = []
+    n = 0
+    for i in range(sections):
+        title, label, unit, value_range = METRIC_SECTIONS[i % len(METRIC_SECTIONS)]
+        if i >= len(METRIC_SECTIONS):
+            title = f"{title} {i // len(METRIC_SECTIONS) + 1}"
+        n += 1
+        svg = metric_chart(rng, points, start, stop, label, unit, value_range)
+        channel.append(_sect2(f"_s5_{n}", f"5.{n}. {title}", [embed(svg)]))
+    if lock_state:
+        n += 1
+        channel.append(_sect2(f"_s5_{n}", f"5.{n}. Demodulator Lock State", [embed(lock_state_chart(rng, points, start, stop))]))
+
+    common = []
+    if antenna:
+        az, el = antenna_track(points, rng)
+        charts = [embed(antenna_polar_chart(az, el)), embed(antenna_time_chart(az, el, start, stop))]
+        common.append(_sect2("_antenna", "6.1. Antenna", charts, "MEOS.ANTENNA.ORBITAL"))
+
+    body = [_session(prefix, orbit, start, stop)]
+    body.append(
+        '<div class="sect1">\n<h2 id="_channel_1_2">5. Channel 1</h2>\n<div class="sectionbody">\n'
+        + "".join(channel) + "</div>\n</div>\n"
+    )
+    if common:
+        body.append(
+            '<div class="sect1">\n<h2 id="_common">6. Common</h2>\n<div class="sectionbody">\n'
+            + "".join(common) + "</div>\n</div>\n"
+        )
+    return (
+        '<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="UTF-8">\n'
+        f"<title>{prefix} orbit {orbit}</title>\n</head>\n<body>\n"
+        '<div id="content">\n' + "".join(body) + "</div>\n</body>\n</html>\n"
+    )
+
+
+def write_report(path, **kwargs):
+    """Write :func:`generate_report` output to ``path`` and return it as a :class:`Path`."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(generate_report(**kwargs), encoding="utf-8")
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output", type=Path)
+    parser.add_argument("--sections", type=int, default=12)
+    parser.add_argument("--points", type=int, default=800)
+    parser.add_argument("--object-svgs", type=int, default=0)
+    parser.add_argument("--no-antenna", dest="antenna", action="store_false")
+    parser.add_argument("--no-lock-state", dest="lock_state", action="store_false")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--orbit", type=int, default=9000)
+    args = parser.parse_args()
+    path = write_report(
+        args.output,
+        sections=args.sections,
+        points=args.points,
+        antenna=args.antenna,
+        lock_state=args.lock_state,
+        object_svgs=args.object_svgs,
+        seed=args.seed,
+        orbit=args.orbit,
+    )
+    print(f"{path} ({path.stat().st_size / 1e6:.2f} MB)")
+
+
+if __name__ == "__main__":
+    main()
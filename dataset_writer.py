@@ -0,0 +1,141 @@
+"""Columnar (Parquet / Feather) output of the extracted sections.
+
+Every report becomes one long-format file with a row per extracted sample::
+
+    section | t_sec_rel | time | value | x_px | y_px
+
+written under a Hive-style partition tree, e.g.::
+
+    <output>/parquet/prefix=AWS-PFM/orbit=8297/AWS-PFM_orbit_8297.parquet
+
+so that a whole fleet of passes can be scanned as a single dataset with
+partition pruning and predicate pushdown (``prefix`` and ``orbit`` become
+columns of the dataset, see :func:`read_dataset`).  The ``__meta__`` sheet
+of the Excel output (start/stop/report time) is stored as JSON in the file's
+schema metadata under the ``meos_meta`` key.
+
+Requires ``pyarrow``.
+"""
+
+import json
+import logging
+from pathlib import Path
+
+
+logger = logging.getLogger(__name__)
+
+DATASET_FORMATS = ("parquet", "feather")
+OUTPUT_FORMATS = ("xlsx",) + DATASET_FORMATS
+META_KEY = b"meos_meta"
+LONG_COLUMNS = ["section", "t_sec_rel", "time", "value", "x_px", "y_px"]
+_UNKNOWN = "unknown"
+
+
+def parse_formats(formats):
+    """Normalize ``"xlsx,parquet"`` (or an iterable of names) to a tuple of output formats."""
+    if isinstance(formats, str):
+        formats = formats.split(",")
+    out = []
+    for name in formats:
+        name = name.strip().lower()
+        if name == "arrow":
+            name = "feather"
+        if not name:
+            continue
+        if name not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format: {name!r} (expected any of {OUTPUT_FORMATS})")
+        if name not in out:
+            out.append(name)
+    if not out:
+        raise ValueError("At least one output format is required")
+    return tuple(out)
+
+
+def partition_dir(root, fmt, prefix, orbit_no):
+    """Directory of the ``prefix=/orbit=`` partition for one report."""
+    return Path(root) / fmt / f"prefix={prefix or _UNKNOWN}" / f"orbit={orbit_no or _UNKNOWN}"
+
+
+def write_report_dataset(root, fmt, base, frame, meta, prefix=None, orbit_no=None):
+    """Write the long-format ``frame`` of one report as ``fmt`` under ``root``.
+
+    Parameters
+    ----------
+    root : Path
+        Output directory; the dataset lives in ``root/<fmt>/``.
+    fmt : str
+        ``"parquet"`` or ``"feather"``.
+    base : str
+        File name stem (same as the Excel file).
+    frame : pandas.DataFrame
+        Rows with :data:`LONG_COLUMNS`.
+    meta : dict
+        JSON-serializable report metadata stored in the schema metadata.
+
+    Returns
+    -------
+    Path or None
+        Path of the written file, ``None`` if pyarrow is not installed.
+    """
+    if fmt not in DATASET_FORMATS:
+        raise ValueError(f"Unknown dataset format: {fmt!r} (expected one of {DATASET_FORMATS})")
+    try:
+        import pyarrow as pa
+    except ImportError:
+        logger.warning("pyarrow not available: skipping %s output", fmt)
+        return None
+
+    table = pa.Table.from_pandas(frame[LONG_COLUMNS], preserve_index=False)
+    schema_meta = dict(table.schema.metadata or {})
+    schema_meta[META_KEY] = json.dumps(
+        {**meta, "prefix": prefix, "orbit_no": orbit_no}, default=str
+    ).encode("utf-8")
+    table = table.replace_schema_metadata(schema_meta)
+
+    out_dir = partition_dir(root, fmt, prefix, orbit_no)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        path = out_dir / f"{base}.parquet"
+        pq.write_table(table, path, compression="zstd")
+    else:
+        import pyarrow.feather as feather
+
+        path = out_dir / f"{base}.feather"
+        feather.write_feather(table, path, compression="zstd")
+    return path
+
+
+def read_report_meta(path):
+    """Return the ``__meta__`` dict stored in a Parquet/Feather report file."""
+    path = Path(path)
+    if path.suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        schema = pq.read_schema(path)
+    else:
+        import pyarrow.ipc as ipc
+
+        with ipc.open_file(path) as reader:
+            schema = reader.schema
+    raw = (schema.metadata or {}).get(META_KEY)
+    return json.loads(raw) if raw else {}
+
+
+def read_dataset(root, fmt="parquet", filter=None, columns=None):
+    """Scan ``root/<fmt>`` as one dataset and return a pandas DataFrame.
+
+    ``filter`` is a ``pyarrow.dataset`` expression, e.g.
+    ``(ds.field("orbit") >= 8200) & (ds.field("section") == "5_8_input_level")``;
+    partition keys are pruned before any file is opened and the remaining
+    predicates are pushed down to the row groups.
+    """
+    import pyarrow.dataset as ds
+
+    dataset = ds.dataset(
+        Path(root) / fmt,
+        format="parquet" if fmt == "parquet" else "ipc",
+        partitioning="hive",
+    )
+    return dataset.to_table(filter=filter, columns=columns).to_pandas()
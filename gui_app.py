@@ -8,16 +8,27 @@ folders and buttons) while the lower pane shows a live log of the operations
 performed. Each button is wired to a callback that performs the associated
 action and records messages through :mod:`logging`, which are displayed both
 on the console and inside the GUI.
+
+The batch runs on a background thread so that the window stays responsive.
+Progress events and log records are put on queues that the Tk main loop
+drains every :data:`POLL_MS` milliseconds through ``root.after``; widgets are
+only ever touched from the main thread.
 """
 
 from pathlib import Path
-from tkinter import Tk, Listbox, filedialog, StringVar, Text, PanedWindow, BooleanVar
+from tkinter import Tk, Listbox, filedialog, StringVar, Text, PanedWindow, BooleanVar, IntVar
 from tkinter import ttk
 import logging
+import multiprocessing
+import os
+import queue
+import threading
+
+from Extract_all_charts import process_many, write_batch_summaries
+from report_discovery import iter_reports
 
-from Extract_all_charts import process_html, generate_combined_polar_plot_artifacts
-import pandas as pd
 
+POLL_MS = 100
 
 LOG_PATH = Path(__file__).resolve().with_name("gui_app.log")
 LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
@@ -35,20 +46,43 @@ logging.basicConfig(
 
 
 class TextHandler(logging.Handler):
-    """Send logging records to a ``tkinter.Text`` widget."""
+    """Send logging records to a ``tkinter.Text`` widget.
+
+    Records may come from any thread: they are queued by :meth:`emit` and
+    written to the widget by :meth:`flush_to_widget` on the Tk main thread.
+    """
 
     def __init__(self, widget):
         super().__init__()
         self.widget = widget
-
-    def emit(self, record):  # pragma: no cover - UI side effect
-        msg = self.format(record)
+        self.pending = queue.Queue()
+
+    def emit(self, record):
+        self.pending.put(self.format(record))
+
+    def flush_to_widget(self):  # pragma: no cover - UI side effect
+        lines = []
+        while True:
+            try:
+                lines.append(self.pending.get_nowait())
+            except queue.Empty:
+                break
+        if not lines:
+            return
         self.widget.configure(state="normal")
-        self.widget.insert("end", msg + "\n")
+        self.widget.insert("end", "\n".join(lines) + "\n")
         self.widget.configure(state="disabled")
         self.widget.see("end")
 
 
+def format_eta(seconds):
+    """Format a number of seconds as ``m:ss`` (or ``h:mm:ss``)."""
+    seconds = int(round(seconds))
+    h, rem = divmod(seconds, 3600)
+    m, s = divmod(rem, 60)
+    return f"{h}:{m:02d}:{s:02d}" if h else f"{m}:{s:02d}"
+
+
 def main():
     # License validation removed
 
@@ -128,6 +162,24 @@ def main():
     ttk.Label(plot_mode_frame, text="Plot output:", style="Caption.TLabel").pack(side="left", padx=(0, 8))
     ttk.Checkbutton(plot_mode_frame, text="one set per file", variable=make_individual_plots_var).pack(side="left", padx=5)
     ttk.Checkbutton(plot_mode_frame, text="one combined set for all files", variable=make_combined_plots_var).pack(side="left", padx=5)
+    # Number of worker processes used to extract reports in parallel
+    workers_var = IntVar(value=1)
+    ttk.Label(plot_mode_frame, text="Workers:", style="Caption.TLabel").pack(side="left", padx=(16, 4))
+    ttk.Spinbox(
+        plot_mode_frame, from_=1, to=os.cpu_count() or 1, textvariable=workers_var, width=4
+    ).pack(side="left")
+    # Processes rendering the per-report plots while the next reports are extracted (0 = inline)
+    plot_workers_var = IntVar(value=0)
+    ttk.Label(plot_mode_frame, text="Plot workers:", style="Caption.TLabel").pack(side="left", padx=(16, 4))
+    ttk.Spinbox(
+        plot_mode_frame, from_=0, to=os.cpu_count() or 1, textvariable=plot_workers_var, width=4
+    ).pack(side="left")
+    # Reports unchanged since the last run are skipped unless forced
+    force_var = BooleanVar(value=False)
+    ttk.Checkbutton(plot_mode_frame, text="Force reprocess", variable=force_var).pack(side="left", padx=(16, 5))
+    # Only extract what the selected statistics/plots need, without writing Excel files
+    stats_only_var = BooleanVar(value=False)
+    ttk.Checkbutton(plot_mode_frame, text="Stats only (no Excel)", variable=stats_only_var).pack(side="left", padx=5)
 
     # Button bar uses ``pack`` inside its own frame; mixing layout managers
     # within one container is problematic, but separate frames may use
@@ -135,6 +187,15 @@ def main():
     btn_frame = ttk.Frame(main_frame)
     btn_frame.grid(row=7, column=0, sticky="ew", padx=5, pady=5)
 
+    # Progress bar (reports done / total) and current activity
+    progress_frame = ttk.Frame(main_frame)
+    progress_frame.grid(row=8, column=0, sticky="ew", padx=5, pady=(0, 5))
+    progress_frame.grid_columnconfigure(0, weight=1)
+    progress_bar = ttk.Progressbar(progress_frame, orient="horizontal", mode="determinate")
+    progress_bar.grid(row=0, column=0, sticky="ew")
+    status_var = StringVar(value="Idle")
+    ttk.Label(progress_frame, textvariable=status_var, width=40).grid(row=0, column=1, sticky="w", padx=(8, 0))
+
     # --- Lower pane: log output -----------------------------------------
     log_frame = ttk.Frame(paned)
     paned.add(log_frame, minsize=80)
@@ -159,6 +220,9 @@ def main():
 
     # ``output_dir`` is stored in a dict so inner callbacks can mutate it
     output_dir = {"path": None}
+    # Background batch: worker thread, its cancel flag and its event queue
+    job = {"thread": None, "cancel": None}
+    events = queue.Queue()
 
     # --- Callback functions ---------------------------------------------
     def add_folder():
@@ -183,7 +247,7 @@ def main():
             output_var.set(folder)
 
     def run():
-        """Process each queued folder and log progress to the GUI."""
+        """Start processing the queued folders on a background thread."""
         if output_dir["path"] is None:
             logging.warning("Output directory not selected")
             return
@@ -200,60 +264,151 @@ def main():
         if plot_snr.get():
             selected_plots.append("snr")
 
-        saved = []
-        stats_rows = []
-        plot_rows = []
-        plot_series_rows = []
         make_individual_plots = make_individual_plots_var.get()
         make_combined_plots = make_combined_plots_var.get()
         if selected_plots and not (make_individual_plots or make_combined_plots):
             logging.warning("Select at least one plot output mode (per-file and/or combined)")
             return
-        for i in range(listbox.size()):
-            folder = Path(listbox.get(i))
-            html_files = sorted(folder.glob("*.html"))
-            if not html_files:
-                logging.warning("No HTML file in %s", folder)
-                continue
-            for report in html_files:
-                try:
-                    out = process_html(
-                        report,
-                        output_dir["path"],
-                        stats_selectors=selected_stats,
-                        stats_rows=stats_rows,
-                        plot_selectors=selected_plots,
-                        plot_rows=plot_rows,
-                        plot_series_rows=plot_series_rows,
-                        generate_individual_plots=make_individual_plots,
-                    )
-                    logging.info("Saved: %s", out)
-                    saved.append(out)
-                except Exception:
-                    logging.exception("Error processing %s", report)
-                    return
-
-        if selected_stats:
-            stats_path = output_dir["path"] / "lock_state_stats.xlsx"
-            if stats_rows:
-                pd.DataFrame(stats_rows, columns=["Orbit Number", "Unlocks"]).to_excel(stats_path, index=False)
-            else:
-                pd.DataFrame([{"Orbit Number": "N/A", "Unlocks": 0}]).to_excel(stats_path, index=False)
-            logging.info("Saved statistics: %s", stats_path)
-
-        if selected_plots:
-            if make_combined_plots:
-                plot_rows.extend(
-                    generate_combined_polar_plot_artifacts(output_dir["path"], plot_series_rows, selected_plots)
-                )
-            plot_index = output_dir["path"] / "polar_plots_index.xlsx"
-            if plot_rows:
-                pd.DataFrame(plot_rows).to_excel(plot_index, index=False)
-                logging.info("Saved polar plot index: %s", plot_index)
+        folders = [Path(listbox.get(i)) for i in range(listbox.size())]
+        if not folders:
+            logging.warning("No input folder queued")
+            return
+        # Reports are discovered recursively on the worker thread and fed to
+        # the batch as they are found.
+        reports = iter_reports(folders, exclude_dirs=[output_dir["path"]])
+
+        try:
+            workers = max(1, workers_var.get())
+        except Exception:  # non-numeric text typed in the spinbox
+            workers = 1
+        try:
+            plot_workers = max(0, plot_workers_var.get())
+        except Exception:
+            plot_workers = 0
+        cancel = threading.Event()
+        job["cancel"] = cancel
+        job["thread"] = threading.Thread(
+            target=run_batch,
+            args=(reports, output_dir["path"], cancel),
+            kwargs={
+                "workers": workers,
+                "plot_workers": plot_workers,
+                "selected_stats": selected_stats,
+                "selected_plots": selected_plots,
+                "make_individual_plots": make_individual_plots,
+                "make_combined_plots": make_combined_plots,
+                "force": force_var.get(),
+                "stats_only": stats_only_var.get(),
+            },
+            name="meos-batch",
+            daemon=True,
+        )
+        # Indeterminate until discovery has finished and the total is known
+        progress_bar.configure(mode="indeterminate", value=0)
+        progress_bar.start(50)
+        status_var.set("Scanning folders...")
+        btn_run.configure(state="disabled")
+        btn_cancel.configure(state="normal")
+        job["thread"].start()
+
+    def run_batch(reports, out_dir, cancel, workers, plot_workers, selected_stats, selected_plots,
+                  make_individual_plots, make_combined_plots, force, stats_only):
+        """Worker thread body: process the reports and write the batch outputs."""
+        batch = None
+        try:
+            batch = process_many(
+                reports,
+                out_dir,
+                workers=workers,
+                plot_workers=plot_workers,
+                stats_selectors=selected_stats,
+                plot_selectors=selected_plots,
+                generate_individual_plots=make_individual_plots,
+                force=force,
+                stats_only=stats_only,
+                progress=events.put,
+                cancel_event=cancel,
+            )
+            write_batch_summaries(
+                out_dir,
+                batch,
+                stats_selectors=selected_stats,
+                plot_selectors=selected_plots,
+                generate_combined_plots=make_combined_plots,
+            )
+        except Exception:
+            logging.exception("Batch aborted")
+        finally:
+            events.put({"event": "finished", "batch": batch})
+
+    def handle_event(event):
+        """Update progress bar and status line from one batch event."""
+        kind = event["event"]
+        name = Path(event.get("path", "")).name
+        total = event.get("total")
+        if total is not None and str(progress_bar.cget("mode")) == "indeterminate":
+            progress_bar.stop()
+            progress_bar.configure(mode="determinate", maximum=max(total, 1))
+        of_total = f"/{total}" if total is not None else ""
+        if kind == "report_started":
+            status_var.set(f"{event['done']}{of_total} - {name}")
+        elif kind == "section_extracted":
+            status_var.set(f"{name}: {event['section']}")
+        elif kind in ("report_done", "report_skipped", "report_failed"):
+            if total is not None:
+                progress_bar.configure(value=event["done"])
+            eta = f", ETA {format_eta(event['eta_s'])}" if event["eta_s"] and event["done"] < total else ""
+            status_var.set(f"{event['done']}{of_total} reports{eta}")
+        elif kind == "finished":
+            finish(event["batch"])
+
+    def poll():
+        """Drain log records and batch events, then reschedule itself."""
+        text_handler.flush_to_widget()
+        while True:
+            try:
+                event = events.get_nowait()
+            except queue.Empty:
+                break
+            handle_event(event)
+        root.after(POLL_MS, poll)
+
+    def finish(batch):
+        """Called on the main thread once the worker thread is done."""
+        job["thread"] = None
+        progress_bar.stop()
+        progress_bar.configure(mode="determinate")
+        btn_run.configure(state="normal")
+        btn_cancel.configure(state="disabled")
+        if batch is None:
+            status_var.set("Failed (see log)")
+        else:
+            if not (batch["saved"] or batch["skipped"] or batch["failed"] or batch["cancelled"]):
+                logging.warning("No HTML report found in the queued folders")
+            if batch["failed"]:
+                logging.warning("Failed reports: %d (see log for details)", len(batch["failed"]))
+            logging.info(
+                "Completed: created %d files, %d unchanged reports skipped",
+                len(batch["saved"]),
+                len(batch["skipped"]),
+            )
+            if batch["cancelled"]:
+                status_var.set(f"Cancelled ({len(batch['cancelled'])} reports not processed)")
             else:
-                logging.warning("Polar plots requested, but none were generated. Check detailed warnings in log for matching/metric diagnostics.")
+                status_var.set("Done")
+        text_handler.flush_to_widget()
+
+    def cancel_run():
+        """Stop the batch at the next report boundary."""
+        if job["cancel"] is not None and job["thread"] is not None:
+            job["cancel"].set()
+            btn_cancel.configure(state="disabled")
+            status_var.set("Cancelling after the current report(s)...")
 
-        logging.info("Completed: created %d files", len(saved))
+    def exit_app():
+        if job["cancel"] is not None:
+            job["cancel"].set()
+        root.destroy()
 
     btn_add = ttk.Button(btn_frame, text="Add folder", command=add_folder)
     btn_remove = ttk.Button(btn_frame, text="Remove selected", command=remove_selected)
@@ -261,20 +416,25 @@ def main():
         btn_frame, text="Output folder destination", command=select_output
     )
     btn_run = ttk.Button(btn_frame, text="Run", command=run)
-    btn_exit = ttk.Button(btn_frame, text="Exit", command=root.destroy)
+    btn_cancel = ttk.Button(btn_frame, text="Cancel", command=cancel_run, state="disabled")
+    btn_exit = ttk.Button(btn_frame, text="Exit", command=exit_app)
 
     btn_add.pack(side="left", padx=5, pady=5)
     btn_remove.pack(side="left", padx=5, pady=5)
     btn_output.pack(side="left", padx=5, pady=5)
     btn_run.pack(side="left", padx=5, pady=5)
+    btn_cancel.pack(side="left", padx=5, pady=5)
     btn_exit.pack(side="left", padx=5, pady=5)
 
     # Escape key uses an event binding to close the window
-    root.bind("<Escape>", lambda e: root.destroy())
+    root.bind("<Escape>", lambda e: exit_app())
+    root.protocol("WM_DELETE_WINDOW", exit_app)
     update_count()
+    root.after(POLL_MS, poll)
 
     root.mainloop()
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()
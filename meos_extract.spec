@@ -13,7 +13,7 @@ a_cli = Analysis(
     pathex=[str(project_root)],
     binaries=[],
     datas=[('license_checker.py', '.')],
-    hiddenimports=['bs4', 'pandas', 'numpy', 'openpyxl'],
+    hiddenimports=['bs4', 'pandas', 'numpy', 'openpyxl', 'xlsxwriter'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -42,7 +42,7 @@ a_gui = Analysis(
     pathex=[str(project_root)],
     binaries=[],
     datas=[('license_checker.py', '.')],
-    hiddenimports=['bs4', 'pandas', 'numpy', 'openpyxl'],
+    hiddenimports=['bs4', 'pandas', 'numpy', 'openpyxl', 'xlsxwriter'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
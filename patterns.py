@@ -0,0 +1,58 @@
+"""Precompiled regular expressions of the extraction hot paths.
+
+Every pattern used per ``<text>``, ``<path>``/``<polyline>``, series colour or
+section label lives here, compiled once at import, instead of being passed
+as a string to ``re.search``/``re.fullmatch`` inside the loops (which costs a
+lookup in :mod:`re`'s internal cache on every call and a recompilation once
+that cache overflows).
+
+:data:`TICK_RE` classifies a tick label in a single ``fullmatch``: the name
+of the matching group (``match.lastgroup``) is the tick kind.
+"""
+
+import re
+
+
+# -------------------- Ticks --------------------
+TICK_RE = re.compile(
+    r"(?P<num>[-+]?\d+(?:[.,]\d+)?(?:\s*(?:dB|°|deg))?)"
+    r"|(?P<time>\d{2}:\d{2}(?::\d{2})?)"
+    r"|(?P<state>(?i:lock(?:ed)?|unlock(?:ed)?|no\s*lock|out\s*of\s*lock|loss\s*of\s*lock))"
+)
+TICK_NUMBER_JUNK_RE = re.compile(r"[^0-9+\-.,]")
+UNLOCK_RE = re.compile(r"(?i)unlock|no\s*lock|out\s*of\s*lock|loss")
+
+
+def tick_kind(text):
+    """``"num"``, ``"time"``, ``"state"`` or ``None`` for a stripped tick label."""
+    m = TICK_RE.fullmatch(text)
+    return m.lastgroup if m else None
+
+
+# -------------------- SVG geometry --------------------
+TRANSFORM_RE = re.compile(r"(translate|scale)\(\s*([^)]+)\)")
+TRANSFORM_ARGS_SPLIT_RE = re.compile(r"[, \t]+")
+PATH_CMD_RE = re.compile(r"([MmLlHhVv])")
+PATH_NUM_RE = re.compile(r"[-+]?\d*\.?\d+(?:e[-+]?\d+)?")
+POLYLINE_PAIR_RE = re.compile(r"([-+]?\d*\.?\d+(?:e[-+]?\d+)?)\s*,\s*([-+]?\d*\.?\d+(?:e[-+]?\d+)?)")
+WHITESPACE_RE = re.compile(r"\s+")
+SVG_DATA_URI_RE = re.compile(r"^data:image/svg\+xml(;charset=[^;]+)?;base64,(.*)$", re.I)
+
+# -------------------- Series colour and name --------------------
+STYLE_COLOR_RE = {
+    key: re.compile(rf"{key}\s*:\s*([^;]+)", re.I) for key in ("stroke", "fill")
+}
+HEX_COLOR_RE = re.compile(r"#?([0-9a-f]{6})")
+RGB_COLOR_RE = re.compile(r"rgb\(\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*\)")
+GNUPLOT_PLOT_1_RE = re.compile(r"\bgnuplot_plot_1\b", re.I)
+GNUPLOT_PLOT_2_RE = re.compile(r"\bgnuplot_plot_2\b", re.I)
+
+# -------------------- Labels and report metadata --------------------
+NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+SECTION_KEY_RE = re.compile(r"\W+")
+ISO_Z_DATETIME_RE = re.compile(r"(\d{4}-\d{2}-\d{2})\s+(\d{2}):(\d{2}):(\d{2})Z")
+ORBIT_RE = re.compile(r"\borbit\s*[:#]?\s*(\d{1,7})\b", re.I)
+MISSION_PREFIX_RE = re.compile(r"\b([A-Z]{2,}(?:-[A-Z0-9]{2,})+)\b")
+PREFIX_JUNK_RE = re.compile(r"[^A-Za-z0-9_-]+")
+PREFIX_TOKEN_RE = re.compile(r"\b([A-Za-z0-9]+(?:[-_][A-Za-z0-9]+)+)\b")
+PREFIX_FALLBACK_RE = re.compile(r"\b([A-Z0-9]{3,})\b")
@@ -0,0 +1,179 @@
+"""Level-of-detail reduction for the interactive (Plotly) sky plots.
+
+Combined plots stack every processed pass on the same polar chart; inlining
+all samples and one trace per track chunk makes the HTML files huge and slow
+to open.  The helpers below bound what goes into a figure:
+
+- :func:`bin_sky_points` merges samples falling into the same cell of a
+  square grid laid over the polar plot plane (the plane the chart is drawn
+  in, so cells have the same on-screen size everywhere and never straddle
+  the 0/360 azimuth seam).  Each occupied cell becomes one point carrying the
+  mean position and value, the number of samples and of distinct passes.
+  The finest grid (in steps of 1.5x) with at most ``max_points`` occupied
+  cells is used.
+- :func:`simplify_tracks` runs Douglas–Peucker on the track chunks (again in
+  the plot plane), raising the tolerance until the vertices fit the budget,
+  and returns them concatenated with ``NaN`` separators so that a whole
+  layer can be drawn by a single trace.
+
+Coordinates: ``r = 1 - el / 90`` and azimuth clockwise from north, i.e.
+``x = r * sin(az)``, ``y = r * cos(az)``, as in the polar charts.
+"""
+
+import numpy as np
+
+
+DEFAULT_MAX_POINTS = 20000
+# Starting Douglas–Peucker tolerance in plot-plane units (radius 1 = horizon):
+# about 0.1 degrees of elevation, invisible at any reasonable zoom.
+_MIN_TOLERANCE = 1e-3
+_GROWTH = 1.5
+_MAX_GRID_STEPS = 40
+
+
+def to_plane(az_deg, el_deg):
+    """Polar-chart plane coordinates of azimuth/elevation samples."""
+    theta = np.deg2rad(np.asarray(az_deg, dtype=float))
+    r = 1.0 - np.asarray(el_deg, dtype=float) / 90.0
+    return r * np.sin(theta), r * np.cos(theta)
+
+
+def from_plane(x, y):
+    """Inverse of :func:`to_plane` (azimuth wrapped to ``[0, 360)``)."""
+    az = np.mod(np.rad2deg(np.arctan2(x, y)), 360.0)
+    el = 90.0 * (1.0 - np.hypot(x, y))
+    return az, el
+
+
+def _bin_cells(x, y, cell):
+    ix = np.floor(x / cell).astype(np.int64)
+    iy = np.floor(y / cell).astype(np.int64)
+    # The plane spans [-2, 2] for elevations down to -90 deg: shift to positive ids.
+    span = int(np.ceil(4.0 / cell)) + 2
+    _, inverse = np.unique((ix + span) * (2 * span + 1) + (iy + span), return_inverse=True)
+    return inverse.reshape(-1)
+
+
+def bin_sky_points(az_deg, el_deg, values, max_points=DEFAULT_MAX_POINTS, sources=None):
+    """Reduce scattered sky samples to at most ``max_points`` grid cells.
+
+    Returns ``None`` when the samples already fit the budget (draw them as
+    they are), otherwise a dict of per-cell arrays: ``azimuth``,
+    ``elevation``, ``value`` (mean), ``count`` (samples) and ``passes``
+    (distinct ``sources`` in the cell, ``1`` when ``sources`` is not given),
+    plus the ``cell`` size used.
+    """
+    az = np.asarray(az_deg, dtype=float)
+    el = np.asarray(el_deg, dtype=float)
+    val = np.asarray(values, dtype=float)
+    ok = np.isfinite(az) & np.isfinite(el) & np.isfinite(val)
+    if not max_points or int(ok.sum()) <= max_points:
+        return None
+    az, el, val = az[ok], el[ok], val[ok]
+    x, y = to_plane(az, el)
+
+    # A full sky holds about pi / cell**2 cells: start from the size that just
+    # fits the budget, then look for the finest grid whose occupied cells
+    # still fit (passes along similar tracks leave most of the sky empty).
+    cell = np.sqrt(np.pi / max_points)
+    best = None
+    for _ in range(_MAX_GRID_STEPS):
+        cells = _bin_cells(x, y, cell)
+        n_cells = int(cells.max()) + 1
+        if n_cells <= max_points:
+            best = (cells, n_cells, cell)
+            cell /= _GROWTH
+        elif best is not None:
+            break
+        else:
+            cell *= _GROWTH
+    if best is not None:
+        cells, n_cells, cell = best
+
+    count = np.bincount(cells, minlength=n_cells)
+    mean_x = np.bincount(cells, weights=x, minlength=n_cells) / count
+    mean_y = np.bincount(cells, weights=y, minlength=n_cells) / count
+    mean_val = np.bincount(cells, weights=val, minlength=n_cells) / count
+    if sources is not None:
+        codes = np.unique(np.asarray(sources, dtype=object)[ok].astype(str), return_inverse=True)[1].reshape(-1)
+        pairs = np.unique(cells.astype(np.int64) * (int(codes.max()) + 1) + codes)
+        passes = np.bincount(pairs // (int(codes.max()) + 1), minlength=n_cells)
+    else:
+        passes = np.ones(n_cells, dtype=np.int64)
+    cell_az, cell_el = from_plane(mean_x, mean_y)
+    return {
+        "azimuth": cell_az,
+        "elevation": cell_el,
+        "value": mean_val,
+        "count": count,
+        "passes": passes,
+        "cell": cell,
+    }
+
+
+def douglas_peucker(x, y, tolerance):
+    """Indices of the vertices kept by Douglas–Peucker simplification of ``(x, y)``."""
+    n = len(x)
+    if n <= 2:
+        return np.arange(n)
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        i, j = stack.pop()
+        if j - i < 2:
+            continue
+        dx, dy = x[j] - x[i], y[j] - y[i]
+        px, py = x[i + 1:j] - x[i], y[i + 1:j] - y[i]
+        norm = np.hypot(dx, dy)
+        if norm > 0:
+            dist = np.abs(px * dy - py * dx) / norm
+        else:
+            dist = np.hypot(px, py)
+        k = int(np.argmax(dist))
+        if dist[k] > tolerance:
+            k += i + 1
+            keep[k] = True
+            stack.append((i, k))
+            stack.append((k, j))
+    return np.flatnonzero(keep)
+
+
+def simplify_tracks(chunks, max_points=DEFAULT_MAX_POINTS, labels=None):
+    """Simplify track chunks and join them into single NaN-separated arrays.
+
+    Parameters
+    ----------
+    chunks : list of (az, el)
+        Track pieces, already split at the azimuth wrap.
+    max_points : int
+        Vertex budget for all chunks together (separators excluded);
+        ``None``/``0`` keeps every vertex.
+    labels : list, optional
+        One label per chunk (e.g. the pass), repeated on its vertices.
+
+    Returns
+    -------
+    tuple
+        ``(az, el, text)``: the joined arrays (``text`` is ``None`` without
+        ``labels``); separators are ``NaN`` in ``az``/``el`` and ``None`` in
+        ``text``.
+    """
+    planes = [to_plane(az, el) for az, el in chunks]
+    kept = [np.arange(len(px)) for px, _ in planes]
+    total = sum(len(k) for k in kept)
+    tolerance = _MIN_TOLERANCE
+    while max_points and total > max_points and tolerance < 1.0:
+        kept = [douglas_peucker(px, py, tolerance) for px, py in planes]
+        total = sum(len(k) for k in kept)
+        tolerance *= 2.0
+
+    az_parts, el_parts, text = [], [], [] if labels is not None else None
+    for n, ((az, el), idx) in enumerate(zip(chunks, kept)):
+        az_parts.extend([np.asarray(az, dtype=float)[idx], [np.nan]])
+        el_parts.extend([np.asarray(el, dtype=float)[idx], [np.nan]])
+        if text is not None:
+            text.extend([labels[n]] * len(idx) + [None])
+    if not az_parts:
+        return np.array([]), np.array([]), text
+    return np.concatenate(az_parts[:-1]), np.concatenate(el_parts[:-1]), (text[:-1] if text else text)
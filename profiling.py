@@ -0,0 +1,189 @@
+"""Lightweight per-stage timing of the extraction pipeline.
+
+Code paths are annotated with :func:`span` blocks (and :func:`count` for
+counters such as points, subpaths, candidates or sheets)::
+
+    with span("subpaths"):
+        ...
+        count(subpaths=n, points=len(pts))
+
+Spans only record anything inside a :func:`profiled` block; otherwise
+:func:`span` returns a shared no-op context manager, so the annotations cost
+one context-variable lookup.  Nested spans are aggregated by their path
+(``process_html/extract/subpaths``): calls, inclusive wall time and summed
+counters.  :meth:`Profile.to_dict` gives a picklable/JSON-serializable
+summary (worker processes send it back with their results);
+:func:`format_table` renders one or more of them as a text table and
+:func:`aggregate` sums them over a batch.
+
+``profiled(..., cprofile_path=...)`` additionally runs :mod:`cProfile` and
+dumps a ``.pstats`` file for ``python -m pstats`` / snakeviz.
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from pathlib import Path
+
+
+_active = ContextVar("meos_profile", default=None)
+_NOOP = nullcontext()
+
+
+class Profile:
+    """Span statistics of one profiled run (usually one report)."""
+
+    def __init__(self, label):
+        self.label = label
+        self.stats = {}  # path -> {"calls", "seconds", "counters"}
+        self._stack = []
+        self.total_s = 0.0
+
+    def _entry(self, path):
+        entry = self.stats.get(path)
+        if entry is None:
+            entry = self.stats[path] = {"calls": 0, "seconds": 0.0, "counters": {}}
+        return entry
+
+    def add_counters(self, counters, path=None):
+        path = path or ("/".join(self._stack) if self._stack else None)
+        if path is None:
+            return
+        totals = self._entry(path)["counters"]
+        for key, value in counters.items():
+            totals[key] = totals.get(key, 0) + value
+
+    def to_dict(self):
+        return {
+            "label": self.label,
+            "total_s": self.total_s,
+            "spans": [
+                {"path": path, "calls": e["calls"], "seconds": e["seconds"], "counters": dict(e["counters"])}
+                for path, e in self.stats.items()
+            ],
+        }
+
+
+class _Span:
+    __slots__ = ("profile", "name", "counters", "path", "t0")
+
+    def __init__(self, profile, name, counters):
+        self.profile = profile
+        self.name = name
+        self.counters = counters
+
+    def __enter__(self):
+        stack = self.profile._stack
+        stack.append(self.name)
+        self.path = "/".join(stack)
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.t0
+        entry = self.profile._entry(self.path)
+        entry["calls"] += 1
+        entry["seconds"] += elapsed
+        if self.counters:
+            self.profile.add_counters(self.counters, self.path)
+        self.profile._stack.pop()
+        return False
+
+
+def span(name, **counters):
+    """Time the enclosed block as stage ``name`` (no-op unless profiling)."""
+    profile = _active.get()
+    if profile is None:
+        return _NOOP
+    return _Span(profile, name, counters)
+
+
+def count(**counters):
+    """Add counters to the innermost open span (no-op unless profiling)."""
+    profile = _active.get()
+    if profile is not None:
+        profile.add_counters(counters)
+
+
+def enabled():
+    return _active.get() is not None
+
+
+@contextmanager
+def profiled(label, cprofile_path=None):
+    """Record the spans of the enclosed block into a new :class:`Profile` (yielded)."""
+    profile = Profile(label)
+    token = _active.set(profile)
+    profiler = None
+    if cprofile_path is not None:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+    t0 = time.perf_counter()
+    try:
+        yield profile
+    finally:
+        profile.total_s = time.perf_counter() - t0
+        if profiler is not None:
+            profiler.disable()
+            cprofile_path = Path(cprofile_path)
+            cprofile_path.parent.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(str(cprofile_path))
+        _active.reset(token)
+
+
+# -------------------- Reports --------------------
+def aggregate(profiles, label="all reports"):
+    """Sum several :meth:`Profile.to_dict` summaries into one."""
+    spans = {}
+    total = 0.0
+    for prof in profiles:
+        total += prof["total_s"]
+        for s in prof["spans"]:
+            entry = spans.setdefault(s["path"], {"path": s["path"], "calls": 0, "seconds": 0.0, "counters": {}})
+            entry["calls"] += s["calls"]
+            entry["seconds"] += s["seconds"]
+            for key, value in s["counters"].items():
+                entry["counters"][key] = entry["counters"].get(key, 0) + value
+    return {"label": label, "total_s": total, "reports": len(profiles), "spans": list(spans.values())}
+
+
+def _ordered(spans):
+    # Depth-first, children after their parent, siblings by first appearance.
+    order = {s["path"]: i for i, s in enumerate(spans)}
+    return sorted(spans, key=lambda s: [order.get("/".join(s["path"].split("/")[: i + 1]), 0)
+                                        for i in range(s["path"].count("/") + 1)])
+
+
+def format_table(profile):
+    """Text table of one :meth:`Profile.to_dict` (or :func:`aggregate`) summary."""
+    total = profile["total_s"] or 1e-12
+    title = profile["label"]
+    if "reports" in profile:
+        title += f" ({profile['reports']} report{'s' if profile['reports'] != 1 else ''})"
+    lines = [
+        f"{title}: {profile['total_s'] * 1e3:.1f} ms",
+        f"  {'stage':<34}{'calls':>7}{'ms':>11}{'%':>7}  counters",
+    ]
+    for s in _ordered(profile["spans"]):
+        depth = s["path"].count("/")
+        name = "  " * depth + s["path"].rsplit("/", 1)[-1]
+        counters = ", ".join(f"{k}={v:g}" for k, v in sorted(s["counters"].items()))
+        lines.append(
+            f"  {name:<34}{s['calls']:>7}{s['seconds'] * 1e3:>11.1f}{100.0 * s['seconds'] / total:>7.1f}  {counters}"
+        )
+    return "\n".join(lines)
+
+
+def write_json(path, profiles):
+    """Dump per-report summaries and their aggregate to ``path``."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"reports": list(profiles), "aggregate": aggregate(profiles)}
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(payload, indent=1), encoding="utf-8")
+    os.replace(tmp, path)
+    return path
@@ -0,0 +1,199 @@
+"""Discovery of MEOS HTML reports in (deep) folder trees.
+
+:func:`iter_reports` walks the given roots with :func:`os.scandir` and yields
+report paths as soon as they are found, so processing can start while the
+archive is still being scanned.  Directories are listed by a small thread
+pool: on network shares most of the time goes into waiting for directory
+listings, which overlap well across threads.  The paths are still yielded
+in a fixed order (depth-first, alphabetical), whatever the number of threads.
+
+Filters
+-------
+- ``include`` / ``exclude``: glob patterns (:mod:`fnmatch`).  A pattern
+  containing ``/`` is matched against the path relative to the root
+  (POSIX separators), otherwise against the file name; as in
+  :mod:`fnmatch`, ``*`` also matches ``/``.  ``exclude`` patterns also prune
+  directories.
+- ``modified_after`` / ``modified_before``: modification-time window
+  (``datetime`` or POSIX timestamp).
+- ``exclude_dirs``: directories that are never entered (e.g. the output
+  directory, which contains the ``*_interactive.html`` plots).  When such a
+  directory is itself scanned (it is a root, e.g. ``-o .`` with the default
+  ``.``), the generated files in it (:data:`GENERATED_PATTERNS`) are skipped
+  instead, so that reports stored next to the outputs are still found.
+
+Hidden directories (``.name``) are skipped.  Files given directly as roots
+are yielded as they are, without applying the filters.
+"""
+
+import fnmatch
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INCLUDE = ("*.html",)
+DEFAULT_SCAN_THREADS = 8
+GENERATED_PATTERNS = ("*_interactive.html",)  # plots written to the output directory
+
+
+def _timestamp(value):
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return float(value)
+
+
+class _Filter:
+    def __init__(self, include, exclude, modified_after, modified_before, exclude_dirs):
+        self.include = tuple(include or DEFAULT_INCLUDE)
+        self.exclude = tuple(exclude or ())
+        self.after = _timestamp(modified_after)
+        self.before = _timestamp(modified_before)
+        self.exclude_dirs = {os.path.normcase(os.path.abspath(d)) for d in exclude_dirs or ()}
+
+    @staticmethod
+    def _match(patterns, name, rel):
+        return any(fnmatch.fnmatch(rel if "/" in p else name, p) for p in patterns)
+
+    def keep_dir(self, entry, rel):
+        if entry.name.startswith("."):
+            return False
+        if self.exclude_dirs and os.path.normcase(os.path.abspath(entry.path)) in self.exclude_dirs:
+            return False
+        return not self._match(self.exclude, entry.name, rel)
+
+    def keep_file(self, entry, rel):
+        if not self._match(self.include, entry.name, rel) or self._match(self.exclude, entry.name, rel):
+            return False
+        if (
+            self.exclude_dirs
+            and self._match(GENERATED_PATTERNS, entry.name, rel)
+            and os.path.normcase(os.path.abspath(os.path.dirname(entry.path))) in self.exclude_dirs
+        ):
+            return False
+        if self.after is None and self.before is None:
+            return True
+        try:
+            mtime = entry.stat().st_mtime
+        except OSError:
+            return False
+        if self.after is not None and mtime < self.after:
+            return False
+        if self.before is not None and mtime >= self.before:
+            return False
+        return True
+
+
+def _list_dir(path, root, filt, recursive):
+    """Return (files, subdirs) of ``path`` kept by ``filt``; files are sorted."""
+    files, subdirs = [], []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                rel = os.path.relpath(entry.path, root).replace(os.sep, "/")
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive and filt.keep_dir(entry, rel):
+                            subdirs.append(entry.path)
+                    elif entry.is_file() and filt.keep_file(entry, rel):
+                        files.append(entry.path)
+                except OSError as exc:
+                    logger.warning("Cannot inspect %s: %s", entry.path, exc)
+    except OSError as exc:
+        logger.warning("Cannot list %s: %s", path, exc)
+    return sorted(files), sorted(subdirs)
+
+
+def _scan_serial(root, filt, recursive):
+    stack = [str(root)]
+    while stack:
+        files, subdirs = _list_dir(stack.pop(), root, filt, recursive)
+        yield from files
+        stack.extend(reversed(subdirs))  # depth-first, alphabetical
+
+
+def _scan_parallel(root, filt, recursive, threads):
+    # Workers list the directories ahead of the consumer (every listing
+    # submits its subdirectories at once), while the consumer walks the
+    # resulting futures depth-first: the order is the one of _scan_serial,
+    # however the listings complete.
+    stop = threading.Event()
+
+    with ThreadPoolExecutor(max_workers=threads, thread_name_prefix="meos-scan") as pool:
+        def visit(path):
+            if stop.is_set():
+                return [], []
+            files, subdirs = _list_dir(path, root, filt, recursive)
+            return files, [pool.submit(visit, sub) for sub in subdirs]
+
+        stack = [pool.submit(visit, str(root))]
+        try:
+            while stack:
+                files, subdirs = stack.pop().result()
+                yield from files
+                stack.extend(reversed(subdirs))
+        finally:
+            stop.set()  # the consumer stopped early: let pending visits return at once
+
+
+def iter_reports(
+    roots,
+    include=DEFAULT_INCLUDE,
+    exclude=(),
+    recursive=True,
+    modified_after=None,
+    modified_before=None,
+    exclude_dirs=(),
+    threads=DEFAULT_SCAN_THREADS,
+):
+    """Yield the report files found under ``roots`` (files or directories).
+
+    Paths are yielded as soon as their directory has been listed; each file
+    is yielded once even if reachable from several roots.  The walk is
+    depth-first in alphabetical order, with ``threads > 1`` as well (the
+    directories are listed ahead in parallel), so that batch outputs merged
+    in input order do not change from run to run.
+    """
+    filt = _Filter(include, exclude, modified_after, modified_before, exclude_dirs)
+    seen = set()
+    for root in roots:
+        root = Path(root)
+        if root.is_file():
+            candidates = [str(root)]
+        elif root.is_dir():
+            if threads and threads > 1:
+                candidates = _scan_parallel(root, filt, recursive, threads)
+            else:
+                candidates = _scan_serial(root, filt, recursive)
+        else:
+            logger.warning("Path not found: %s", root)
+            continue
+        for path in candidates:
+            key = os.path.normcase(os.path.abspath(path))
+            if key in seen:
+                continue
+            seen.add(key)
+            yield Path(path)
+
+
+def parse_time_bound(text):
+    """Parse a ``--since``/``--until`` value.
+
+    Accepts an ISO date/datetime (``2024-05-01``, ``2024-05-01T12:00``) or a
+    duration before now such as ``90m``, ``12h``, ``7d`` or ``2w``.
+    """
+    text = text.strip()
+    units = {"m": 60, "h": 3600, "d": 86400, "w": 7 * 86400}
+    if text and text[-1].lower() in units and text[:-1].replace(".", "", 1).isdigit():
+        return datetime.now().timestamp() - float(text[:-1]) * units[text[-1].lower()]
+    try:
+        return datetime.fromisoformat(text).timestamp()
+    except ValueError:
+        raise ValueError(f"Invalid time bound: {text!r} (use an ISO date or e.g. 7d, 12h)") from None
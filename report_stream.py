@@ -0,0 +1,287 @@
+"""Streaming reader for MEOS HTML reports.
+
+The report is fed in chunks to lxml's HTML push parser with a SAX-like
+*target*, so no document tree is ever built.  Only what the extraction needs
+is kept while the parser runs:
+
+- the text of the ``<title>`` and of the h1/h2/h3 headers,
+- the rows of the Session table (first ``<table>`` after ``id="_session"``),
+- the ``<svg>`` subtrees and ``<object type="image/svg+xml">`` references,
+  grouped by the h2/h3 section they belong to,
+- the whitespace-joined document text used to derive prefix/orbit number.
+
+Everything else (Events, Files, System info tables, scripts, ...) is
+discarded as soon as it has been parsed.  The captured SVG subtrees are built
+from :class:`StreamNode` objects exposing the small subset of the
+BeautifulSoup ``Tag`` API used by :mod:`Extract_all_charts`, so the
+extraction code runs unchanged on either backend.
+
+Requires ``lxml``.
+"""
+
+from pathlib import Path
+
+from lxml import etree
+
+
+CHUNK_SIZE = 1 << 16
+SECTION_HEADERS = ("h2", "h3")
+TEXT_HEADERS = ("h1", "h2", "h3")
+# BeautifulSoup's ``get_text`` skips script/style/template strings.
+SKIPPED_TEXT = ("script", "style", "template")
+
+
+class StreamNode:
+    """Minimal stand-in for ``bs4.element.Tag`` used for captured elements."""
+
+    __slots__ = ("name", "attrs", "contents", "parent")
+
+    def __init__(self, name, attrs, parent=None):
+        self.name = name
+        self.attrs = attrs
+        self.contents = []  # child StreamNode objects and raw text strings
+        self.parent = parent
+
+    def __repr__(self):
+        return f"<StreamNode {self.name} {self.attrs!r}>"
+
+    def get(self, key, default=None):
+        return self.attrs.get(key, default)
+
+    @property
+    def descendants(self):
+        stack = list(reversed(self.contents))
+        while stack:
+            node = stack.pop()
+            yield node
+            if isinstance(node, StreamNode):
+                stack.extend(reversed(node.contents))
+
+    def find_all(self, name=None):
+        names = (name,) if isinstance(name, str) else name
+        return [
+            node
+            for node in self.descendants
+            if isinstance(node, StreamNode) and (names is None or node.name in names)
+        ]
+
+    def find(self, name=None):
+        names = (name,) if isinstance(name, str) else name
+        for node in self.descendants:
+            if isinstance(node, StreamNode) and (names is None or node.name in names):
+                return node
+        return None
+
+    def get_text(self, separator="", strip=False):
+        parts = []
+        for node in self.descendants:
+            if isinstance(node, StreamNode):
+                continue
+            if strip:
+                node = node.strip()
+                if not node:
+                    continue
+            parts.append(node)
+        return separator.join(parts)
+
+    @property
+    def svg(self):
+        return self if self.name == "svg" else self.find("svg")
+
+
+class _ReportTarget:
+    """lxml parser target collecting the report parts listed in the module docstring."""
+
+    def __init__(self):
+        self.depth = 0
+        self.buf = []
+        self.skip_text = 0
+
+        self.text_parts = []
+        self.title = None
+        self._title_parts = None
+        self.header_texts = []
+        self._header_parts = None
+        self._header_entry = None
+
+        self.sections = []
+        self._current = None
+        self._open_by_depth = {}  # parent depth -> section entry of the last header among its children
+
+        self._svg = None  # innermost StreamNode currently being built inside an <svg>
+
+        self._session_seen = False
+        self._session_state = None  # None -> waiting, depth of <table> -> capturing, "done"
+        self.session_rows = []
+        self._row = None
+        self._cell_parts = None
+        self._cell_depth = None
+
+    # -- text handling -------------------------------------------------
+    def data(self, data):
+        self.buf.append(data)
+
+    def _flush(self):
+        if not self.buf:
+            return
+        raw = "".join(self.buf)
+        self.buf = []
+        if self._svg is not None:
+            self._svg.contents.append(raw)
+        if self.skip_text:
+            return
+        text = raw.strip()
+        if not text:
+            return
+        self.text_parts.append(text)
+        for parts in (self._title_parts, self._header_parts, self._cell_parts):
+            if parts is not None:
+                parts.append(text)
+
+    # -- element events ------------------------------------------------
+    def start(self, tag, attrib):
+        self._flush()
+        tag = tag.lower()
+        depth = self.depth  # depth of the new element; its parent sits at depth - 1
+        self.depth += 1
+        attrs = dict(attrib)
+
+        if tag in SKIPPED_TEXT:
+            self.skip_text += 1
+
+        if tag == "title" and self.title is None and self._title_parts is None:
+            self._title_parts = []
+
+        if tag in TEXT_HEADERS and self._header_parts is None:
+            self._header_parts = []
+            if tag in SECTION_HEADERS:
+                self._header_entry = self._open_section(tag, attrs, depth)
+
+        if not self._session_seen and attrs.get("id") == "_session":
+            self._session_seen = True
+        elif self._session_seen and self._session_state is None and tag == "table":
+            self._session_state = depth
+        if isinstance(self._session_state, int):
+            if tag == "tr":
+                self._row = []
+                self.session_rows.append(self._row)
+            elif tag in ("td", "th") and self._row is not None and self._cell_parts is None:
+                self._cell_parts = []
+                self._cell_depth = depth
+
+        is_chart = tag == "svg" or (tag == "object" and attrs.get("type") == "image/svg+xml")
+        if self._svg is not None or tag == "svg":
+            node = StreamNode(tag, attrs, parent=self._svg)
+            if self._svg is not None:
+                self._svg.contents.append(node)
+            self._svg = node
+        elif is_chart:
+            node = StreamNode(tag, attrs)
+        if is_chart:
+            self._add_chart(node, depth)
+
+    def end(self, tag):
+        self._flush()
+        tag = tag.lower()
+        self.depth -= 1
+        depth = self.depth
+        self._open_by_depth.pop(depth, None)
+
+        if tag in SKIPPED_TEXT and self.skip_text:
+            self.skip_text -= 1
+
+        if tag == "title" and self._title_parts is not None:
+            self.title = " ".join(self._title_parts)
+            self._title_parts = None
+
+        if tag in TEXT_HEADERS and self._header_parts is not None:
+            text = " ".join(self._header_parts)
+            self._header_parts = None
+            if text:
+                self.header_texts.append(text)
+            if self._header_entry is not None:
+                self._header_entry["title"] = text
+                self._header_entry["_open"] = False
+                self._header_entry = None
+
+        if self._cell_depth == depth:
+            self._row.append(" ".join(self._cell_parts))
+            self._cell_parts = None
+            self._cell_depth = None
+        if self._session_state == depth:
+            self._session_state = "done"
+            self._row = None
+
+        if self._svg is not None:
+            self._svg = self._svg.parent
+
+    def comment(self, text):
+        self._flush()
+
+    def pi(self, target, data=None):
+        self._flush()
+
+    def doctype(self, *args):
+        self._flush()
+
+    def close(self):
+        self._flush()
+        for entry in self.sections:
+            entry.pop("_open", None)
+            entry.pop("_depth", None)
+        return {
+            "title": self.title,
+            "text": " ".join(self.text_parts),
+            "header_texts": self.header_texts,
+            "session_rows": [row for row in self.session_rows if row],
+            "sections": self.sections,
+        }
+
+    # -- sections ------------------------------------------------------
+    def _open_section(self, tag, attrs, depth):
+        entry = {
+            "header": StreamNode(tag, attrs),
+            "title": "",
+            "nodes": [],
+            "has_chart": False,
+            "_open": True,
+            "_depth": depth,
+        }
+        self.sections.append(entry)
+        self._current = entry
+        self._open_by_depth[depth - 1] = entry
+        return entry
+
+    def _add_chart(self, node, depth):
+        if self._current is not None:
+            self._current["nodes"].append(node)
+        # Same sibling-region rule as ``build_section_index``: one of the
+        # chart's ancestors (not the chart itself) follows an h2/h3 under the
+        # same parent.
+        for level in range(depth - 1, 0, -1):
+            entry = self._open_by_depth.get(level - 1)
+            if entry is None:
+                continue
+            if entry["_open"] and entry["_depth"] == level:
+                continue  # chart nested inside the header itself
+            entry["has_chart"] = True
+
+
+def read_report(path, chunk_size: int = CHUNK_SIZE):
+    """Stream ``path`` through lxml and return the captured report parts.
+
+    Returns
+    -------
+    dict
+        ``title``, ``text``, ``header_texts``, ``session_rows`` (lists of cell
+        texts) and ``sections`` (one dict per h2/h3 with ``header``,
+        ``title``, ``nodes`` and ``has_chart``).
+    """
+    parser = etree.HTMLParser(target=_ReportTarget(), encoding="utf-8")
+    with Path(path).open("rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            parser.feed(chunk)
+    return parser.close()
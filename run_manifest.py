@@ -0,0 +1,242 @@
+"""Content-hash manifest for incremental batch runs.
+
+The manifest lives in the output directory (``.meos_manifest.json``) and
+maps every processed report to what was generated from it::
+
+    {
+      "version": 1,
+      "entries": {
+        "<resolved report path>": {
+          "sha256": "...",          # report content
+          "settings": "...",        # hash of the extraction settings
+          "out_path": "...",        # value returned by process_html
+          "artifacts": ["..."],     # every file written for the report
+          "stats_rows": [...],
+          "plot_rows": [...],
+          "series": "..."           # the report's *_polar_series.npz (also an artifact)
+        }
+      }
+    }
+
+A report whose content and settings match its entry, and whose artifacts are
+all still on disk, does not need to be processed again: its cached rows and
+polar series are reused for the batch summaries.  Paths inside the manifest
+are stored relative to the output directory when possible so that the whole
+folder can be moved.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = ".meos_manifest.json"
+SERIES_SUFFIX = "_polar_series.npz"  # polar series file written next to each Excel
+MANIFEST_VERSION = 1
+_HASH_CHUNK = 1 << 20
+
+
+def file_sha256(path):
+    """Hex SHA-256 of the content of ``path``."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def settings_key(options):
+    """Stable hash of the extraction settings (a JSON-serializable dict)."""
+    payload = json.dumps({"version": MANIFEST_VERSION, **options}, sort_keys=True, default=list)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# -------------------- Polar series serialization --------------------
+_SERIES_SCALARS = ("selector", "metric_col", "source_label")
+
+
+def save_series(path, series_rows):
+    """Write polar series rows (see ``collect_polar_plot_series``) to a compressed ``.npz``.
+
+    Scalar fields go into a JSON header, arrays are stored as ``<i>__<field>``;
+    object arrays of labels are saved as fixed-width strings so the file loads
+    without pickle.
+    """
+    arrays = {}
+    header = []
+    for i, row in enumerate(series_rows):
+        header.append({k: row.get(k) for k in _SERIES_SCALARS})
+        for key, value in row.items():
+            if key in _SERIES_SCALARS:
+                continue
+            arr = np.asarray(value)
+            if arr.dtype == object:
+                arr = arr.astype(str)
+            arrays[f"{i}__{key}"] = arr
+    arrays["__header__"] = np.array(json.dumps(header))
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        np.savez_compressed(f, **arrays)
+    os.replace(tmp, path)
+    return path
+
+
+def load_series(path):
+    """Inverse of :func:`save_series`."""
+    with np.load(path, allow_pickle=False) as data:
+        header = json.loads(str(data["__header__"]))
+        rows = [dict(h) for h in header]
+        for name in data.files:
+            if name == "__header__":
+                continue
+            i, key = name.split("__", 1)
+            arr = data[name]
+            if arr.dtype.kind == "U":
+                arr = arr.astype(object)
+            rows[int(i)][key] = arr
+    return rows
+
+
+# -------------------- Manifest --------------------
+class RunManifest:
+    """Load, query and update the manifest of one output directory."""
+
+    def __init__(self, output_dir, entries=None):
+        self.output_dir = Path(output_dir)
+        self.entries = entries or {}
+
+    @property
+    def path(self):
+        return self.output_dir / MANIFEST_NAME
+
+    @classmethod
+    def load(cls, output_dir):
+        path = Path(output_dir) / MANIFEST_NAME
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return cls(output_dir)
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable manifest %s: %s", path, exc)
+            return cls(output_dir)
+        if data.get("version") != MANIFEST_VERSION:
+            logger.info("Manifest %s has another version: starting a new one", path)
+            return cls(output_dir)
+        return cls(output_dir, data.get("entries", {}))
+
+    def save(self):
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps({"version": MANIFEST_VERSION, "entries": self.entries}, indent=1), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    # -- paths ------------------------------------------------------
+    def _rel(self, path):
+        path = Path(path)
+        try:
+            return path.resolve().relative_to(self.output_dir.resolve()).as_posix()
+        except ValueError:
+            return str(path)
+
+    def _abs(self, path):
+        path = Path(path)
+        return path if path.is_absolute() else self.output_dir / path
+
+    @staticmethod
+    def key(report_path):
+        return str(Path(report_path).resolve())
+
+    # -- queries ----------------------------------------------------
+    def lookup(self, report_path, digest, settings):
+        """Return the cached result for an unchanged report, else ``None``.
+
+        The result has the shape of ``_process_report_task`` results with
+        ``skipped=True``; polar series are loaded from their ``.npz``.
+        """
+        entry = self.entries.get(self.key(report_path))
+        if not entry or entry.get("sha256") != digest or entry.get("settings") != settings:
+            return None
+        files = [self._abs(p) for p in entry.get("artifacts", [])]
+        missing = [p for p in files if not p.exists()]
+        if missing:
+            logger.info("Reprocessing %s: %d cached artifact(s) missing", report_path, len(missing))
+            return None
+        try:
+            series = load_series(self._abs(entry["series"])) if entry.get("series") else []
+        except (OSError, ValueError, KeyError) as exc:
+            logger.warning("Reprocessing %s: cannot read cached series (%s)", report_path, exc)
+            return None
+        return {
+            "path": str(report_path),
+            "out_path": self._abs(entry["out_path"]) if entry.get("out_path") else None,
+            "stats_rows": list(entry.get("stats_rows", [])),
+            "plot_rows": [dict(r) for r in entry.get("plot_rows", [])],
+            "plot_series_rows": series,
+            "artifacts": files,
+            "error": None,
+            "skipped": True,
+        }
+
+    # -- updates ----------------------------------------------------
+    def record(self, report_path, digest, settings, result, prune=False):
+        """Store the outcome of a successful ``_process_report_task`` run.
+
+        With ``prune=True`` files listed by the previous entry of the same
+        report and not produced again are deleted.
+        """
+        key = self.key(report_path)
+        old = self.entries.get(key)
+        artifacts = [self._rel(p) for p in result.get("artifacts", [])]
+        # The polar series are read back from the report's own series file.
+        series_file = next((p for p in artifacts if p.endswith(SERIES_SUFFIX)), None)
+        entry = {
+            "sha256": digest,
+            "settings": settings,
+            "out_path": self._rel(result["out_path"]) if result["out_path"] else None,
+            "artifacts": artifacts,
+            "stats_rows": result["stats_rows"],
+            "plot_rows": result["plot_rows"],
+            "series": series_file,
+        }
+        self.entries[key] = entry
+        if old and prune:
+            keep = set(artifacts)
+            self._remove([p for p in old.get("artifacts", []) if p not in keep])
+
+    def prune_missing_sources(self):
+        """Drop entries (and delete their artifacts) whose report no longer exists."""
+        removed = []
+        for key in list(self.entries):
+            if Path(key).exists():
+                continue
+            entry = self.entries.pop(key)
+            self._remove(entry.get("artifacts", []))
+            removed.append(key)
+        if removed:
+            logger.info("Pruned %d stale manifest entr%s", len(removed), "y" if len(removed) == 1 else "ies")
+        return removed
+
+    def _remove(self, paths):
+        # Never delete a file that another report still lists (same output name).
+        in_use = set()
+        for entry in self.entries.values():
+            in_use.update(entry.get("artifacts", []))
+        for rel in paths:
+            if not rel or rel in in_use:
+                continue
+            path = self._abs(rel)
+            try:
+                path.unlink()
+                logger.info("Removed stale artifact: %s", path)
+            except FileNotFoundError:
+                pass
+            except OSError as exc:
+                logger.warning("Cannot remove stale artifact %s: %s", path, exc)
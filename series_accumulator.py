@@ -0,0 +1,302 @@
+"""Streaming, memory-bounded accumulation of polar series for combined plots.
+
+A batch used to keep the series dicts of every report in a list and
+``np.concatenate`` them at the end, with one Python string per point for
+the source label.  :class:`SeriesAccumulator` instead appends each report
+to compact per-selector buffers as soon as it is done:
+
+- azimuth, elevation, metric and lock state in growable ``float32`` arrays
+  (capacity doubles when full), the unlock mask as ``bool``;
+- source labels interned once, points storing a small ``int32`` code;
+- all track vertices of a selector in one shared array, each track being a
+  ``(start, stop, source code)`` row of an offsets array.
+
+Above ``spill_bytes`` the buffers move to memory-mapped ``.npy`` files in a
+temporary directory (under ``spill_dir``), so the resident memory stays
+bounded by what the OS keeps in the page cache.
+
+:meth:`SeriesAccumulator.series_map` returns the combined series in the
+layout of ``collect_polar_plot_series`` (plus ``track_segments``), as views
+on the buffers.
+"""
+
+import logging
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+SELECTORS = ("input_level", "eb_no", "snr")
+_INITIAL_CAPACITY = 4096
+_POINT_FIELDS = (
+    ("azimuth", np.float32),
+    ("elevation", np.float32),
+    ("metric", np.float32),
+    ("lock_state", np.float32),
+    ("unlock_mask", np.bool_),
+    ("source", np.int32),
+)
+_TRACK_FIELDS = (("track_az", np.float32), ("track_el", np.float32))
+
+
+class _GrowableArray:
+    """1-D array with amortized appends; optionally backed by a memory-mapped file."""
+
+    def __init__(self, dtype, capacity=_INITIAL_CAPACITY):
+        self.dtype = np.dtype(dtype)
+        self.size = 0
+        self.data = np.empty(capacity, dtype=self.dtype)
+        self.spill_path = None
+        self._generation = 0
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes
+
+    def view(self):
+        return self.data[: self.size]
+
+    def append(self, values):
+        values = np.asarray(values, dtype=self.dtype).reshape(-1)
+        end = self.size + len(values)
+        if end > len(self.data):
+            self._reallocate(max(end, 2 * len(self.data)))
+        self.data[self.size:end] = values
+        self.size = end
+
+    def keep(self, mask):
+        """Drop the elements where ``mask`` is false, in place and in order."""
+        kept = self.view()[mask]
+        self.data[: len(kept)] = kept
+        self.size = len(kept)
+
+    def spill(self, directory):
+        """Move the buffer to a memory-mapped file in ``directory``."""
+        if self.spill_path is None:
+            self.spill_path = Path(directory)
+            self._reallocate(len(self.data))
+
+    def _reallocate(self, capacity):
+        if self.spill_path is None:
+            new = np.empty(capacity, dtype=self.dtype)
+        else:
+            self._generation += 1
+            path = self.spill_path / f"{id(self):x}-{self._generation}.npy"
+            new = np.lib.format.open_memmap(path, mode="w+", dtype=self.dtype, shape=(capacity,))
+        new[: self.size] = self.data[: self.size]
+        old, self.data = self.data, new
+        if isinstance(old, np.memmap):
+            old_path = Path(old.filename)
+            del old
+            try:
+                old_path.unlink()
+            except OSError:  # still mapped elsewhere (Windows): left to the directory cleanup
+                pass
+
+
+class SeriesAccumulator:
+    """Store of the polar series of many reports, appended report by report.
+
+    :meth:`remove_source` takes the series of one report out again.
+
+    Parameters
+    ----------
+    spill_bytes : int, optional
+        Total buffer size above which the buffers are memory-mapped to disk.
+    spill_dir : path, optional
+        Parent of the temporary spill directory (default: system temp dir).
+    """
+
+    def __init__(self, spill_bytes=None, spill_dir=None):
+        self.spill_bytes = spill_bytes
+        self.spill_dir = spill_dir
+        self.sources = []
+        self._codes = {}
+        self.layers = {}
+        self.series_count = 0
+        self._series_by_code = {}  # source code -> series added under that label
+        self._spill_tmp = None
+
+    def __len__(self):
+        return self.series_count
+
+    # -- sources ----------------------------------------------------
+    def source_code(self, label):
+        """Small integer code of ``label`` (interned on first use)."""
+        label = str(label)
+        code = self._codes.get(label)
+        if code is None:
+            code = self._codes[label] = len(self.sources)
+            self.sources.append(label)
+        return code
+
+    def _source_codes(self, labels):
+        uniques, inverse = np.unique(np.asarray(labels).astype(str), return_inverse=True)
+        table = np.array([self.source_code(u) for u in uniques], dtype=np.int32)
+        return table[inverse.reshape(-1)]
+
+    # -- accumulation -----------------------------------------------
+    def _layer(self, selector, metric_col):
+        layer = self.layers.get(selector)
+        if layer is None:
+            layer = {name: _GrowableArray(dtype) for name, dtype in _POINT_FIELDS + _TRACK_FIELDS}
+            layer["tracks"] = _GrowableArray(np.int64)  # flattened (start, stop, source) rows
+            layer["metric_col"] = metric_col
+            layer["has_lock"] = False
+            if self._spill_tmp is not None:
+                self._spill_layer(layer)
+            self.layers[selector] = layer
+        return layer
+
+    def add(self, series):
+        """Append one polar series dict (a row of ``plot_series_rows``)."""
+        layer = self._layer(series["selector"], series.get("metric_col"))
+        az = np.asarray(series["azimuth"], dtype=float)
+        n = len(az)
+        label = series.get("source_label", "combined")
+        layer["azimuth"].append(az)
+        layer["elevation"].append(series["elevation"])
+        layer["metric"].append(series["metric"])
+
+        lock = np.asarray(series.get("lock_state", []), dtype=float)
+        unlock = np.asarray(series.get("unlock_mask", []), dtype=bool)
+        if len(lock) == n and n:
+            layer["has_lock"] = True
+        else:
+            lock = np.full(n, np.nan)
+        layer["lock_state"].append(lock)
+        layer["unlock_mask"].append(unlock if len(unlock) == n else np.zeros(n, dtype=bool))
+
+        point_source = series.get("point_source")
+        if point_source is not None and len(point_source) == n:
+            layer["source"].append(self._source_codes(point_source))
+        else:
+            layer["source"].append(np.full(n, self.source_code(label), dtype=np.int32))
+
+        track_az = np.asarray(series.get("track_az", []), dtype=float)
+        track_el = np.asarray(series.get("track_el", []), dtype=float)
+        if len(track_az) and len(track_el) == len(track_az):
+            start = layer["track_az"].size
+            layer["track_az"].append(track_az)
+            layer["track_el"].append(track_el)
+            layer["tracks"].append([start, start + len(track_az), self.source_code(label)])
+        code = self.source_code(label)
+        self._series_by_code[code] = self._series_by_code.get(code, 0) + 1
+        self.series_count += 1
+        self._maybe_spill()
+        return self
+
+    def extend(self, series_rows):
+        for series in series_rows:
+            self.add(series)
+        return self
+
+    def remove_source(self, label):
+        """Remove the points and tracks of source ``label``; return them as series rows.
+
+        Lets a reprocessed report replace its previous series without
+        rebuilding the whole store.  The removed points are returned as one
+        row per selector (the layout of :meth:`add`, without tracks).
+        """
+        code = self._codes.get(str(label))
+        if code is None:
+            return []
+        removed = []
+        for selector, layer in self.layers.items():
+            drop = layer["source"].view() == code
+            tracks = layer["tracks"].view().reshape(-1, 3)
+            drop_tracks = tracks[:, 2] == code
+            if not drop.any() and not drop_tracks.any():
+                continue
+            removed.append({
+                "selector": selector,
+                "metric_col": layer["metric_col"],
+                "source_label": str(label),
+                "azimuth": layer["azimuth"].view()[drop],
+                "elevation": layer["elevation"].view()[drop],
+                "metric": layer["metric"].view()[drop],
+                "lock_state": layer["lock_state"].view()[drop] if layer["has_lock"] else np.array([], dtype=np.float32),
+                "unlock_mask": layer["unlock_mask"].view()[drop] if layer["has_lock"] else np.array([], dtype=bool),
+            })
+            for name, _ in _POINT_FIELDS:
+                layer[name].keep(~drop)
+            # Track vertices are shared by all tracks: drop the removed ranges and shift the offsets.
+            keep_vertex = np.ones(layer["track_az"].size, dtype=bool)
+            for start, stop, _ in tracks[drop_tracks]:
+                keep_vertex[start:stop] = False
+            shift = np.concatenate(([0], np.cumsum(~keep_vertex)))
+            kept = tracks[~drop_tracks].copy()
+            kept[:, 0] -= shift[kept[:, 0]]
+            kept[:, 1] -= shift[kept[:, 1]]
+            layer["track_az"].keep(keep_vertex)
+            layer["track_el"].keep(keep_vertex)
+            layer["tracks"].size = 0
+            layer["tracks"].append(kept)
+        self.series_count -= self._series_by_code.pop(code, 0)
+        return removed
+
+    # -- memory -----------------------------------------------------
+    @property
+    def nbytes(self):
+        return sum(buf.nbytes for layer in self.layers.values() for buf in layer.values() if isinstance(buf, _GrowableArray))
+
+    @property
+    def spilled(self):
+        return self._spill_tmp is not None
+
+    def _maybe_spill(self):
+        if self.spill_bytes is None or self.spilled or self.nbytes <= self.spill_bytes:
+            return
+        if self.spill_dir is not None:
+            Path(self.spill_dir).mkdir(parents=True, exist_ok=True)
+        self._spill_tmp = tempfile.TemporaryDirectory(
+            prefix=".meos-series-", dir=self.spill_dir, ignore_cleanup_errors=True
+        )
+        logger.info("Polar series above %.0f MiB: spilling to %s", self.spill_bytes / 2**20, self._spill_tmp.name)
+        for layer in self.layers.values():
+            self._spill_layer(layer)
+
+    def _spill_layer(self, layer):
+        for buf in layer.values():
+            if isinstance(buf, _GrowableArray):
+                buf.spill(self._spill_tmp.name)
+
+    def close(self):
+        """Drop the buffers and remove the spill files, if any."""
+        self.layers = {}
+        if self._spill_tmp is not None:
+            self._spill_tmp.cleanup()
+            self._spill_tmp = None
+
+    # -- output -----------------------------------------------------
+    def series_map(self, selectors=None, source_label="all files"):
+        """Combined series per selector, in the layout used by the plot builders."""
+        labels = np.array(self.sources, dtype=object)
+        out = {}
+        for selector in SELECTORS:
+            layer = self.layers.get(selector)
+            if layer is None or (selectors is not None and selector not in selectors):
+                continue
+            track_az, track_el = layer["track_az"].view(), layer["track_el"].view()
+            tracks = layer["tracks"].view().reshape(-1, 3)
+            out[selector] = {
+                "selector": selector,
+                "metric_col": layer["metric_col"],
+                "azimuth": layer["azimuth"].view(),
+                "elevation": layer["elevation"].view(),
+                "metric": layer["metric"].view(),
+                "lock_state": layer["lock_state"].view() if layer["has_lock"] else np.array([], dtype=np.float32),
+                "unlock_mask": layer["unlock_mask"].view() if layer["has_lock"] else np.array([], dtype=bool),
+                "point_source": labels[layer["source"].view()] if len(labels) else np.array([], dtype=object),
+                "track_az": track_az,
+                "track_el": track_el,
+                "track_segments": [
+                    {"azimuth": track_az[start:stop], "elevation": track_el[start:stop], "source": self.sources[code]}
+                    for start, stop, code in tracks
+                ],
+                "source_label": source_label,
+            }
+        return out
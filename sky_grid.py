@@ -0,0 +1,353 @@
+"""Fleet-wide aggregation of polar metric samples on a fixed azimuth/elevation grid.
+
+Scattering the raw samples of many passes on one polar chart hides the dense
+regions under the last pass drawn.  :class:`SkyGrid` accumulates the samples
+of the polar series (see ``collect_polar_plot_series``) into ``az_step`` x
+``el_step`` degree bins instead.  Each metric layer (``input_level``,
+``eb_no``, ``snr``) keeps, per bin:
+
+- ``count``, ``sum``, ``min`` and ``max`` of the metric;
+- a fixed-width histogram of the values (``value_step`` dB wide over the
+  range in :data:`DEFAULT_VALUE_RANGES`, out-of-range values clipped into
+  the first/last bin), from which percentiles are interpolated;
+- ``unlocks`` and ``lock_samples``: samples with ``demodulator_lock_state``
+  = 0 and samples with lock information, giving the unlock ratio.
+
+Every field is a plain sum or min/max, so grids built from different reports
+(e.g. in different processes) merge exactly with :meth:`SkyGrid.merge`;
+:meth:`SkyGrid.subtract` takes one of them out again.
+Grids are saved as compressed ``.npz`` files (:meth:`SkyGrid.save`) and
+rendered as polar heatmaps with :func:`render_polar_heatmap`.
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STEP = 5.0
+DEFAULT_VALUE_STEP = 0.5
+DEFAULT_VALUE_RANGES = {
+    "input_level": (-140.0, 0.0),
+    "eb_no": (-10.0, 50.0),
+    "snr": (-10.0, 50.0),
+}
+STATS = ("count", "mean", "min", "max", "p10", "p50", "p90", "unlock_ratio")
+GRID_VERSION = 1
+_FIELDS = ("count", "sum", "min", "max", "unlocks", "lock_samples", "sketch")
+
+
+class SkyGrid:
+    """Mergeable per-bin statistics of the polar metrics.
+
+    Parameters
+    ----------
+    az_step, el_step : float
+        Bin size in degrees; must divide 360 and 90.  ``el_step`` defaults
+        to ``az_step``.
+    value_step : float
+        Width of the histogram bins used for percentiles (metric units).
+    value_ranges : dict, optional
+        ``selector -> (low, high)`` histogram range; defaults to
+        :data:`DEFAULT_VALUE_RANGES`.
+    """
+
+    def __init__(self, az_step=DEFAULT_STEP, el_step=None, value_step=DEFAULT_VALUE_STEP, value_ranges=None):
+        self.az_step = float(az_step)
+        self.el_step = float(el_step if el_step is not None else az_step)
+        self.value_step = float(value_step)
+        self.n_az = _bins(360.0, self.az_step, "az_step")
+        self.n_el = _bins(90.0, self.el_step, "el_step")
+        if self.value_step <= 0:
+            raise ValueError(f"value_step must be positive, got {value_step!r}")
+        self.value_ranges = dict(DEFAULT_VALUE_RANGES)
+        self.value_ranges.update(value_ranges or {})
+        self.layers = {}
+        self.metric_cols = {}
+
+    # -- geometry ---------------------------------------------------
+    @property
+    def shape(self):
+        return self.n_az, self.n_el
+
+    @property
+    def az_edges(self):
+        return np.linspace(0.0, 360.0, self.n_az + 1)
+
+    @property
+    def el_edges(self):
+        return np.linspace(0.0, 90.0, self.n_el + 1)
+
+    def value_edges(self, selector):
+        low, high = self.value_ranges.get(selector, (-200.0, 200.0))
+        n = max(1, int(np.ceil((high - low) / self.value_step)))
+        return low + self.value_step * np.arange(n + 1)
+
+    def _geometry(self):
+        return {
+            "az_step": self.az_step,
+            "el_step": self.el_step,
+            "value_step": self.value_step,
+            "value_ranges": {k: list(v) for k, v in self.value_ranges.items()},
+        }
+
+    def _layer(self, selector):
+        layer = self.layers.get(selector)
+        if layer is None:
+            n_values = len(self.value_edges(selector)) - 1
+            layer = {
+                "count": np.zeros(self.shape, dtype=np.uint32),
+                "sum": np.zeros(self.shape, dtype=np.float64),
+                "min": np.full(self.shape, np.inf, dtype=np.float32),
+                "max": np.full(self.shape, -np.inf, dtype=np.float32),
+                "unlocks": np.zeros(self.shape, dtype=np.uint32),
+                "lock_samples": np.zeros(self.shape, dtype=np.uint32),
+                "sketch": np.zeros(self.shape + (n_values,), dtype=np.uint32),
+            }
+            self.layers[selector] = layer
+        return layer
+
+    def _bin(self, azimuth, elevation, values):
+        """``(ok, flat bin index, value)`` of the valid samples (``ok`` masks the input)."""
+        az = np.asarray(azimuth, dtype=float)
+        el = np.asarray(elevation, dtype=float)
+        val = np.asarray(values, dtype=float)
+        ok = np.isfinite(az) & np.isfinite(el) & np.isfinite(val) & (el >= 0.0) & (el <= 90.0)
+        az, el, val = az[ok], el[ok], val[ok]
+        ia = np.floor(np.mod(az, 360.0) / self.az_step).astype(np.int64) % self.n_az
+        ie = np.minimum(np.floor(el / self.el_step).astype(np.int64), self.n_el - 1)
+        return ok, ia * self.n_el + ie, val
+
+    # -- accumulation -----------------------------------------------
+    def add(self, selector, azimuth, elevation, values, unlock_mask=None, metric_col=None, lock_known=None):
+        """Accumulate samples of one metric.
+
+        ``unlock_mask`` is optional (same length); ``lock_known`` marks the
+        samples that have lock information (default: all, when a mask is given).
+        """
+        ok, flat, val = self._bin(azimuth, elevation, values)
+        if metric_col:
+            self.metric_cols.setdefault(selector, metric_col)
+        layer = self._layer(selector)
+        if not ok.any():
+            return self
+        size = self.n_az * self.n_el
+
+        layer["count"] += np.bincount(flat, minlength=size).reshape(self.shape).astype(np.uint32)
+        layer["sum"] += np.bincount(flat, weights=val, minlength=size).reshape(self.shape)
+        np.minimum.at(layer["min"].reshape(-1), flat, val.astype(np.float32))
+        np.maximum.at(layer["max"].reshape(-1), flat, val.astype(np.float32))
+
+        edges = self.value_edges(selector)
+        n_values = len(edges) - 1
+        iv = np.clip(np.floor((val - edges[0]) / self.value_step).astype(np.int64), 0, n_values - 1)
+        layer["sketch"] += (
+            np.bincount(flat * n_values + iv, minlength=size * n_values)
+            .reshape(layer["sketch"].shape)
+            .astype(np.uint32)
+        )
+
+        mask = np.asarray(unlock_mask if unlock_mask is not None else [], dtype=bool)
+        if len(mask) == len(ok):
+            known = np.asarray(lock_known, dtype=bool)[ok] if lock_known is not None else np.ones(len(flat), dtype=bool)
+            mask = mask[ok] & known
+            layer["lock_samples"] += np.bincount(flat[known], minlength=size).reshape(self.shape).astype(np.uint32)
+            layer["unlocks"] += np.bincount(flat[mask], minlength=size).reshape(self.shape).astype(np.uint32)
+        return self
+
+    def add_series(self, series):
+        """Accumulate one polar series dict (a row of ``plot_series_rows`` or a combined series)."""
+        lock = np.asarray(series.get("lock_state", []), dtype=float)
+        return self.add(
+            series["selector"],
+            series["azimuth"],
+            series["elevation"],
+            series["metric"],
+            unlock_mask=series.get("unlock_mask"),
+            metric_col=series.get("metric_col"),
+            lock_known=np.isfinite(lock) if len(lock) == len(series["azimuth"]) else None,
+        )
+
+    @classmethod
+    def from_series(cls, series_rows, **geometry):
+        """Build a grid from polar series rows (``geometry`` as in :class:`SkyGrid`)."""
+        grid = cls(**geometry)
+        for series in series_rows:
+            grid.add_series(series)
+        return grid
+
+    def merge(self, other):
+        """Add the bins of ``other`` (same geometry) into this grid and return it."""
+        if other._geometry() != self._geometry():
+            raise ValueError("Cannot merge sky grids with different bin geometry")
+        for selector, theirs in other.layers.items():
+            mine = self._layer(selector)
+            for field in ("count", "sum", "unlocks", "lock_samples", "sketch"):
+                mine[field] += theirs[field]
+            np.minimum(mine["min"], theirs["min"], out=mine["min"])
+            np.maximum(mine["max"], theirs["max"], out=mine["max"])
+        for selector, col in other.metric_cols.items():
+            self.metric_cols.setdefault(selector, col)
+        return self
+
+    __iadd__ = merge
+
+    def subtract(self, other, remaining=None):
+        """Remove the bins of ``other``, previously merged into this grid, and return it.
+
+        Counts, sums and histograms are subtracted exactly.  Minima and maxima
+        cannot be: in the bins where ``other`` held the extreme they are
+        recomputed from ``remaining``, the polar series still aggregated in
+        the grid (without it they keep the old value, then only a bound).
+        """
+        if other._geometry() != self._geometry():
+            raise ValueError("Cannot subtract sky grids with different bin geometry")
+        for selector, theirs in other.layers.items():
+            mine = self.layers.get(selector)
+            if mine is None:
+                continue
+            for field in ("count", "unlocks", "lock_samples", "sketch"):
+                mine[field] -= np.minimum(theirs[field], mine[field])
+            mine["sum"] -= theirs["sum"]
+            empty = mine["count"] == 0
+            mine["sum"][empty] = 0.0
+            mine["min"][empty] = np.inf
+            mine["max"][empty] = -np.inf
+            stale = (theirs["count"] > 0) & ~empty & ((theirs["min"] <= mine["min"]) | (theirs["max"] >= mine["max"]))
+            if remaining is None or not stale.any():
+                continue
+            mine["min"][stale] = np.inf
+            mine["max"][stale] = -np.inf
+            stale = stale.reshape(-1)
+            for series in remaining:
+                if series["selector"] != selector:
+                    continue
+                _, flat, val = self._bin(series["azimuth"], series["elevation"], series["metric"])
+                hit = stale[flat]
+                np.minimum.at(mine["min"].reshape(-1), flat[hit], val[hit].astype(np.float32))
+                np.maximum.at(mine["max"].reshape(-1), flat[hit], val[hit].astype(np.float32))
+        return self
+
+    # -- statistics -------------------------------------------------
+    def percentile(self, selector, q):
+        """Per-bin ``q``-th percentile (0-100) interpolated from the histogram sketch."""
+        layer = self.layers[selector]
+        edges = self.value_edges(selector)
+        sketch = layer["sketch"].astype(np.float64)
+        count = layer["count"].astype(np.float64)
+        cum = np.cumsum(sketch, axis=-1)
+        target = count * (float(q) / 100.0)
+        idx = np.minimum((cum < target[..., None]).sum(axis=-1), sketch.shape[-1] - 1)
+        before = np.take_along_axis(cum, idx[..., None], axis=-1)[..., 0] - np.take_along_axis(sketch, idx[..., None], axis=-1)[..., 0]
+        in_bin = np.take_along_axis(sketch, idx[..., None], axis=-1)[..., 0]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            frac = np.where(in_bin > 0, (target - before) / in_bin, 0.0)
+        out = edges[idx] + np.clip(frac, 0.0, 1.0) * self.value_step
+        # The sketch clips out-of-range values: stay within the exact extremes.
+        out = np.clip(out, layer["min"], layer["max"])
+        return np.where(count > 0, out, np.nan)
+
+    def stat(self, selector, name):
+        """2D ``(n_az, n_el)`` array of one of :data:`STATS` (``NaN`` in empty bins)."""
+        layer = self.layers[selector]
+        count = layer["count"]
+        empty = count == 0
+        if name == "count":
+            return count.astype(float)
+        if name == "mean":
+            with np.errstate(invalid="ignore", divide="ignore"):
+                return np.where(empty, np.nan, layer["sum"] / count)
+        if name in ("min", "max"):
+            return np.where(empty, np.nan, layer[name].astype(float))
+        if name == "unlock_ratio":
+            known = layer["lock_samples"]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                return np.where(known > 0, layer["unlocks"] / known, np.nan)
+        if name.startswith("p") and name[1:].replace(".", "", 1).isdigit():
+            return self.percentile(selector, float(name[1:]))
+        raise ValueError(f"Unknown sky grid statistic: {name!r} (expected one of {STATS} or pNN)")
+
+    # -- persistence ------------------------------------------------
+    def save(self, path):
+        """Write the grid to a compressed ``.npz`` (loads without pickle)."""
+        header = {"version": GRID_VERSION, **self._geometry(), "metric_cols": self.metric_cols, "layers": list(self.layers)}
+        arrays = {"__header__": np.array(json.dumps(header))}
+        for selector, layer in self.layers.items():
+            for field in _FIELDS:
+                arrays[f"{selector}__{field}"] = layer[field]
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            np.savez_compressed(f, **arrays)
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        """Inverse of :meth:`save`."""
+        with np.load(path, allow_pickle=False) as data:
+            header = json.loads(str(data["__header__"]))
+            if header.get("version") != GRID_VERSION:
+                raise ValueError(f"Unsupported sky grid version in {path}: {header.get('version')!r}")
+            grid = cls(
+                az_step=header["az_step"],
+                el_step=header["el_step"],
+                value_step=header["value_step"],
+                value_ranges={k: tuple(v) for k, v in header["value_ranges"].items()},
+            )
+            grid.metric_cols = dict(header.get("metric_cols", {}))
+            for selector in header["layers"]:
+                grid.layers[selector] = {field: data[f"{selector}__{field}"] for field in _FIELDS}
+        return grid
+
+
+def _bins(span, step, name):
+    n = span / step if step > 0 else 0
+    if n < 1 or abs(n - round(n)) > 1e-9:
+        raise ValueError(f"{name} must divide {span:g} degrees, got {step!r}")
+    return int(round(n))
+
+
+def render_polar_heatmap(grid, selector, path, stat="mean", title=None, cmap=None):
+    """Draw one statistic of ``grid`` as a polar heatmap PNG; ``None`` without matplotlib.
+
+    Same orientation as the polar plots: north up, azimuth clockwise,
+    radius ``1 - el / 90`` (zenith at the centre).
+    """
+    try:
+        import matplotlib
+        matplotlib.use("Agg", force=True)
+        import matplotlib.pyplot as plt
+    except ImportError:
+        logger.warning("matplotlib not available: skipping sky heatmap %s", path)
+        return None
+
+    values = np.ma.masked_invalid(grid.stat(selector, stat))
+    theta = np.deg2rad(grid.az_edges)
+    radius = 1.0 - grid.el_edges / 90.0
+    label = grid.metric_cols.get(selector, selector)
+    fig, ax = plt.subplots(figsize=(8, 8), subplot_kw={"projection": "polar"})
+    mesh = ax.pcolormesh(
+        theta, radius, values.T, cmap=cmap or ("magma" if stat == "unlock_ratio" else "jet"), shading="flat"
+    )
+    ax.set_theta_zero_location("N")
+    ax.set_theta_direction(-1)
+    ax.set_ylim(0.0, 1.02)
+    ax.set_rticks([0.0, 0.5, 1.0])
+    ax.set_yticklabels(["0", "0.5", "1"])
+    ax.set_rlabel_position(18)
+    ax.grid(alpha=0.35)
+    ax.set_title(title or f"{label} {stat} per {grid.az_step:g}°x{grid.el_step:g}° bin")
+    cbar = fig.colorbar(mesh, ax=ax, pad=0.10)
+    cbar.set_label("unlock ratio" if stat == "unlock_ratio" else f"{label} ({stat})")
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fig.savefig(path, dpi=150, bbox_inches="tight")
+    plt.close(fig)
+    return path
@@ -0,0 +1,258 @@
+"""Loading of ``<object type="image/svg+xml">`` chart references.
+
+A chart embedded as ``<object>`` points to its SVG in the ``data``
+attribute: a base64 ``data:`` URI, an ``http(s)://`` URL or a local path.
+:class:`SvgLoader` turns these references into parsed ``<svg>`` trees:
+
+- :meth:`SvgLoader.prefetch` resolves every URL and local file of a report
+  at once on a small thread pool (remote servers and network shares answer
+  in parallel), instead of one blocking read per section; each request has
+  a ``timeout``;
+- parsed trees are kept in an in-process LRU keyed by URL, by path (plus
+  mtime and size) or by the digest of the ``data:`` payload, so a chart
+  visited by several extractors, or shared by several reports processed in
+  the same process, is decoded and parsed once;
+- with ``cache_dir`` the bytes of remote SVGs are also stored on disk
+  (``<sha256 of the URL>.svg``) and reused by later runs, without expiry:
+  delete the folder to refetch.
+
+Failures (timeouts, HTTP errors, missing files, unparsable content) are
+logged and give ``None``, as for a chart without data; they are remembered
+until the next :meth:`SvgLoader.prefetch` of the same reference.
+"""
+
+import base64
+import hashlib
+import logging
+import os
+import threading
+import urllib.request
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from pathlib import Path
+
+from bs4 import BeautifulSoup, FeatureNotFound
+
+from patterns import SVG_DATA_URI_RE
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FETCH_THREADS = 8
+DEFAULT_TIMEOUT_S = 30.0
+DEFAULT_CACHE_SIZE = 256
+_FAILED = object()  # cached marker of a reference that could not be loaded
+
+
+def parse_svg_bytes(svg_bytes):
+    """Parse SVG bytes and return the root ``<svg>`` tag (``None`` if absent)."""
+    try:
+        svg_soup = BeautifulSoup(svg_bytes, "xml")
+    except FeatureNotFound:
+        logger.warning(
+            "lxml parser not found; falling back to html.parser. Install lxml for full XML support."
+        )
+        try:
+            svg_soup = BeautifulSoup(svg_bytes, "html.parser")
+        except FeatureNotFound:
+            import xml.etree.ElementTree as ET
+
+            svg_soup = BeautifulSoup(ET.tostring(ET.fromstring(svg_bytes)), "html.parser")
+    return svg_soup.svg
+
+
+def _is_remote(data):
+    return data.startswith(("http://", "https://"))
+
+
+class SvgLoader:
+    """Resolve and parse ``<object>`` SVG references, with caching.
+
+    Parameters
+    ----------
+    threads : int
+        Size of the thread pool used by :meth:`prefetch` (``0`` or ``1``
+        loads the references one at a time in the calling thread).
+    timeout : float
+        Seconds allowed for each URL request, and for waiting on a reference
+        being prefetched.
+    cache_size : int
+        Number of parsed trees kept in memory (least recently used evicted).
+    cache_dir : path, optional
+        Folder storing the bytes of remote SVGs between runs.
+    """
+
+    def __init__(self, threads=DEFAULT_FETCH_THREADS, timeout=DEFAULT_TIMEOUT_S, cache_size=DEFAULT_CACHE_SIZE,
+                 cache_dir=None):
+        self.threads = max(0, int(threads or 0))
+        self.timeout = float(timeout)
+        self.cache_size = max(1, int(cache_size))
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._trees = OrderedDict()  # key -> parsed <svg> (or _FAILED)
+        self._pending = {}  # key -> Future of a prefetch in flight
+        self._lock = threading.Lock()
+        self._pool = None
+        self.stats = {"hits": 0, "loaded": 0, "failed": 0, "disk_hits": 0}
+
+    # -------------------- Keys and raw bytes --------------------
+    @staticmethod
+    def key_for(data):
+        """Cache key of a ``data`` attribute (``None`` when there is nothing to load)."""
+        if not data:
+            return None
+        m = SVG_DATA_URI_RE.match(data)
+        if m:
+            return "sha1:" + hashlib.sha1(m.group(2).encode("ascii", "replace")).hexdigest()
+        if _is_remote(data):
+            return data
+        try:
+            st = os.stat(data)
+        except OSError:
+            return data  # reported as missing when loaded
+        return f"file:{os.path.abspath(data)}:{st.st_mtime_ns}:{st.st_size}"
+
+    def _disk_path(self, url):
+        return self.cache_dir / (hashlib.sha256(url.encode("utf-8")).hexdigest() + ".svg")
+
+    def _fetch_remote(self, url):
+        disk = self._disk_path(url) if self.cache_dir is not None else None
+        if disk is not None and disk.is_file():
+            with self._lock:
+                self.stats["disk_hits"] += 1
+            return disk.read_bytes()
+        with urllib.request.urlopen(url, timeout=self.timeout) as resp:
+            svg_bytes = resp.read()
+        if disk is not None:
+            disk.parent.mkdir(parents=True, exist_ok=True)
+            tmp = disk.with_name(f"{disk.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(svg_bytes)
+            os.replace(tmp, disk)
+        return svg_bytes
+
+    def _read(self, data):
+        m = SVG_DATA_URI_RE.match(data)
+        if m:  # Base64 inline data
+            return base64.b64decode(m.group(2))
+        if _is_remote(data):  # Remote file
+            return self._fetch_remote(data)
+        with open(data, "rb") as f:  # Local file path
+            return f.read()
+
+    def _load(self, data):
+        try:
+            svg = parse_svg_bytes(self._read(data))
+        except Exception as exc:
+            logger.warning("Failed to load SVG from %s: %s", data, exc)
+            return _FAILED
+        return _FAILED if svg is None else svg
+
+    # -------------------- LRU --------------------
+    def _cached(self, key):
+        with self._lock:
+            tree = self._trees.get(key)
+            if tree is not None:
+                self._trees.move_to_end(key)
+                self.stats["hits"] += 1
+            return tree
+
+    def _store(self, key, tree):
+        with self._lock:
+            self._trees[key] = tree
+            self._trees.move_to_end(key)
+            self.stats["failed" if tree is _FAILED else "loaded"] += 1
+            while len(self._trees) > self.cache_size:
+                self._trees.popitem(last=False)
+            self._pending.pop(key, None)
+
+    def _forget_failures(self, key):
+        # A failed remote/local load is retried by the next report.
+        with self._lock:
+            if self._trees.get(key) is _FAILED:
+                del self._trees[key]
+
+    # -------------------- Public API --------------------
+    def prefetch(self, elements):
+        """Start loading the references of ``elements`` not yet cached; returns how many were queued.
+
+        Only URLs and local files go to the thread pool; ``data:`` URIs have
+        nothing to wait for and are decoded when first used.  References that
+        failed earlier are tried again.
+        """
+        refs = []
+        for el in elements:
+            data = el.get("data", "")
+            if not data or SVG_DATA_URI_RE.match(data):
+                continue
+            key = self.key_for(data)
+            self._forget_failures(key)
+            refs.append((key, data))
+        if self.threads <= 1:
+            return 0
+        queued = 0
+        for key, data in refs:
+            with self._lock:
+                if key in self._trees or key in self._pending:
+                    continue
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="meos-svg")
+                future = self._pool.submit(self._load, data)
+                self._pending[key] = future
+            future.add_done_callback(lambda fut, key=key: self._store(key, fut.result()))
+            queued += 1
+        return queued
+
+    def load(self, el):
+        """Parsed ``<svg>`` of an ``<object>`` element, ``None`` if it cannot be loaded."""
+        data = el.get("data", "")
+        key = self.key_for(data)
+        if key is None:
+            return None
+        tree = self._cached(key)
+        if tree is None:
+            with self._lock:
+                future = self._pending.get(key)
+            if future is not None:
+                try:
+                    tree = future.result(timeout=self.timeout)
+                except FutureTimeout:
+                    logger.warning("Timed out after %.0f s loading SVG from %s", self.timeout, data)
+                    return None
+            else:
+                tree = self._load(data)
+                self._store(key, tree)
+        return None if tree is _FAILED else tree
+
+    def clear(self):
+        with self._lock:
+            self._trees.clear()
+
+    def close(self):
+        """Shut the thread pool down (pending loads are cancelled)."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+            self._pending.clear()
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+_shared = {}
+_shared_lock = threading.Lock()
+
+
+def get_loader(threads=DEFAULT_FETCH_THREADS, timeout=DEFAULT_TIMEOUT_S, cache_size=DEFAULT_CACHE_SIZE,
+               cache_dir=None):
+    """Process-wide :class:`SvgLoader` for these settings (reports processed in a process share its LRU)."""
+    key = (max(0, int(threads or 0)), float(timeout), int(cache_size), str(Path(cache_dir).resolve()) if cache_dir else None)
+    with _shared_lock:
+        loader = _shared.get(key)
+        if loader is None:
+            loader = _shared[key] = SvgLoader(threads, timeout, cache_size, cache_dir)
+        return loader
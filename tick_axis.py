@@ -0,0 +1,184 @@
+"""Parsed tick labels of one gnuplot chart, with closed-form axis fits.
+
+:func:`Extract_all_charts.svg_axes_from_ticks` builds one :class:`TickAxis`
+per SVG.  Everything the pixel → value mappers need is computed there once:
+
+- the tick table (``text, x_px, y_px, kind``) written to the ``_ticks``
+  sheets, plus the same columns as arrays and per-kind masks;
+- the numeric value of every ``num`` tick and the 0/1 value of every
+  ``state`` tick (``locked``/``unlocked`` labels);
+- the numeric ticks split into the left/right Y axes of dual-axis charts;
+- the least-squares line ``value = a * y_px + b`` of all numeric ticks, of
+  each side group and of the state ticks, in closed form (the same solution
+  as ``np.linalg.lstsq`` on the ``[y_px, 1]`` design matrix, including the
+  minimum-norm one when all ticks share the same ``y_px``).
+
+Mappers accept either a :class:`TickAxis` or a plain tick table
+(:meth:`TickAxis.coerce`), so older callers keep working.
+"""
+
+import numpy as np
+import pandas as pd
+
+from patterns import TICK_NUMBER_JUNK_RE, UNLOCK_RE
+
+
+TICK_COLUMNS = ("text", "x_px", "y_px", "kind")
+
+
+def parse_tick_number(text):
+    """Numeric value of a ``num`` tick label (``" 20"``, ``"1,5 dB"``, ``"90°"``)."""
+    return float(TICK_NUMBER_JUNK_RE.sub("", str(text)).replace(",", "."))
+
+
+def state_tick_value(text):
+    """``0.0`` for unlock-like state labels, ``1.0`` otherwise."""
+    return 0.0 if UNLOCK_RE.search(str(text)) else 1.0
+
+
+def fit_line(y_px, values):
+    """Least-squares ``(a, b)`` with ``values ≈ a * y_px + b`` (``None`` without points).
+
+    Matches ``np.linalg.lstsq`` on ``[y_px, 1]``: with a single distinct
+    ``y_px`` the minimum-norm solution is returned.
+    """
+    y = np.asarray(y_px, dtype=float)
+    v = np.asarray(values, dtype=float)
+    if len(y) == 0:
+        return None
+    y_mean = y.mean()
+    v_mean = v.mean()
+    dy = y - y_mean
+    sxx = float(dy @ dy)
+    if sxx > 1e-12 * max(1.0, float(y @ y)):
+        a = float(dy @ (v - v_mean)) / sxx
+        return a, float(v_mean - a * y_mean)
+    scale = float(v_mean) / (float(y[0]) ** 2 + 1.0)
+    return scale * float(y[0]), scale
+
+
+def _side_groups(x_px):
+    """Index arrays of the numeric ticks on each side of a dual-axis chart.
+
+    One group unless the ticks split into two X clusters separated by a gap
+    of at least 8 px and 15 % of their span (each side needs two ticks).
+    """
+    n = len(x_px)
+    if n == 0:
+        return []
+    everything = np.arange(n)
+    if n < 2:
+        return [everything]
+    x_sorted = np.sort(x_px)
+    x_diffs = np.diff(x_sorted)
+    if np.nanmax(x_diffs) <= 0:
+        return [everything]
+    split_at = int(np.nanargmax(x_diffs))
+    gap = float(x_diffs[split_at])
+    total_span = float(x_sorted[-1] - x_sorted[0])
+    if total_span <= 0 or gap < max(8.0, 0.15 * total_span):
+        return [everything]
+    threshold = float((x_sorted[split_at] + x_sorted[split_at + 1]) / 2.0)
+    left = np.flatnonzero(x_px <= threshold)
+    right = np.flatnonzero(x_px > threshold)
+    groups = [g for g in (left, right) if len(g) >= 2]
+    return groups or [everything]
+
+
+class TickAxis:
+    """Tick labels of one chart: table, parsed values, side groups and fits.
+
+    Parameters
+    ----------
+    frame : pandas.DataFrame, optional
+        Tick table with columns ``text, x_px, y_px, kind``.
+    values : array-like, optional
+        Numeric value per row (``NaN`` for non-numeric ticks), when already
+        parsed by the caller; otherwise parsed from ``text``.
+
+    Attributes
+    ----------
+    frame : pandas.DataFrame
+        The tick table (as written to the ``_ticks`` sheets).
+    box : tuple
+        ``(x_min, x_max, y_min, y_max)`` pixel box spanned by the time
+        ticks (X) and numeric ticks (Y); ``None`` where missing.
+    num_fit, state_fit : tuple or None
+        Line through all numeric ticks / all state ticks.
+    groups : list of dict
+        Numeric side groups: ``index`` (rows of the numeric ticks),
+        ``fit``, ``min`` and ``max`` of their values.
+    """
+
+    def __init__(self, frame=None, values=None):
+        if frame is None:
+            frame = pd.DataFrame()
+        self.frame = frame
+        n = len(frame)
+        if n:
+            kind = frame["kind"].to_numpy()
+            self.x_px = frame["x_px"].to_numpy(dtype=float)
+            self.y_px = frame["y_px"].to_numpy(dtype=float)
+            texts = frame["text"].tolist()
+        else:
+            kind = np.array([], dtype=object)
+            self.x_px = self.y_px = np.array([], dtype=float)
+            texts = []
+        self.is_num = kind == "num"
+        self.is_time = kind == "time"
+        self.is_state = kind == "state"
+        if values is None:
+            values = [parse_tick_number(t) if k == "num" else np.nan for t, k in zip(texts, kind)]
+        self.values = np.asarray(values, dtype=float).reshape(n)
+        self.state_values = np.array(
+            [state_tick_value(t) for t, s in zip(texts, self.is_state) if s], dtype=float
+        )
+
+        num = self.is_num & np.isfinite(self.x_px) & np.isfinite(self.y_px) & np.isfinite(self.values)
+        self.num_x = self.x_px[num]
+        self.num_y = self.y_px[num]
+        self.num_values = self.values[num]
+        self.num_fit = fit_line(self.num_y, self.num_values)
+        self.groups = []
+        for index in _side_groups(self.num_x):
+            vals = self.num_values[index]
+            self.groups.append({
+                "index": index,
+                "fit": fit_line(self.num_y[index], vals),
+                "min": float(vals.min()),
+                "max": float(vals.max()),
+            })
+        state_y = self.y_px[self.is_state]
+        self.state_fit = fit_line(state_y, self.state_values) if len(state_y) >= 2 else None
+
+        x_ticks = self.x_px[self.is_time]
+        y_ticks = self.y_px[self.is_num]
+        self.box = (
+            float(x_ticks.min()) if len(x_ticks) else None,
+            float(x_ticks.max()) if len(x_ticks) else None,
+            float(y_ticks.min()) if len(y_ticks) else None,
+            float(y_ticks.max()) if len(y_ticks) else None,
+        )
+
+    @property
+    def empty(self):
+        return len(self.frame) == 0
+
+    @property
+    def n_numeric(self):
+        return len(self.num_values)
+
+    @classmethod
+    def coerce(cls, ticks):
+        """``ticks`` as a :class:`TickAxis` (accepts a tick table or ``None``)."""
+        if isinstance(ticks, cls):
+            return ticks
+        return cls(ticks)
+
+    def map_values(self, y_px, fit=None):
+        """Apply ``fit`` (default: all numeric ticks) to pixel rows; ``None`` if unavailable."""
+        fit = self.num_fit if fit is None else fit
+        if fit is None:
+            return None
+        a, b = fit
+        return a * np.asarray(y_px, dtype=float) + b
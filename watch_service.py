@@ -0,0 +1,343 @@
+"""Watch-folder service: process reports as the station drops them.
+
+:class:`FolderWatcher` polls the watched folders (with
+:func:`report_discovery.iter_reports`, so the same include/exclude filters
+apply) and hands out a report once its size and modification time have not
+changed for ``settle_s`` seconds, i.e. once it has finished being written.
+A report that changes again later is handed out again.
+
+:class:`WatchService` runs the loop: ready reports go into a bounded queue
+(when it is full the watcher is simply asked again at the next poll), at
+most ``workers`` of them run at once in a process pool, and each result is
+passed to ``on_result`` in the service process.  ``refresh`` (the batch
+summaries) is called when the queue runs empty and at most every
+``summary_interval_s`` seconds while it is busy.  Setting ``stop`` drains:
+no new report is accepted, the queued and running ones are completed, then
+``refresh`` runs a last time; setting ``abort`` as well drops the queue and
+only waits for the running reports.
+
+:class:`WatchStatus` keeps the counters and rewrites a small JSON status
+file (queue depth, reports in flight, processed/skipped/failed counts,
+throughput) so the service can be monitored from outside.
+"""
+
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import time
+import traceback
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime, timezone
+from pathlib import Path
+
+from report_discovery import DEFAULT_INCLUDE, iter_reports
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_S = 2.0
+DEFAULT_SETTLE_S = 5.0
+DEFAULT_QUEUE_SIZE = 64
+DEFAULT_SUMMARY_INTERVAL_S = 60.0
+STATUS_NAME = "watch_status.json"
+THROUGHPUT_WINDOW_S = 3600.0
+
+
+def _utc_now():
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class FolderWatcher:
+    """Poll folders for reports that are complete (unchanged for ``settle_s`` seconds).
+
+    Parameters
+    ----------
+    roots : list of path
+        Folders to watch.
+    include, exclude, recursive, exclude_dirs
+        As in :func:`report_discovery.iter_reports`.
+    settle_s : float
+        Debounce: seconds a file's size and mtime must stay unchanged.
+    """
+
+    def __init__(self, roots, include=DEFAULT_INCLUDE, exclude=(), recursive=True, exclude_dirs=(),
+                 settle_s=DEFAULT_SETTLE_S, clock=time.monotonic):
+        self.roots = [Path(r) for r in roots]
+        self.include = tuple(include or DEFAULT_INCLUDE)
+        self.exclude = tuple(exclude or ())
+        self.recursive = recursive
+        self.exclude_dirs = list(exclude_dirs)
+        self.settle_s = float(settle_s)
+        self.clock = clock
+        self._files = {}  # path -> {"sig", "since", "accepted"}
+
+    @property
+    def settling(self):
+        """Number of files seen but not yet stable."""
+        now = self.clock()
+        return sum(
+            1 for f in self._files.values()
+            if f["sig"] != f["accepted"] and now - f["since"] < self.settle_s
+        )
+
+    def poll(self):
+        """Return ``[(path, signature), ...]`` of the reports ready to be processed.
+
+        A returned report is offered again at every poll until
+        :meth:`accept` is called with its signature.
+        """
+        now = self.clock()
+        seen = set()
+        ready = []
+        for path in iter_reports(
+            self.roots,
+            include=self.include,
+            exclude=self.exclude,
+            recursive=self.recursive,
+            exclude_dirs=self.exclude_dirs,
+            threads=1,
+        ):
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue  # removed or renamed meanwhile
+            path = str(path)
+            seen.add(path)
+            sig = (st.st_size, st.st_mtime_ns)
+            state = self._files.get(path)
+            if state is None:
+                state = self._files[path] = {"sig": sig, "since": now, "accepted": None}
+            elif state["sig"] != sig:
+                state["sig"], state["since"] = sig, now
+            if sig != state["accepted"] and st.st_size > 0 and now - state["since"] >= self.settle_s:
+                ready.append((path, sig))
+        for path in list(self._files):
+            if path not in seen:
+                del self._files[path]
+        return ready
+
+    def accept(self, path, sig):
+        """Mark ``path`` as handed out for this signature."""
+        state = self._files.get(str(path))
+        if state is not None:
+            state["accepted"] = sig
+
+
+class WatchStatus:
+    """Counters of a running service, written as JSON to ``path`` (atomically)."""
+
+    def __init__(self, path, roots=(), workers=1, queue_size=DEFAULT_QUEUE_SIZE, clock=time.monotonic):
+        self.path = Path(path) if path else None
+        self.clock = clock
+        self.t_start = clock()
+        self.info = {
+            "state": "starting",
+            "pid": os.getpid(),
+            "started_at": _utc_now(),
+            "watching": [str(r) for r in roots],
+            "workers": workers,
+            "queue_size": queue_size,
+        }
+        self.counts = {"processed": 0, "skipped": 0, "failed": 0, "cancelled": 0}
+        self.recent = deque()  # (finish time, seconds) of processed reports
+        self.last = None
+        self._written = 0.0
+
+    def finished(self, path, result, seconds):
+        if result.get("error"):
+            self.counts["failed"] += 1
+            outcome = "failed"
+        elif result.get("skipped"):
+            self.counts["skipped"] += 1
+            outcome = "skipped"
+        else:
+            self.counts["processed"] += 1
+            outcome = "processed"
+            self.recent.append((self.clock(), seconds))
+        self.last = {"path": str(path), "outcome": outcome, "seconds": round(seconds, 3), "at": _utc_now()}
+
+    def snapshot(self, queue_depth=0, in_flight=0, settling=0, state=None):
+        if state is not None:
+            self.info["state"] = state
+        now = self.clock()
+        while self.recent and now - self.recent[0][0] > THROUGHPUT_WINDOW_S:
+            self.recent.popleft()
+        window = min(THROUGHPUT_WINDOW_S, max(now - self.t_start, 1e-9))
+        durations = [s for _, s in self.recent]
+        return {
+            **self.info,
+            "updated_at": _utc_now(),
+            "uptime_s": round(now - self.t_start, 1),
+            "queue_depth": queue_depth,
+            "in_flight": in_flight,
+            "settling": settling,
+            **self.counts,
+            "reports_per_hour": round(len(durations) * 3600.0 / window, 2),
+            "mean_report_s": round(sum(durations) / len(durations), 3) if durations else None,
+            "last": self.last,
+        }
+
+    def write(self, force=False, **state):
+        """Rewrite the status file (at most once per second unless ``force``)."""
+        now = self.clock()
+        if self.path is None or (not force and now - self._written < 1.0):
+            return None
+        self._written = now
+        payload = self.snapshot(**state)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            tmp.write_text(json.dumps(payload, indent=1), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError as exc:
+            logger.warning("Cannot write status file %s: %s", self.path, exc)
+        return payload
+
+
+def _ignore_sigint():
+    # Ctrl+C reaches the whole process group: workers leave it to the service,
+    # which drains the queue instead of losing the reports in flight.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+class WatchService:
+    """Bounded queue of ready reports processed by a pool of worker processes.
+
+    Parameters
+    ----------
+    watcher : FolderWatcher
+    task : callable
+        Picklable ``task(path) -> result`` run in the workers (results have
+        the shape of ``_process_report_task`` results).
+    on_result : callable
+        ``on_result(path, result)`` in the service process, for every
+        finished report (including cached and failed ones).
+    lookup : callable, optional
+        ``lookup(path)`` returning a cached result (``skipped=True``) for an
+        unchanged report, or ``None`` to process it.
+    refresh : callable, optional
+        Rewrites the batch summaries; called when something finished since
+        the last call and the queue is empty, or ``summary_interval_s`` has
+        elapsed.
+    status : WatchStatus, optional
+    """
+
+    def __init__(self, watcher, task, on_result, lookup=None, refresh=None, status=None, workers=1,
+                 queue_size=DEFAULT_QUEUE_SIZE, poll_s=DEFAULT_POLL_S, summary_interval_s=DEFAULT_SUMMARY_INTERVAL_S):
+        self.watcher = watcher
+        self.task = task
+        self.on_result = on_result
+        self.lookup = lookup
+        self.refresh = refresh
+        self.status = status
+        self.workers = max(1, int(workers or 1))
+        self.queue_size = max(1, int(queue_size))
+        self.poll_s = float(poll_s)
+        self.summary_interval_s = float(summary_interval_s)
+        self.queue = deque()
+        self.running = {}  # future -> (path, start time)
+        self._dirty = False
+        self._refreshed = time.monotonic()
+
+    def _write_status(self, force=False, state=None):
+        if self.status is not None:
+            self.status.write(
+                force=force,
+                queue_depth=len(self.queue),
+                in_flight=len(self.running),
+                settling=self.watcher.settling,
+                state=state,
+            )
+
+    def _finish(self, path, result, seconds):
+        if result.get("error"):
+            logger.error("Error processing %s:\n%s", path, result["error"])
+        try:
+            self.on_result(path, result)
+        except Exception:  # noqa: BLE001 - a bad result must not stop the service
+            logger.error("Error recording %s:\n%s", path, traceback.format_exc())
+        if self.status is not None:
+            self.status.finished(path, result, seconds)
+        self._dirty = True
+
+    def _maybe_refresh(self, force=False):
+        if not self._dirty or self.refresh is None:
+            return
+        idle = not self.queue and not self.running
+        if force or idle or time.monotonic() - self._refreshed >= self.summary_interval_s:
+            try:
+                self.refresh()
+            except Exception:  # noqa: BLE001
+                logger.error("Error updating the summaries:\n%s", traceback.format_exc())
+            self._dirty = False
+            self._refreshed = time.monotonic()
+
+    def _enqueue_ready(self):
+        for path, sig in self.watcher.poll():
+            if len(self.queue) >= self.queue_size:
+                break  # offered again at the next poll
+            if path in self.queue or any(p == path for p, _ in self.running.values()):
+                continue  # changed while queued/running: picked up once it is done
+            self.watcher.accept(path, sig)
+            self.queue.append(path)
+
+    def _submit(self, pool):
+        while self.queue and len(self.running) < self.workers:
+            path = self.queue.popleft()
+            t0 = time.monotonic()
+            cached = self.lookup(path) if self.lookup is not None else None
+            if cached is not None:
+                self._finish(path, cached, time.monotonic() - t0)
+                continue
+            logger.info("Processing %s", path)
+            self.running[pool.submit(self.task, path)] = (path, t0)
+
+    def _collect(self, timeout):
+        done, _ = wait(list(self.running), timeout=timeout, return_when=FIRST_COMPLETED)
+        for fut in done:
+            path, t0 = self.running.pop(fut)
+            try:
+                result = fut.result()
+            except Exception:  # worker crashed (killed, unpicklable result)
+                result = {
+                    "path": str(path),
+                    "out_path": None,
+                    "stats_rows": [],
+                    "plot_rows": [],
+                    "plot_series_rows": [],
+                    "artifacts": [],
+                    "error": traceback.format_exc(),
+                }
+            self._finish(path, result, time.monotonic() - t0)
+
+    def run(self, stop, abort=None):
+        """Serve until ``stop`` (a :class:`threading.Event`) is set and the queue is drained."""
+        ctx = multiprocessing.get_context("spawn")
+        next_poll = 0.0
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=ctx, initializer=_ignore_sigint) as pool:
+            self._write_status(force=True, state="running")
+            while True:
+                if abort is not None and abort.is_set() and self.queue:
+                    if self.status is not None:
+                        self.status.counts["cancelled"] += len(self.queue)
+                    logger.warning("Aborting: %d queued report(s) dropped", len(self.queue))
+                    self.queue.clear()
+                stopping = stop.is_set()
+                if not stopping and time.monotonic() >= next_poll:
+                    self._enqueue_ready()
+                    next_poll = time.monotonic() + self.poll_s
+                self._submit(pool)
+                if stopping and not self.queue and not self.running:
+                    break
+                if self.running:
+                    self._collect(timeout=max(0.05, min(self.poll_s, next_poll - time.monotonic())))
+                    self._submit(pool)
+                else:
+                    stop.wait(max(0.05, next_poll - time.monotonic()))
+                self._maybe_refresh()
+                self._write_status(state="draining" if stop.is_set() else "running")
+        self._maybe_refresh(force=True)
+        self._write_status(force=True, state="stopped")
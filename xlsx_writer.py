@@ -0,0 +1,174 @@
+"""Workbook writers used by :func:`Extract_all_charts.process_html`.
+
+Two engines write the same workbook layout (one sheet per DataFrame, header
+row in bold, no index column):
+
+- ``"xlsxwriter"``: streams every sheet row by row with xlsxwriter's
+  ``constant_memory`` mode, so only the row being written is held in memory.
+  ``pandas.DataFrame.to_excel`` cannot be used here because it emits cells
+  column by column, which ``constant_memory`` silently drops.
+- ``"openpyxl"``: the original ``pd.ExcelWriter(..., engine="openpyxl")``
+  path, kept as a fallback when xlsxwriter is not installed.
+
+``"auto"`` picks xlsxwriter when available.
+
+Excel limits sheet names to 31 characters and compares them case-insensitively,
+so two long titles can collapse into the same name (e.g. a section and its
+``_ticks`` sheet).  :class:`WorkbookWriter` makes the names unique with a
+``~2``, ``~3``... suffix before handing them to either engine: xlsxwriter
+would raise on the duplicate and openpyxl would overwrite the first sheet.
+"""
+
+import logging
+import math
+
+import numpy as np
+import pandas as pd
+
+
+logger = logging.getLogger(__name__)
+
+EXCEL_ENGINES = ("auto", "xlsxwriter", "openpyxl")
+# Same number format pandas uses for datetime cells.
+DATETIME_FORMAT = "yyyy-mm-dd hh:mm:ss"
+MAX_SHEET_NAME = 31
+
+
+def _has_xlsxwriter():
+    try:
+        import xlsxwriter  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def resolve_engine(engine="auto"):
+    """Return the concrete engine name for ``engine`` (``"auto"`` included)."""
+    if engine not in EXCEL_ENGINES:
+        raise ValueError(f"Unknown Excel engine: {engine!r} (expected one of {EXCEL_ENGINES})")
+    if engine == "openpyxl":
+        return engine
+    if _has_xlsxwriter():
+        return "xlsxwriter"
+    if engine == "xlsxwriter":
+        logger.warning("xlsxwriter not available: falling back to openpyxl")
+    return "openpyxl"
+
+
+def _column_values(series):
+    """Python values of ``series`` ready for ``write_row`` (missing → ``None``)."""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return [None if pd.isna(v) else v.to_pydatetime() for v in series]
+    if pd.api.types.is_bool_dtype(series):
+        return series.tolist()
+    if pd.api.types.is_numeric_dtype(series):
+        values = series.to_numpy(dtype=float)
+        out = values.tolist()
+        if np.isnan(values).any() or np.isinf(values).any():
+            out = [None if math.isnan(v) or math.isinf(v) else v for v in out]
+        if pd.api.types.is_integer_dtype(series):
+            out = [int(v) for v in out]
+        return out
+    out = []
+    for v in series.tolist():
+        if v is None or (isinstance(v, float) and (math.isnan(v) or math.isinf(v))) or v is pd.NaT:
+            v = None
+        elif isinstance(v, (np.generic,)):
+            v = v.item()
+        elif isinstance(v, pd.Timestamp):
+            v = v.to_pydatetime()
+        out.append(v)
+    return out
+
+
+class _XlsxWriterBook:
+    def __init__(self, path):
+        import xlsxwriter
+
+        self.book = xlsxwriter.Workbook(
+            str(path),
+            {"constant_memory": True, "strings_to_numbers": False, "strings_to_urls": False, "nan_inf_to_errors": False},
+        )
+        self.header_fmt = self.book.add_format({"bold": True, "border": 1, "align": "center", "valign": "top"})
+        self.date_fmt = self.book.add_format({"num_format": DATETIME_FORMAT})
+
+    def write(self, sheet_name, df):
+        ws = self.book.add_worksheet(sheet_name)
+        ws.write_row(0, 0, [str(c) for c in df.columns], self.header_fmt)
+        series = [df.iloc[:, i] for i in range(df.shape[1])]
+        columns = [_column_values(s) for s in series]
+        date_cols = [i for i, s in enumerate(series) if pd.api.types.is_datetime64_any_dtype(s)]
+        for r, row in enumerate(zip(*columns), start=1):
+            if not date_cols:
+                ws.write_row(r, 0, row)
+                continue
+            for c, value in enumerate(row):
+                if value is None:
+                    continue
+                if c in date_cols:
+                    ws.write_datetime(r, c, value, self.date_fmt)
+                else:
+                    ws.write(r, c, value)
+
+    def close(self):
+        self.book.close()
+
+
+class _OpenpyxlBook:
+    def __init__(self, path):
+        self.writer = pd.ExcelWriter(path, engine="openpyxl")
+
+    def write(self, sheet_name, df):
+        df.to_excel(self.writer, sheet_name=sheet_name, index=False)
+
+    def close(self):
+        self.writer.close()
+
+
+class WorkbookWriter:
+    """Write DataFrames to consecutive sheets of one ``.xlsx`` file.
+
+    Use as a context manager::
+
+        with WorkbookWriter(path, engine="auto") as wb:
+            wb.write("__meta__", meta_df)
+
+    Sheets are written in call order; each DataFrame is written in full when
+    :meth:`write` is called, which returns the name actually used (see the
+    module docstring for duplicate names).
+    """
+
+    def __init__(self, path, engine="auto"):
+        self.path = path
+        self.engine = resolve_engine(engine)
+        self._book = _XlsxWriterBook(path) if self.engine == "xlsxwriter" else _OpenpyxlBook(path)
+        self._names = set()  # casefolded names already written
+
+    def _unique_name(self, sheet_name):
+        name = sheet_name[:MAX_SHEET_NAME]
+        n = 1
+        while name.casefold() in self._names:
+            n += 1
+            suffix = f"~{n}"
+            name = sheet_name[:MAX_SHEET_NAME - len(suffix)] + suffix
+        if n > 1:
+            logger.warning("Sheet %r written as %r (duplicate name)", sheet_name, name)
+        self._names.add(name.casefold())
+        return name
+
+    def write(self, sheet_name, df):
+        name = self._unique_name(sheet_name)
+        self._book.write(name, df)
+        return name
+
+    def close(self):
+        if self._book is not None:
+            self._book.close()
+            self._book = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False